@@ -0,0 +1,82 @@
+"""add content_blobs for deduplicated version content
+
+Revision ID: a7c1e5f3b9d2
+Revises: f4b8d2e6a9c3
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c1e5f3b9d2'
+down_revision = 'f4b8d2e6a9c3'
+branch_labels = None
+depends_on = None
+
+
+prompt_versions = sa.table(
+    'prompt_versions',
+    sa.column('id', sa.String()),
+    sa.column('content', sa.Text()),
+    sa.column('content_hash', sa.String()),
+)
+content_blobs = sa.table(
+    'content_blobs',
+    sa.column('hash', sa.String()),
+    sa.column('content', sa.Text()),
+    sa.column('size', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    op.create_table('content_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('prompt_versions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Move each distinct version text into content_blobs
+    connection = op.get_bind()
+    seen = set()
+    for version_id, content in connection.execute(sa.select(prompt_versions.c.id, prompt_versions.c.content)).fetchall():
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if content_hash not in seen:
+            seen.add(content_hash)
+            connection.execute(content_blobs.insert().values(hash=content_hash, content=content, size=len(content)))
+        connection.execute(
+            prompt_versions.update()
+            .where(prompt_versions.c.id == version_id)
+            .values(content_hash=content_hash)
+        )
+
+    with op.batch_alter_table('prompt_versions', schema=None) as batch_op:
+        batch_op.alter_column('content_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_foreign_key('fk_prompt_versions_content_hash', 'content_blobs', ['content_hash'], ['hash'])
+        batch_op.create_index(batch_op.f('ix_prompt_versions_content_hash'), ['content_hash'], unique=False)
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    op.add_column('prompt_versions', sa.Column('content', sa.Text(), nullable=True))
+
+    # Copy blob content back onto every version
+    op.execute("""
+        UPDATE prompt_versions
+        SET content = (SELECT content FROM content_blobs WHERE content_blobs.hash = prompt_versions.content_hash)
+    """)
+
+    with op.batch_alter_table('prompt_versions', schema=None) as batch_op:
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_index(batch_op.f('ix_prompt_versions_content_hash'))
+        batch_op.drop_constraint('fk_prompt_versions_content_hash', type_='foreignkey')
+        batch_op.drop_column('content_hash')
+
+    op.drop_table('content_blobs')
@@ -0,0 +1,26 @@
+"""add heartbeat_at to comparison_jobs
+
+Revision ID: a9d3c7e1f5b2
+Revises: e6b2d8f4a1c7
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3c7e1f5b2'
+down_revision = 'e6b2d8f4a1c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('comparison_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comparison_jobs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
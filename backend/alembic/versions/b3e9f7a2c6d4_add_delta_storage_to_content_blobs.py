@@ -0,0 +1,41 @@
+"""add delta storage columns to content_blobs
+
+Revision ID: b3e9f7a2c6d4
+Revises: a7c1e5f3b9d2
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9f7a2c6d4'
+down_revision = 'a7c1e5f3b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing blobs stay full snapshots (depth 0)
+    with op.batch_alter_table('content_blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('base_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('delta', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('depth', sa.Integer(), server_default='0', nullable=False))
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=True)
+        batch_op.create_foreign_key('fk_content_blobs_base_hash', 'content_blobs', ['base_hash'], ['hash'])
+
+
+def downgrade() -> None:
+    # Delta blobs can only be rebuilt by the application; refuse to lose them
+    connection = op.get_bind()
+    delta_count = connection.execute(sa.text("SELECT COUNT(*) FROM content_blobs WHERE content IS NULL")).scalar()
+    if delta_count:
+        raise RuntimeError(f"{delta_count} content blobs are stored as deltas; rewrite them as full text before downgrading")
+
+    with op.batch_alter_table('content_blobs', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_content_blobs_base_hash', type_='foreignkey')
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column('depth')
+        batch_op.drop_column('delta')
+        batch_op.drop_column('base_hash')
@@ -0,0 +1,64 @@
+"""store prompt_versions.version_key as zero-padded segments
+
+Revision ID: b5e1f9c3d7a2
+Revises: a9d3c7e1f5b2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e1f9c3d7a2'
+down_revision = 'a9d3c7e1f5b2'
+branch_labels = None
+depends_on = None
+
+
+def _string_key(version_number):
+    if version_number is None or not re.fullmatch(r"[0-9]+(?:\.[0-9]+)*", str(version_number)):
+        return ""
+    return ".".join(f"{min(int(part), 10 ** 10 - 1):010d}" for part in str(version_number).split("."))
+
+
+def _float_key(version_number):
+    try:
+        return float(version_number)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _replace_version_key(column_type, server_default, key_for) -> None:
+    op.drop_index('ix_prompt_versions_prompt_id_version_key', table_name='prompt_versions')
+    with op.batch_alter_table('prompt_versions', schema=None) as batch_op:
+        batch_op.drop_column('version_key')
+    op.add_column('prompt_versions', sa.Column('version_key', column_type, server_default=server_default, nullable=False))
+
+    prompt_versions = sa.table(
+        'prompt_versions',
+        sa.column('id', sa.String()),
+        sa.column('version_number', sa.String()),
+        sa.column('version_key', column_type),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(prompt_versions.c.id, prompt_versions.c.version_number)).fetchall()
+    for version_id, version_number in rows:
+        connection.execute(
+            prompt_versions.update()
+            .where(prompt_versions.c.id == version_id)
+            .values(version_key=key_for(version_number))
+        )
+
+    op.create_index('ix_prompt_versions_prompt_id_version_key', 'prompt_versions', ['prompt_id', 'version_key'], unique=False)
+
+
+def upgrade() -> None:
+    # Float keys made "1.1" and "1.10" equal; keys are now rebuilt from the version numbers
+    _replace_version_key(sa.String(), '', _string_key)
+
+
+def downgrade() -> None:
+    _replace_version_key(sa.Float(), '0', _float_key)
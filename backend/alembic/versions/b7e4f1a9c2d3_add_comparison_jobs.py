@@ -0,0 +1,41 @@
+"""add comparison_jobs table
+
+Revision ID: b7e4f1a9c2d3
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4f1a9c2d3'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('comparison_jobs',
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('comparison_id', sa.String(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['comparison_id'], ['comparisons.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_comparison_jobs_status'), 'comparison_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_comparison_jobs_comparison_id'), 'comparison_jobs', ['comparison_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_comparison_jobs_comparison_id'), table_name='comparison_jobs')
+    op.drop_index(op.f('ix_comparison_jobs_status'), table_name='comparison_jobs')
+    op.drop_table('comparison_jobs')
@@ -0,0 +1,49 @@
+"""add version_key to prompt_versions
+
+Revision ID: c5d8e2f7a1b4
+Revises: b7e4f1a9c2d3
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d8e2f7a1b4'
+down_revision = 'b7e4f1a9c2d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('prompt_versions', sa.Column('version_key', sa.Float(), server_default='0', nullable=False))
+
+    # Backfill numeric keys from the string version numbers; values that
+    # don't parse keep the default of 0
+    prompt_versions = sa.table(
+        'prompt_versions',
+        sa.column('id', sa.String()),
+        sa.column('version_number', sa.String()),
+        sa.column('version_key', sa.Float()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(prompt_versions.c.id, prompt_versions.c.version_number)).fetchall()
+    for version_id, version_number in rows:
+        try:
+            version_key = float(version_number)
+        except (ValueError, TypeError):
+            continue
+        connection.execute(
+            prompt_versions.update()
+            .where(prompt_versions.c.id == version_id)
+            .values(version_key=version_key)
+        )
+
+    op.create_index('ix_prompt_versions_prompt_id_version_key', 'prompt_versions', ['prompt_id', 'version_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_prompt_versions_prompt_id_version_key', table_name='prompt_versions')
+    with op.batch_alter_table('prompt_versions', schema=None) as batch_op:
+        batch_op.drop_column('version_key')
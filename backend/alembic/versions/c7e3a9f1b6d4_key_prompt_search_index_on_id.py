@@ -0,0 +1,115 @@
+"""rebuild the prompt search index on trigrams, keyed on prompts.id
+
+Revision ID: c7e3a9f1b6d4
+Revises: b5e1f9c3d7a2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a9f1b6d4'
+down_revision = 'b5e1f9c3d7a2'
+branch_labels = None
+depends_on = None
+
+
+def _drop_sqlite_index() -> None:
+    op.execute("DROP TRIGGER IF EXISTS prompts_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS prompts_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS prompts_fts_ai")
+    op.execute("DROP TABLE IF EXISTS prompts_fts")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # The unicode61 index was keyed on the implicit rowid, which VACUUM may
+        # renumber, and couldn't match part of a CJK word
+        _drop_sqlite_index()
+        op.execute("""
+            CREATE VIRTUAL TABLE prompts_fts USING fts5(
+                id UNINDEXED, title, description, content,
+                tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ai AFTER INSERT ON prompts BEGIN
+                INSERT INTO prompts_fts(id, title, description, content)
+                VALUES (new.id, new.title, new.description, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ad AFTER DELETE ON prompts BEGIN
+                DELETE FROM prompts_fts WHERE id = old.id;
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_au AFTER UPDATE OF id, title, description, content ON prompts BEGIN
+                DELETE FROM prompts_fts WHERE id = old.id;
+                INSERT INTO prompts_fts(id, title, description, content)
+                VALUES (new.id, new.title, new.description, new.content);
+            END
+        """)
+        op.execute("""
+            INSERT INTO prompts_fts(id, title, description, content)
+            SELECT id, title, description, content FROM prompts
+        """)
+    elif dialect == 'postgresql':
+        # Word tokens can't match part of a CJK word; trigram indexes serve ILIKE
+        op.execute("DROP INDEX IF EXISTS ix_prompts_search_vector")
+        op.execute("ALTER TABLE prompts DROP COLUMN IF EXISTS search_vector")
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_prompts_title_trgm ON prompts USING GIN (title gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_prompts_description_trgm ON prompts USING GIN (description gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_prompts_content_trgm ON prompts USING GIN (content gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        _drop_sqlite_index()
+        op.execute("""
+            CREATE VIRTUAL TABLE prompts_fts USING fts5(
+                title, description, content,
+                content='prompts', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ai AFTER INSERT ON prompts BEGIN
+                INSERT INTO prompts_fts(rowid, title, description, content)
+                VALUES (new.rowid, new.title, new.description, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ad AFTER DELETE ON prompts BEGIN
+                INSERT INTO prompts_fts(prompts_fts, rowid, title, description, content)
+                VALUES ('delete', old.rowid, old.title, old.description, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_au AFTER UPDATE OF title, description, content ON prompts BEGIN
+                INSERT INTO prompts_fts(prompts_fts, rowid, title, description, content)
+                VALUES ('delete', old.rowid, old.title, old.description, old.content);
+                INSERT INTO prompts_fts(rowid, title, description, content)
+                VALUES (new.rowid, new.title, new.description, new.content);
+            END
+        """)
+        op.execute("INSERT INTO prompts_fts(prompts_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_prompts_content_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_prompts_description_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_prompts_title_trgm")
+        op.execute("""
+            ALTER TABLE prompts ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_prompts_search_vector ON prompts USING GIN (search_vector)")
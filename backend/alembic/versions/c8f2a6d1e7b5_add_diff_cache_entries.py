@@ -0,0 +1,36 @@
+"""add diff_cache_entries for the persistent version diff cache
+
+Revision ID: c8f2a6d1e7b5
+Revises: b3e9f7a2c6d4
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2a6d1e7b5'
+down_revision = 'b3e9f7a2c6d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('diff_cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('hash_a', sa.String(length=64), nullable=False),
+    sa.Column('hash_b', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_diff_cache_entries_hash_a'), 'diff_cache_entries', ['hash_a'], unique=False)
+    op.create_index(op.f('ix_diff_cache_entries_hash_b'), 'diff_cache_entries', ['hash_b'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_diff_cache_entries_hash_b'), table_name='diff_cache_entries')
+    op.drop_index(op.f('ix_diff_cache_entries_hash_a'), table_name='diff_cache_entries')
+    op.drop_table('diff_cache_entries')
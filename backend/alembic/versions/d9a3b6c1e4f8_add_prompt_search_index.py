@@ -0,0 +1,75 @@
+"""add full-text search index for prompts
+
+Revision ID: d9a3b6c1e4f8
+Revises: c5d8e2f7a1b4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3b6c1e4f8'
+down_revision = 'c5d8e2f7a1b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # External-content FTS5 table over prompts, kept in sync by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE prompts_fts USING fts5(
+                title, description, content,
+                content='prompts', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ai AFTER INSERT ON prompts BEGIN
+                INSERT INTO prompts_fts(rowid, title, description, content)
+                VALUES (new.rowid, new.title, new.description, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_ad AFTER DELETE ON prompts BEGIN
+                INSERT INTO prompts_fts(prompts_fts, rowid, title, description, content)
+                VALUES ('delete', old.rowid, old.title, old.description, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER prompts_fts_au AFTER UPDATE OF title, description, content ON prompts BEGIN
+                INSERT INTO prompts_fts(prompts_fts, rowid, title, description, content)
+                VALUES ('delete', old.rowid, old.title, old.description, old.content);
+                INSERT INTO prompts_fts(rowid, title, description, content)
+                VALUES (new.rowid, new.title, new.description, new.content);
+            END
+        """)
+        # Index existing prompts
+        op.execute("INSERT INTO prompts_fts(prompts_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        # Weighted tsvector maintained by the database, title > description > content
+        op.execute("""
+            ALTER TABLE prompts ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_prompts_search_vector ON prompts USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS prompts_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS prompts_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS prompts_fts_ai")
+        op.execute("DROP TABLE IF EXISTS prompts_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_prompts_search_vector")
+        op.execute("ALTER TABLE prompts DROP COLUMN IF EXISTS search_vector")
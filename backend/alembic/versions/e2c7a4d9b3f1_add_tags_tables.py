@@ -0,0 +1,133 @@
+"""add tags and prompt_tags tables
+
+Revision ID: e2c7a4d9b3f1
+Revises: d9a3b6c1e4f8
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a4d9b3f1'
+down_revision = 'd9a3b6c1e4f8'
+branch_labels = None
+depends_on = None
+
+
+prompts = sa.table(
+    'prompts',
+    sa.column('id', sa.String()),
+    sa.column('tags', sa.Text()),
+)
+tags = sa.table(
+    'tags',
+    sa.column('id', sa.String()),
+    sa.column('name', sa.String()),
+)
+prompt_tags = sa.table(
+    'prompt_tags',
+    sa.column('id', sa.String()),
+    sa.column('prompt_id', sa.String()),
+    sa.column('tag_id', sa.String()),
+    sa.column('position', sa.Integer()),
+)
+
+
+def _drop_prompts_tags_column() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # Native DROP COLUMN keeps the table, and the search triggers on it,
+        # instead of the batch mode table rebuild
+        op.execute("ALTER TABLE prompts DROP COLUMN tags")
+    else:
+        op.drop_column('prompts', 'tags')
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tags_name'), 'tags', ['name'], unique=True)
+    op.create_table('prompt_tags',
+    sa.Column('prompt_id', sa.String(), nullable=False),
+    sa.Column('tag_id', sa.String(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('prompt_id', 'tag_id', name='unique_prompt_tag')
+    )
+    op.create_index(op.f('ix_prompt_tags_tag_id'), 'prompt_tags', ['tag_id'], unique=False)
+
+    # Move the JSON tag lists into the new tables, skipping unreadable ones
+    connection = op.get_bind()
+    tag_ids = {}
+    tag_rows = []
+    link_rows = []
+    for prompt_id, raw_tags in connection.execute(sa.select(prompts.c.id, prompts.c.tags)).fetchall():
+        try:
+            names = json.loads(raw_tags) if raw_tags else []
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if not isinstance(names, list):
+            continue
+
+        seen = set()
+        for name in names:
+            name = str(name).strip()
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            if name not in tag_ids:
+                tag_ids[name] = str(uuid.uuid4())
+                tag_rows.append({'id': tag_ids[name], 'name': name})
+            link_rows.append({
+                'id': str(uuid.uuid4()),
+                'prompt_id': prompt_id,
+                'tag_id': tag_ids[name],
+                'position': len(seen) - 1,
+            })
+
+    if tag_rows:
+        op.bulk_insert(tags, tag_rows)
+    if link_rows:
+        op.bulk_insert(prompt_tags, link_rows)
+
+    _drop_prompts_tags_column()
+
+
+def downgrade() -> None:
+    op.add_column('prompts', sa.Column('tags', sa.Text(), nullable=True))
+
+    # Restore the JSON tag lists
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(prompt_tags.c.prompt_id, tags.c.name)
+        .select_from(prompt_tags.join(tags, prompt_tags.c.tag_id == tags.c.id))
+        .order_by(prompt_tags.c.prompt_id, prompt_tags.c.position)
+    ).fetchall()
+    tag_lists = {}
+    for prompt_id, name in rows:
+        tag_lists.setdefault(prompt_id, []).append(name)
+    for prompt_id, names in tag_lists.items():
+        connection.execute(
+            prompts.update()
+            .where(prompts.c.id == prompt_id)
+            .values(tags=json.dumps(names))
+        )
+
+    op.drop_index(op.f('ix_prompt_tags_tag_id'), table_name='prompt_tags')
+    op.drop_table('prompt_tags')
+    op.drop_index(op.f('ix_tags_name'), table_name='tags')
+    op.drop_table('tags')
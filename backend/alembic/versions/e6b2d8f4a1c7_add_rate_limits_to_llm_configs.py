@@ -0,0 +1,28 @@
+"""add rate limit columns to llm_configs
+
+Revision ID: e6b2d8f4a1c7
+Revises: d4a9e3b7f2c8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b2d8f4a1c7'
+down_revision = 'd4a9e3b7f2c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('llm_configs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('requests_per_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('tokens_per_minute', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('llm_configs', schema=None) as batch_op:
+        batch_op.drop_column('tokens_per_minute')
+        batch_op.drop_column('requests_per_minute')
@@ -0,0 +1,29 @@
+"""add indexes for keyset pagination
+
+Revision ID: f4b8d2e6a9c3
+Revises: e2c7a4d9b3f1
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b8d2e6a9c3'
+down_revision = 'e2c7a4d9b3f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_prompts_created_at_id', 'prompts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_prompts_updated_at_id', 'prompts', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_comparisons_created_at_id', 'comparisons', ['created_at', 'id'], unique=False)
+    op.create_index('ix_llm_configs_created_at_id', 'llm_configs', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_configs_created_at_id', table_name='llm_configs')
+    op.drop_index('ix_comparisons_created_at_id', table_name='comparisons')
+    op.drop_index('ix_prompts_updated_at_id', table_name='prompts')
+    op.drop_index('ix_prompts_created_at_id', table_name='prompts')
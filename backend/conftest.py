@@ -4,13 +4,17 @@ Pytest configuration and fixtures for the Prompt Center API.
 
 import pytest
 import asyncio
-from typing import Generator, AsyncGenerator
+import time
+from typing import Generator, AsyncGenerator, Optional
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from src.core.database import Base, get_db, get_request_db
+from src.crud import prompt_crud, prompt_version_crud
 from src.main import app
+from src.schemas import PromptCreate, PromptVersionCreate
 
 # Test database URL (in-memory SQLite for contract tests)
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -36,17 +40,61 @@ def event_loop():
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database session for each test."""
-    # This will be implemented in Task 1.2
-    # For now, return None since we're in contract testing phase
-    return None
+    Base.metadata.create_all(bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=test_engine)
 
 
 @pytest.fixture(scope="function")
 def client(db_session) -> Generator[TestClient, None, None]:
-    """Create a test client."""
-    # Database dependency override will be added in Task 1.2
-    with TestClient(app) as test_client:
-        yield test_client
+    """Create a test client using the test database session."""
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_request_db] = override_get_db
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time.monotonic with a Clock the test moves by hand."""
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def prompt(db_session):
+    """A stored prompt to add versions to."""
+    return prompt_crud.create(db_session, obj_in=PromptCreate(title="p", content="first"))
+
+
+def add_version(db_session, prompt, content: str, version_number: Optional[str] = None):
+    """Store a new version of a prompt."""
+    return prompt_version_crud.create(
+        db_session,
+        obj_in=PromptVersionCreate(content=content, version_number=version_number),
+        prompt_id=prompt.id
+    )
 
 
 @pytest.fixture
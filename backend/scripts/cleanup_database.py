@@ -1,7 +1,9 @@
 """
 Clean up orphaned comparison_prompt_version records.
 
-This script removes comparison_prompt_version records that have invalid foreign keys.
+This script removes comparison_prompt_version records that have invalid foreign keys,
+content blobs that no prompt version references, cached diffs of removed
+content and expired cached LLM responses.
 """
 
 import sys
@@ -66,6 +68,35 @@ def cleanup_orphaned_records():
                 """))
                 print(f"Deleted {null_count} records with NULL prompt_version_id")
 
+            # Remove content blobs no prompt version references any more,
+            # keeping those other blobs are stored as deltas against
+            result = conn.execute(text("""
+                DELETE FROM content_blobs
+                WHERE hash NOT IN (SELECT content_hash FROM prompt_versions)
+                AND hash NOT IN (
+                    SELECT base_hash FROM content_blobs WHERE base_hash IS NOT NULL
+                )
+            """))
+            if result.rowcount:
+                print(f"Deleted {result.rowcount} unreferenced content blobs")
+
+            # Remove cached diffs of texts that are no longer stored
+            result = conn.execute(text("""
+                DELETE FROM diff_cache_entries
+                WHERE hash_a NOT IN (SELECT hash FROM content_blobs)
+                OR hash_b NOT IN (SELECT hash FROM content_blobs)
+            """))
+            if result.rowcount:
+                print(f"Deleted {result.rowcount} stale cached diffs")
+
+            # Remove expired cached LLM responses
+            result = conn.execute(text("""
+                DELETE FROM llm_response_cache
+                WHERE expires_at <= CURRENT_TIMESTAMP
+            """))
+            if result.rowcount:
+                print(f"Deleted {result.rowcount} expired cached LLM responses")
+
             # Commit transaction
             trans.commit()
             print("Database cleanup completed successfully!")
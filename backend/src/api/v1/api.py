@@ -4,55 +4,35 @@ This implements the API endpoints with real database operations.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel as PydanticBaseModel
 import json
 
-from src.core.database import get_db
-from src.crud import prompt_crud, prompt_version_crud, comparison_crud, llm_config_crud
-from src.services import prompt_version_service, llm_service, comparison_service
+from src.core.config import settings
+from src.core.database import get_db, get_request_db
+from src.crud import (
+    prompt_crud, prompt_version_crud, comparison_crud, llm_config_crud,
+    async_prompt_crud, async_prompt_version_crud, async_comparison_crud, async_llm_config_crud,
+    async_comparison_job_crud, async_tag_crud
+)
+from src.services import prompt_version_service, llm_service, comparison_service, comparison_job_service
+from src.services.circuit_breaker import circuit_breakers
+from src.services.progress import format_sse
 from src.schemas import (
-    PromptCreate, PromptUpdate, PromptResponse, PromptListResponse,
+    PromptCreate, PromptUpdate, PromptResponse, PromptSummaryResponse, PromptListResponse,
     PromptVersionCreate, PromptVersionUpdate, PromptVersionResponse,
-    ComparisonCreate, ComparisonResponse, ComparisonListResponse,
-    LLMConfigCreate, LLMConfigUpdate, LLMConfigResponse, LLMConfigListResponse
+    ComparisonCreate, ComparisonResponse, ComparisonSummaryResponse, ComparisonListResponse,
+    LLMConfigCreate, LLMConfigUpdate, LLMConfigResponse, LLMConfigListResponse,
+    ComparisonJobResponse, TagCountResponse, TagListResponse
 )
 
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
-
-# Helper functions
-def get_latest_version_number(versions: list) -> str:
-    """Get the latest version number from a list of versions.
-    Handles both string and integer version numbers for backward compatibility.
-    """
-    if not versions:
-        return "0.0"
-
-    max_version = "0.0"
-    max_num = 0.0
-
-    for v in versions:
-        try:
-            # Handle both integer (old) and string (new) version numbers
-            version_value = v.version_number
-            if isinstance(version_value, int):
-                # Convert integer to string format for consistency
-                num = float(version_value)
-                version_str = f"{version_value}.0"
-            else:
-                # Already a string
-                num = float(version_value)
-                version_str = str(version_value)
-
-            if num > max_num:
-                max_num = num
-                max_version = version_str
-        except (ValueError, TypeError, AttributeError):
-            continue
-
-    return max_version
+# Session type for routes doing only CRUD work; async when settings.DB_ASYNC is set
+DBSession = Union[Session, AsyncSession]
 
 
 # Request models
@@ -67,10 +47,17 @@ async def get_prompts(
     search: Optional[str] = Query(None, description="Search in title, description, and content"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page"),
+    include_total: bool = Query(False, description="Also count all matching items"),
     tags: Optional[str] = Query(None, description="Comma-separated tags"),
-    sort_by: str = Query("created_at", description="Sort field"),
+    tags_match: str = Query("all", pattern="^(all|any)$", description="Match prompts with all or any of the tags"),
+    sort_by: Optional[str] = Query(
+        None,
+        description="Sort field: created_at, updated_at, title or relevance (default: relevance when searching, else created_at)"
+    ),
     sort_order: str = Query("desc", description="Sort order: asc or desc"),
-    db: Session = Depends(get_db)
+    view: str = Query("full", pattern="^(full|summary)$", description="summary returns previews instead of heavy fields"),
+    db: DBSession = Depends(get_request_db)
 ):
     """Get list of prompts with search and pagination."""
     # Parse tags
@@ -82,27 +69,51 @@ async def get_prompts(
     skip = (page - 1) * limit
     
     # Get prompts
-    prompts, total = prompt_crud.get_multi(
-        db=db,
-        skip=skip,
-        limit=limit,
-        search=search,
-        tags=tag_list,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
+    try:
+        prompts, total, next_cursor = await async_prompt_crud.get_multi(
+            db=db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            search=search,
+            tags=tag_list,
+            tags_match=tags_match,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     
     # Calculate pagination
-    total_pages = (total + limit - 1) // limit
-    has_next = page < total_pages
-    has_prev = page > 1
+    total_pages = (total + limit - 1) // limit if total is not None else None
+    has_next = next_cursor is not None
+    has_prev = page > 1 or cursor is not None
     
+    # Get version info for the whole page at once
+    summaries = await async_prompt_version_crud.get_version_summaries(
+        db, [prompt.id for prompt in prompts]
+    )
+
     # Build response with version info
     items = []
     for prompt in prompts:
-        # Get version info
-        versions = prompt_version_crud.get_versions(db, prompt.id)
-        latest_version = get_latest_version_number(versions)
+        summary = summaries[prompt.id]
+
+        if view == "summary":
+            items.append(PromptSummaryResponse(
+                id=prompt.id,
+                title=prompt.title,
+                description=prompt.description,
+                content_preview=prompt.content_preview,
+                tags=prompt.tag_list,
+                created_at=prompt.created_at,
+                updated_at=prompt.updated_at,
+                latest_version=summary["latest_version"],
+                total_versions=summary["total_versions"]
+            ))
+            continue
 
         items.append(PromptResponse(
             id=prompt.id,
@@ -112,8 +123,8 @@ async def get_prompts(
             tags=prompt.tag_list,
             created_at=prompt.created_at,
             updated_at=prompt.updated_at,
-            latest_version=latest_version,
-            total_versions=len(versions)
+            latest_version=summary["latest_version"],
+            total_versions=summary["total_versions"]
         ))
 
     return PromptListResponse(
@@ -123,17 +134,18 @@ async def get_prompts(
         limit=limit,
         total_pages=total_pages,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=has_prev,
+        next_cursor=next_cursor
     )
 
 
 @router.post("/prompts", response_model=PromptResponse, status_code=201)
 async def create_prompt(
     prompt_data: PromptCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Create a new prompt with initial version 1.0."""
-    prompt = prompt_crud.create(db=db, obj_in=prompt_data)
+    prompt = await async_prompt_crud.create(db=db, obj_in=prompt_data)
 
     # Automatically create version 1.0 with the initial content
     from src.schemas.prompt_version import PromptVersionCreate
@@ -142,11 +154,10 @@ async def create_prompt(
         change_notes="Initial version",
         version_number="1.0"
     )
-    prompt_version_crud.create(db=db, obj_in=initial_version, prompt_id=prompt.id)
+    await async_prompt_version_crud.create(db=db, obj_in=initial_version, prompt_id=prompt.id)
 
     # Get version info
-    versions = prompt_version_crud.get_versions(db, prompt.id)
-    latest_version = get_latest_version_number(versions)
+    summary = await async_prompt_version_crud.get_version_summary(db, prompt.id)
 
     return PromptResponse(
         id=prompt.id,
@@ -156,24 +167,23 @@ async def create_prompt(
         tags=prompt.tag_list,
         created_at=prompt.created_at,
         updated_at=prompt.updated_at,
-        latest_version=latest_version,
-        total_versions=len(versions)
+        latest_version=summary["latest_version"],
+        total_versions=summary["total_versions"]
     )
 
 
 @router.get("/prompts/{prompt_id}", response_model=PromptResponse)
 async def get_prompt_by_id(
     prompt_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get a specific prompt by ID."""
-    prompt = prompt_crud.get(db=db, prompt_id=prompt_id)
+    prompt = await async_prompt_crud.get(db=db, prompt_id=prompt_id)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
     # Get version info
-    versions = prompt_version_crud.get_versions(db, prompt.id)
-    latest_version = get_latest_version_number(versions)
+    summary = await async_prompt_version_crud.get_version_summary(db, prompt.id)
 
     return PromptResponse(
         id=prompt.id,
@@ -183,8 +193,8 @@ async def get_prompt_by_id(
         tags=prompt.tag_list,
         created_at=prompt.created_at,
         updated_at=prompt.updated_at,
-        latest_version=latest_version,
-        total_versions=len(versions)
+        latest_version=summary["latest_version"],
+        total_versions=summary["total_versions"]
     )
 
 
@@ -192,18 +202,17 @@ async def get_prompt_by_id(
 async def update_prompt(
     prompt_id: str,
     prompt_data: PromptUpdate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Update a prompt."""
-    prompt = prompt_crud.get(db=db, prompt_id=prompt_id)
+    prompt = await async_prompt_crud.get(db=db, prompt_id=prompt_id)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
     
-    updated_prompt = prompt_crud.update(db=db, db_obj=prompt, obj_in=prompt_data)
+    updated_prompt = await async_prompt_crud.update(db=db, db_obj=prompt, obj_in=prompt_data)
 
     # Get version info
-    versions = prompt_version_crud.get_versions(db, updated_prompt.id)
-    latest_version = get_latest_version_number(versions)
+    summary = await async_prompt_version_crud.get_version_summary(db, updated_prompt.id)
 
     return PromptResponse(
         id=updated_prompt.id,
@@ -213,23 +222,33 @@ async def update_prompt(
         tags=updated_prompt.tag_list,
         created_at=updated_prompt.created_at,
         updated_at=updated_prompt.updated_at,
-        latest_version=latest_version,
-        total_versions=len(versions)
+        latest_version=summary["latest_version"],
+        total_versions=summary["total_versions"]
     )
 
 
 @router.delete("/prompts/{prompt_id}")
 async def delete_prompt(
     prompt_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Delete a prompt."""
-    success = prompt_crud.delete(db=db, prompt_id=prompt_id)
+    success = await async_prompt_crud.delete(db=db, prompt_id=prompt_id)
     if not success:
         raise HTTPException(status_code=404, detail="Prompt not found")
     return {"message": "Prompt deleted successfully"}
 
 
+@router.get("/tags", response_model=TagListResponse)
+async def get_tags(
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of tags"),
+    db: DBSession = Depends(get_request_db)
+):
+    """Get tags with the number of prompts using each, most used first."""
+    counts = await async_tag_crud.get_counts(db, limit=limit)
+    return TagListResponse(items=[TagCountResponse(**count) for count in counts])
+
+
 # Enhanced version management endpoints (specific routes first)
 @router.get("/prompts/{prompt_id}/versions/history")
 async def get_prompt_version_history(
@@ -280,12 +299,46 @@ async def get_latest_prompt_version(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/prompts/{prompt_id}/versions/diff-matrix")
+async def get_prompt_version_diff_matrix(
+    prompt_id: str,
+    include_matrix: bool = Query(False, description="Include the similarity of every pair of versions"),
+    limit: Optional[int] = Query(
+        None, ge=2, le=100,
+        description="Number of latest versions to include (default 50, or the matrix maximum with include_matrix)"
+    ),
+    db: Session = Depends(get_db)
+):
+    """Get diff stats between consecutive versions of a prompt in one request."""
+    if not include_matrix:
+        limit = limit or 50
+    elif limit is None:
+        limit = settings.DIFF_MATRIX_MAX_VERSIONS
+    elif limit > settings.DIFF_MATRIX_MAX_VERSIONS:
+        # The pairwise matrix grows with the square of the number of versions
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be at most {settings.DIFF_MATRIX_MAX_VERSIONS} with include_matrix"
+        )
+    try:
+        return prompt_version_service.get_diff_matrix(
+            db=db,
+            prompt_id=prompt_id,
+            include_matrix=include_matrix,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
 @router.get("/prompts/{prompt_id}/versions/compare/detailed")
 async def compare_prompt_versions_detailed(
     prompt_id: str,
     version_a: str = Query(..., description="First version number"),
     version_b: str = Query(..., description="Second version number"),
     include_diff: bool = Query(True, description="Include detailed diff"),
+    include_html: bool = Query(False, description="Also render the diff as an HTML table"),
+    intraline: bool = Query(False, description="Include word-level changes in replaced lines"),
     db: Session = Depends(get_db)
 ):
     """Compare two versions with detailed analysis."""
@@ -295,7 +348,9 @@ async def compare_prompt_versions_detailed(
             prompt_id=prompt_id,
             version_a=version_a,
             version_b=version_b,
-            include_diff=include_diff
+            include_diff=include_diff,
+            include_html=include_html,
+            intraline=intraline
         )
         return comparison
     except ValueError as e:
@@ -333,16 +388,16 @@ async def get_prompt_versions(
     prompt_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get all versions of a prompt."""
     # Check if prompt exists
-    prompt = prompt_crud.get(db=db, prompt_id=prompt_id)
+    prompt = await async_prompt_crud.get(db=db, prompt_id=prompt_id)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
     
     skip = (page - 1) * limit
-    versions = prompt_version_crud.get_by_prompt(
+    versions = await async_prompt_version_crud.get_by_prompt(
         db=db,
         prompt_id=prompt_id,
         skip=skip,
@@ -364,16 +419,16 @@ async def get_prompt_versions(
 async def create_prompt_version(
     prompt_id: str,
     version_data: PromptVersionCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Create a new version of a prompt."""
     # Check if prompt exists
-    prompt = prompt_crud.get(db=db, prompt_id=prompt_id)
+    prompt = await async_prompt_crud.get(db=db, prompt_id=prompt_id)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
     try:
-        version = prompt_version_crud.create(db=db, obj_in=version_data, prompt_id=prompt_id)
+        version = await async_prompt_version_crud.create(db=db, obj_in=version_data, prompt_id=prompt_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -392,10 +447,10 @@ async def create_prompt_version(
 async def get_prompt_version(
     prompt_id: str,
     version_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get a specific version of a prompt."""
-    version = prompt_version_crud.get(db=db, version_id=version_id)
+    version = await async_prompt_version_crud.get(db=db, version_id=version_id)
     if not version or version.prompt_id != prompt_id:
         raise HTTPException(status_code=404, detail="Version not found")
     
@@ -415,14 +470,14 @@ async def update_prompt_version(
     prompt_id: str,
     version_id: str,
     version_data: PromptVersionUpdate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Update a prompt version."""
-    version = prompt_version_crud.get(db=db, version_id=version_id)
+    version = await async_prompt_version_crud.get(db=db, version_id=version_id)
     if not version or version.prompt_id != prompt_id:
         raise HTTPException(status_code=404, detail="Version not found")
     
-    updated_version = prompt_version_crud.update(
+    updated_version = await async_prompt_version_crud.update(
         db=db,
         db_obj=version,
         obj_in=version_data
@@ -442,14 +497,14 @@ async def update_prompt_version(
 async def delete_prompt_version(
     prompt_id: str,
     version_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Delete a prompt version."""
-    version = prompt_version_crud.get(db=db, version_id=version_id)
+    version = await async_prompt_version_crud.get(db=db, version_id=version_id)
     if not version or version.prompt_id != prompt_id:
         raise HTTPException(status_code=404, detail="Version not found")
     
-    success = prompt_version_crud.delete(db=db, version_id=version_id)
+    success = await async_prompt_version_crud.delete(db=db, version_id=version_id)
     if not success:
         raise HTTPException(status_code=404, detail="Version not found")
     
@@ -516,10 +571,10 @@ async def create_version_from_content(
 @router.post("/comparisons/compare", response_model=ComparisonResponse, status_code=201)
 async def create_comparison(
     comparison_data: ComparisonCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Create a new comparison."""
-    comparison = comparison_crud.create(db=db, obj_in=comparison_data)
+    comparison = await async_comparison_crud.create(db=db, obj_in=comparison_data)
     return ComparisonResponse(
         id=comparison.id,
         name=comparison.name,
@@ -543,56 +598,89 @@ async def get_comparisons(
     type: Optional[str] = Query(None, description="Filter by comparison type"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page"),
+    include_total: bool = Query(False, description="Also count all matching items"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary returns previews instead of heavy fields"),
+    db: DBSession = Depends(get_request_db)
 ):
     """Get list of comparisons."""
     skip = (page - 1) * limit
     
-    comparisons, total = comparison_crud.get_multi(
-        db=db,
-        skip=skip,
-        limit=limit,
-        type=type
-    )
+    try:
+        comparisons, total, next_cursor = await async_comparison_crud.get_multi(
+            db=db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            type=type,
+            view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     
     # Calculate pagination
-    total_pages = (total + limit - 1) // limit
-    has_next = page < total_pages
-    has_prev = page > 1
+    total_pages = (total + limit - 1) // limit if total is not None else None
+    has_next = next_cursor is not None
+    has_prev = page > 1 or cursor is not None
     
+    if view == "summary":
+        items = [
+            ComparisonSummaryResponse(
+                id=comp.id,
+                name=comp.name,
+                description=comp.description,
+                type=comp.type,
+                input_text=comp.input_text,
+                llm_config_id=comp.llm_config_id,
+                save_snapshot=comp.save_snapshot,
+                successful_executions=comp.successful_executions,
+                total_executions=comp.total_executions,
+                average_execution_time_ms=comp.average_execution_time_ms,
+                total_tokens_used=comp.total_tokens_used,
+                created_at=comp.created_at,
+                updated_at=comp.updated_at
+            ) for comp in comparisons
+        ]
+    else:
+        items = [
+            ComparisonResponse(
+                id=comp.id,
+                name=comp.name,
+                description=comp.description,
+                type=comp.type,
+                input_text=comp.input_text,
+                llm_config_id=comp.llm_config_id,
+                save_snapshot=comp.save_snapshot,
+                results=comp.results,
+                successful_executions=comp.successful_executions,
+                total_executions=comp.total_executions,
+                average_execution_time_ms=comp.average_execution_time_ms,
+                total_tokens_used=comp.total_tokens_used,
+                created_at=comp.created_at,
+                updated_at=comp.updated_at
+            ) for comp in comparisons
+        ]
+
     return ComparisonListResponse(
-        items=[ComparisonResponse(
-            id=comp.id,
-            name=comp.name,
-            description=comp.description,
-            type=comp.type,
-            input_text=comp.input_text,
-            llm_config_id=comp.llm_config_id,
-            save_snapshot=comp.save_snapshot,
-            results=comp.results,
-            successful_executions=comp.successful_executions,
-            total_executions=comp.total_executions,
-            average_execution_time_ms=comp.average_execution_time_ms,
-            total_tokens_used=comp.total_tokens_used,
-            created_at=comp.created_at,
-            updated_at=comp.updated_at
-        ) for comp in comparisons],
+        items=items,
         total=total,
         page=page,
         limit=limit,
         total_pages=total_pages,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=has_prev,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/comparisons/{comparison_id}", response_model=ComparisonResponse)
 async def get_comparison_by_id(
     comparison_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get a specific comparison by ID."""
-    comparison = comparison_crud.get(db=db, comparison_id=comparison_id)
+    comparison = await async_comparison_crud.get(db=db, comparison_id=comparison_id)
     if not comparison:
         raise HTTPException(status_code=404, detail="Comparison not found")
     
@@ -617,10 +705,10 @@ async def get_comparison_by_id(
 @router.delete("/comparisons/{comparison_id}")
 async def delete_comparison(
     comparison_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Delete a comparison."""
-    success = comparison_crud.delete(db=db, comparison_id=comparison_id)
+    success = await async_comparison_crud.delete(db=db, comparison_id=comparison_id)
     if not success:
         raise HTTPException(status_code=404, detail="Comparison not found")
     
@@ -631,10 +719,10 @@ async def delete_comparison(
 async def export_comparison(
     comparison_id: str,
     format: str = Query("json", description="Export format"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Export a comparison."""
-    comparison_data = comparison_crud.export_comparison(
+    comparison_data = await async_comparison_crud.export_comparison(
         db=db,
         comparison_id=comparison_id
     )
@@ -659,6 +747,7 @@ async def export_comparison(
 async def create_same_llm_comparison(
     comparison_data: ComparisonCreate,
     prompt_version_ids: List[str],
+    max_concurrency: Optional[int] = Query(None, ge=1, le=50, description="Maximum parallel LLM calls"),
     db: Session = Depends(get_db)
 ):
     """Create a comparison using the same LLM for multiple prompt versions."""
@@ -666,7 +755,8 @@ async def create_same_llm_comparison(
         comparison = await comparison_service.create_same_llm_comparison(
             db=db,
             comparison_data=comparison_data,
-            prompt_version_ids=prompt_version_ids
+            prompt_version_ids=prompt_version_ids,
+            max_concurrency=max_concurrency
         )
         
         return ComparisonResponse(
@@ -696,6 +786,8 @@ async def create_different_llm_comparison(
     input_text: str,
     name: Optional[str] = None,
     description: Optional[str] = None,
+    provider_concurrency: Optional[int] = Query(None, ge=1, le=20, description="Maximum parallel calls per provider"),
+    timeout_seconds: Optional[float] = Query(None, gt=0, le=600, description="Overall deadline; unfinished calls are reported as timed out"),
     db: Session = Depends(get_db)
 ):
     """Create a comparison using different LLMs for the same prompt version."""
@@ -706,7 +798,9 @@ async def create_different_llm_comparison(
             llm_config_ids=llm_config_ids,
             input_text=input_text,
             name=name,
-            description=description
+            description=description,
+            provider_concurrency=provider_concurrency,
+            timeout=timeout_seconds
         )
         
         return ComparisonResponse(
@@ -762,6 +856,34 @@ async def get_comparison_results(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/comparisons/{comparison_id}/stream")
+async def stream_comparison_progress(
+    comparison_id: str,
+    db: Session = Depends(get_db)
+):
+    """Stream comparison results as Server-Sent Events as they complete.
+
+    Emits a ``result`` event per execution with running aggregate stats,
+    then a final ``complete`` (or ``error``) event.
+    """
+    comparison = comparison_crud.get(db=db, comparison_id=comparison_id)
+    if not comparison:
+        raise HTTPException(status_code=404, detail="Comparison not found")
+
+    async def event_stream():
+        async for message in comparison_service.stream_events(comparison_id):
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(message["event"], message["data"])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/comparisons/{comparison_id}/quality-analysis")
 async def get_comparison_quality_analysis(
     comparison_id: str,
@@ -805,7 +927,9 @@ async def retry_comparison(
             prompt_version = prompt_version_crud.get(db=db, version_id=failed_result["version_id"])
             
             # Retry LLM call
-            new_result = await llm_service.call_llm(comparison.input_text, comparison.llm_config)
+            new_result = await llm_service.call_llm(
+                comparison.input_text, comparison.llm_config, use_cache=False
+            )
             
             # Update existing record
             from src.models.comparison_prompt_version import ComparisonPromptVersion
@@ -856,30 +980,134 @@ async def retry_comparison(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+# Comparison job endpoints
+@router.post("/comparison-jobs/same-llm", response_model=ComparisonJobResponse, status_code=202)
+async def submit_same_llm_comparison_job(
+    comparison_data: ComparisonCreate,
+    prompt_version_ids: List[str],
+    max_concurrency: Optional[int] = Query(None, ge=1, le=50, description="Maximum parallel LLM calls"),
+    db: Session = Depends(get_db)
+):
+    """Queue a same-LLM comparison and return immediately with the job status."""
+    try:
+        job = comparison_job_service.submit_same_llm_comparison(
+            db=db,
+            comparison_data=comparison_data,
+            prompt_version_ids=prompt_version_ids,
+            max_concurrency=max_concurrency
+        )
+        return ComparisonJobResponse.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post("/comparison-jobs/different-llm", response_model=ComparisonJobResponse, status_code=202)
+async def submit_different_llm_comparison_job(
+    prompt_version_id: str,
+    llm_config_ids: List[str],
+    input_text: str,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    provider_concurrency: Optional[int] = Query(None, ge=1, le=20, description="Maximum parallel calls per provider"),
+    timeout_seconds: Optional[float] = Query(None, gt=0, le=600, description="Overall deadline; unfinished calls are reported as timed out"),
+    db: Session = Depends(get_db)
+):
+    """Queue a different-LLM comparison and return immediately with the job status."""
+    try:
+        job = comparison_job_service.submit_different_llm_comparison(
+            db=db,
+            prompt_version_id=prompt_version_id,
+            llm_config_ids=llm_config_ids,
+            input_text=input_text,
+            name=name,
+            description=description,
+            provider_concurrency=provider_concurrency,
+            timeout=timeout_seconds
+        )
+        return ComparisonJobResponse.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/comparison-jobs/{job_id}", response_model=ComparisonJobResponse)
+async def get_comparison_job(
+    job_id: str,
+    db: DBSession = Depends(get_request_db)
+):
+    """Get the status of a comparison job."""
+    job = await async_comparison_job_crud.get(db=db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Comparison job not found")
+    return ComparisonJobResponse.model_validate(job)
+
+
+@router.get("/comparison-jobs/{job_id}/result", response_model=ComparisonResponse)
+async def get_comparison_job_result(
+    job_id: str,
+    db: DBSession = Depends(get_request_db)
+):
+    """Get the comparison produced by a completed job."""
+    job = await async_comparison_job_crud.get(db=db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Comparison job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Comparison job failed: {job.error_message}")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Comparison job is {job.status}")
+
+    comparison = await async_comparison_crud.get(db=db, comparison_id=job.comparison_id)
+    if not comparison:
+        raise HTTPException(status_code=404, detail="Comparison not found")
+
+    return ComparisonResponse(
+        id=comparison.id,
+        name=comparison.name,
+        description=comparison.description,
+        type=comparison.type,
+        input_text=comparison.input_text,
+        llm_config_id=comparison.llm_config_id,
+        save_snapshot=comparison.save_snapshot,
+        results=comparison.results,
+        successful_executions=comparison.successful_executions,
+        total_executions=comparison.total_executions,
+        average_execution_time_ms=comparison.average_execution_time_ms,
+        total_tokens_used=comparison.total_tokens_used,
+        created_at=comparison.created_at,
+        updated_at=comparison.updated_at
+    )
+
+
 # LLM Configuration endpoints
 @router.get("/llm-configs", response_model=LLMConfigListResponse)
 async def get_llm_configs(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page"),
+    include_total: bool = Query(False, description="Also count all matching items"),
     provider: Optional[str] = Query(None, description="Filter by provider"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get list of LLM configurations with filtering and pagination."""
     skip = (page - 1) * limit
 
-    configs, total = llm_config_crud.get_multi(
-        db=db,
-        skip=skip,
-        limit=limit,
-        provider=provider,
-        active=active
-    )
+    try:
+        configs, total, next_cursor = await async_llm_config_crud.get_multi(
+            db=db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            provider=provider,
+            active=active
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     # Calculate pagination
-    total_pages = (total + limit - 1) // limit
-    has_next = page < total_pages
-    has_prev = page > 1
+    total_pages = (total + limit - 1) // limit if total is not None else None
+    has_next = next_cursor is not None
+    has_prev = page > 1 or cursor is not None
 
     return LLMConfigListResponse(
         items=[
@@ -891,6 +1119,9 @@ async def get_llm_configs(
                 base_url=config.base_url,
                 temperature=float(config.temperature),
                 max_tokens=config.max_tokens,
+                requests_per_minute=config.requests_per_minute,
+                tokens_per_minute=config.tokens_per_minute,
+                circuit_state=circuit_breakers.state(config.provider, config.base_url),
                 active=config.is_active,
                 created_at=config.created_at.isoformat(),
                 updated_at=config.updated_at.isoformat()
@@ -901,17 +1132,18 @@ async def get_llm_configs(
         limit=limit,
         total_pages=total_pages,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=has_prev,
+        next_cursor=next_cursor
     )
 
 
 @router.post("/llm-configs", response_model=LLMConfigResponse, status_code=201)
 async def create_llm_config(
     config_data: LLMConfigCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Create a new LLM configuration."""
-    config = llm_config_crud.create(db=db, obj_in=config_data)
+    config = await async_llm_config_crud.create(db=db, obj_in=config_data)
     return LLMConfigResponse(
         id=config.id,
         provider=config.provider,
@@ -920,6 +1152,9 @@ async def create_llm_config(
         base_url=config.base_url,
         temperature=float(config.temperature),
         max_tokens=config.max_tokens,
+        requests_per_minute=config.requests_per_minute,
+        tokens_per_minute=config.tokens_per_minute,
+        circuit_state=circuit_breakers.state(config.provider, config.base_url),
         active=config.is_active,
         created_at=config.created_at.isoformat(),
         updated_at=config.updated_at.isoformat()
@@ -929,10 +1164,10 @@ async def create_llm_config(
 @router.get("/llm-configs/{config_id}", response_model=LLMConfigResponse)
 async def get_llm_config_by_id(
     config_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Get a specific LLM configuration by ID."""
-    config = llm_config_crud.get(db=db, config_id=config_id)
+    config = await async_llm_config_crud.get(db=db, config_id=config_id)
     if not config:
         raise HTTPException(status_code=404, detail="LLM configuration not found")
 
@@ -944,6 +1179,9 @@ async def get_llm_config_by_id(
         base_url=config.base_url,
         temperature=float(config.temperature),
         max_tokens=config.max_tokens,
+        requests_per_minute=config.requests_per_minute,
+        tokens_per_minute=config.tokens_per_minute,
+        circuit_state=circuit_breakers.state(config.provider, config.base_url),
         active=config.is_active,
         created_at=config.created_at.isoformat(),
         updated_at=config.updated_at.isoformat()
@@ -954,14 +1192,14 @@ async def get_llm_config_by_id(
 async def update_llm_config(
     config_id: str,
     config_data: LLMConfigUpdate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Update an LLM configuration."""
-    config = llm_config_crud.get(db=db, config_id=config_id)
+    config = await async_llm_config_crud.get(db=db, config_id=config_id)
     if not config:
         raise HTTPException(status_code=404, detail="LLM configuration not found")
 
-    updated_config = llm_config_crud.update(db=db, db_obj=config, obj_in=config_data)
+    updated_config = await async_llm_config_crud.update(db=db, db_obj=config, obj_in=config_data)
     return LLMConfigResponse(
         id=updated_config.id,
         provider=updated_config.provider,
@@ -970,6 +1208,9 @@ async def update_llm_config(
         base_url=updated_config.base_url,
         temperature=float(updated_config.temperature),
         max_tokens=updated_config.max_tokens,
+        requests_per_minute=updated_config.requests_per_minute,
+        tokens_per_minute=updated_config.tokens_per_minute,
+        circuit_state=circuit_breakers.state(updated_config.provider, updated_config.base_url),
         active=updated_config.is_active,
         created_at=updated_config.created_at.isoformat(),
         updated_at=updated_config.updated_at.isoformat()
@@ -979,10 +1220,10 @@ async def update_llm_config(
 @router.delete("/llm-configs/{config_id}")
 async def delete_llm_config(
     config_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Delete an LLM configuration."""
-    success = llm_config_crud.delete(db=db, config_id=config_id)
+    success = await async_llm_config_crud.delete(db=db, config_id=config_id)
     if not success:
         raise HTTPException(status_code=404, detail="LLM configuration not found")
     return {"message": "LLM configuration deleted successfully"}
@@ -991,18 +1232,18 @@ async def delete_llm_config(
 @router.patch("/llm-configs/{config_id}/toggle")
 async def toggle_llm_config(
     config_id: str,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_request_db)
 ):
     """Toggle (activate/deactivate) an LLM configuration."""
-    config = llm_config_crud.get(db=db, config_id=config_id)
+    config = await async_llm_config_crud.get(db=db, config_id=config_id)
     if not config:
         raise HTTPException(status_code=404, detail="LLM configuration not found")
 
     # Toggle the active state
     if config.is_active:
-        updated_config = llm_config_crud.deactivate(db=db, config_id=config_id)
+        updated_config = await async_llm_config_crud.deactivate(db=db, config_id=config_id)
     else:
-        updated_config = llm_config_crud.activate(db=db, config_id=config_id)
+        updated_config = await async_llm_config_crud.activate(db=db, config_id=config_id)
 
     return LLMConfigResponse(
         id=updated_config.id,
@@ -1012,6 +1253,9 @@ async def toggle_llm_config(
         base_url=updated_config.base_url,
         temperature=float(updated_config.temperature),
         max_tokens=updated_config.max_tokens,
+        requests_per_minute=updated_config.requests_per_minute,
+        tokens_per_minute=updated_config.tokens_per_minute,
+        circuit_state=circuit_breakers.state(updated_config.provider, updated_config.base_url),
         active=updated_config.is_active,
         created_at=updated_config.created_at.isoformat(),
         updated_at=updated_config.updated_at.isoformat()
@@ -1035,6 +1279,45 @@ async def test_llm_with_prompt(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/llm/test/stream")
+async def test_llm_with_prompt_stream(
+    request: LLMTestRequest,
+    db: Session = Depends(get_db)
+):
+    """Test a prompt with a specific LLM configuration, streaming tokens as Server-Sent Events.
+
+    Emits a ``token`` event per chunk, then a final ``done`` event with the
+    full result including ``time_to_first_token_ms``.
+    """
+    config = llm_config_crud.get(db=db, config_id=request.llm_config_id)
+    if not config:
+        raise HTTPException(status_code=404, detail="LLM configuration not found")
+
+    try:
+        llm_service.get_provider(config.provider)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    async def event_stream():
+        async for event in llm_service.stream_llm(request.prompt, config):
+            if event["type"] == "token":
+                yield format_sse("token", {"content": event["content"]})
+            else:
+                yield format_sse("done", event["result"])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/llm/health")
+async def get_llm_health():
+    """Get the circuit breaker state and health statistics of each LLM endpoint called so far."""
+    return {"endpoints": circuit_breakers.snapshot()}
+
+
 @router.post("/llm-configs/test")
 async def test_llm_connection(
     provider: str,
@@ -1062,7 +1345,7 @@ async def test_llm_connection(
     test_prompt = "Say 'Connection test successful' if you can read this."
 
     try:
-        result = await llm_service.call_llm(test_prompt, temp_config)
+        result = await llm_service.call_llm(test_prompt, temp_config, use_cache=False)
 
         if result["success"]:
             return {
@@ -1101,6 +1384,7 @@ async def create_initial_versions_for_all_prompts(db: Session = Depends(get_db))
     try:
         # Get all prompts
         prompts = db.query(Prompt).all()
+        summaries = prompt_version_crud.get_version_summaries(db, [prompt.id for prompt in prompts])
 
         created_count = 0
         skipped_count = 0
@@ -1108,9 +1392,7 @@ async def create_initial_versions_for_all_prompts(db: Session = Depends(get_db))
 
         for prompt in prompts:
             # Check if prompt has any versions
-            existing_versions = prompt_version_crud.get_versions(db, prompt.id)
-
-            if existing_versions:
+            if summaries[prompt.id]["total_versions"]:
                 skipped_count += 1
                 continue
 
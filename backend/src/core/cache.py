@@ -0,0 +1,61 @@
+"""
+In-memory caching utilities.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe least-recently-used cache with a fixed number of entries.
+
+    A ``max_size`` of 0 disables caching. With a ``ttl`` (seconds), entries
+    also expire that long after they were put.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self._max_size = max_size
+        self._ttl = ttl
+        # key -> (value, expiry time or None)
+        self._entries: "OrderedDict[Hashable, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a cached value, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting the least recently used entries if full.
+
+        ``ttl`` overrides the cache's default time to live for this entry.
+        """
+        if self._max_size <= 0:
+            return
+        ttl = ttl if ttl is not None else self._ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -11,6 +11,18 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./prompt_center.db"
+    DB_ASYNC: bool = False  # Serve requests from an async engine (aiosqlite/asyncpg)
+    ASYNC_DATABASE_URL: str = ""  # Derived from DATABASE_URL when empty
+    
+    # Prompt version storage
+    VERSION_STORAGE_MODE: str = "full"  # "full" stores every text whole; "delta" stores compressed deltas
+    VERSION_SNAPSHOT_INTERVAL: int = 20  # In delta mode, a full snapshot at least every N versions
+    VERSION_CACHE_SIZE: int = 512  # Reconstructed texts kept in memory
+    DIFF_CACHE_SIZE: int = 256  # Computed version diffs kept in memory
+    DIFF_CACHE_PERSISTENT: bool = False  # Also store computed diffs in the database
+    DIFF_MATRIX_MAX_VERSIONS: int = 30  # Most versions in a diff matrix with the similarity of every pair
+    DIFF_MAX_LINES: int = 200000  # Larger diffs only match their common prefix and suffix
+    DIFF_MAX_EDIT_COST: int = 1000  # Edits searched in a region without unique lines before replacing it whole
     
     # Security
     ENCRYPTION_KEY: str = "default-encryption-key-change-me-in-production"
@@ -25,7 +37,61 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
     GOOGLE_API_KEY: str = ""
-    
+
+    # LLM HTTP connection pool
+    LLM_HTTP_TIMEOUT: float = 30.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    LLM_HTTP2: bool = True  # Requires the optional "h2" package
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = False  # Reuse results of identical successful calls
+    LLM_CACHE_TTL_SECONDS: float = 86400.0
+    LLM_CACHE_SIZE: int = 1000  # Results kept in memory
+    LLM_CACHE_PERSISTENT: bool = False  # Also store results in the database
+    LLM_SEMANTIC_CACHE_ENABLED: bool = False  # Also reuse results of near-duplicate prompts
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Minimum estimated prompt similarity (0-1) for a hit
+    LLM_SEMANTIC_CACHE_SIZE: int = 1000  # Prompts kept in the similarity index
+    LLM_COALESCE_ENABLED: bool = False  # Identical concurrent temperature 0 calls share one provider request
+
+    # LLM rate limiting (per LLM config; provider rate limit headers can only lower these)
+    LLM_DEFAULT_REQUESTS_PER_MINUTE: int = 0  # For configs without their own limit; 0 is unlimited
+    LLM_DEFAULT_TOKENS_PER_MINUTE: int = 0  # For configs without their own limit; 0 is unlimited
+    LLM_RATE_LIMIT_BACKOFF_SECONDS: float = 1.0  # Pause after a 429 without Retry-After, doubling while they repeat
+    LLM_RATE_LIMIT_MAX_PAUSE_SECONDS: float = 60.0
+
+    # LLM retries and hedging
+    LLM_RETRY_MAX_ATTEMPTS: int = 3  # Attempts per call, including the first; 1 disables retries
+    LLM_RETRY_STATUS_CODES: List[int] = [408, 429, 500, 502, 503, 504]  # Timeouts and connection errors are retried too
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5  # Jittered backoff ceiling after the first failure, doubling per attempt
+    LLM_RETRY_MAX_BACKOFF_SECONDS: float = 8.0
+    LLM_RETRY_BUDGET_SECONDS: float = 30.0  # No retry is started once a call has taken this long
+    LLM_HEDGE_ENABLED: bool = False  # Race a second request when the first is slower than usual
+    LLM_HEDGE_PERCENTILE: float = 95.0  # Latency percentile (per provider and model) that triggers the hedge
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # Successful calls recorded before hedging starts
+
+    # LLM endpoint circuit breakers (per provider and base URL)
+    LLM_CIRCUIT_BREAKER_ENABLED: bool = True
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures or slow calls that open the circuit
+    LLM_CIRCUIT_SLOW_CALL_SECONDS: float = 25.0  # Successful calls slower than this count as failures; 0 disables
+    LLM_CIRCUIT_OPEN_SECONDS: float = 30.0  # Calls fail fast for this long before a probe is let through
+
+    # Comparisons
+    COMPARISON_MAX_CONCURRENCY: int = 8  # Parallel LLM calls per comparison
+    LLM_PROVIDER_MAX_CONCURRENCY: int = 4  # Parallel calls per provider in multi-LLM comparisons
+    COMPARISON_DEADLINE_SECONDS: float = 60.0  # Overall deadline for multi-LLM comparisons
+
+    # Background comparison jobs
+    JOB_WORKERS: int = 2  # In-process workers; 0 leaves jobs to "python -m src.worker"
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_HEARTBEAT_SECONDS: float = 10.0  # How often a running job renews its lease
+    JOB_LEASE_SECONDS: float = 60.0  # Running jobs without a heartbeat for this long are reclaimed
+
+    # Server-Sent Events
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_JOB_WAIT_TIMEOUT_SECONDS: float = 900.0  # Streams stop waiting for a queued comparison job after this long
+
     class Config:
         env_file = ".env"
 
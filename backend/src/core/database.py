@@ -2,29 +2,42 @@
 Database configuration and session management.
 """
 
-from sqlalchemy import create_engine
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
+from starlette.concurrency import run_in_threadpool
 
 from src.core.config import settings
 
+T = TypeVar("T")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """Check whether a SQLite URL points at an in-memory database."""
+    return ":memory:" in url or url.rstrip("/").endswith(":")
+
+
+def _set_sqlite_pragma(dbapi_conn, connection_record):
+    """Enable foreign key constraints for SQLite."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 # Create database engine
 if settings.DATABASE_URL.startswith("sqlite"):
-    from sqlalchemy import event
-
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        # In-memory databases live on a single shared connection; file databases
+        # get a connection per thread so sessions run off the event loop don't
+        # share a transaction
+        poolclass=StaticPool if _is_sqlite_memory(settings.DATABASE_URL) else None,
     )
-
-    # Enable foreign key constraints for SQLite
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    event.listen(engine, "connect", _set_sqlite_pragma)
 else:
     engine = create_engine(
         settings.DATABASE_URL,
@@ -44,3 +57,94 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine, created on first use so the async drivers stay optional
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_database_url(url: Optional[str] = None) -> str:
+    """Get the async driver URL (aiosqlite / asyncpg) for a database URL."""
+    if url is None:
+        if settings.ASYNC_DATABASE_URL:
+            return settings.ASYNC_DATABASE_URL
+        url = settings.DATABASE_URL
+
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{separator}{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{separator}{rest}"
+    return url
+
+
+def get_async_engine():
+    """Get the shared async engine."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = get_async_database_url()
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(
+                url,
+                poolclass=StaticPool if _is_sqlite_memory(url) else None,
+            )
+            event.listen(_async_engine.sync_engine, "connect", _set_sqlite_pragma)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_pre_ping=True,
+                pool_size=10,
+                max_overflow=20,
+            )
+    return _async_engine
+
+
+def get_async_session_factory():
+    """Get the async session factory bound to the async engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # Objects are read after commit outside the session's greenlet, so
+        # they must not expire and trigger lazy refreshes
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def get_async_db():
+    """Get async database session."""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections if it was created."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+# Request-scoped session dependency selected by settings.DB_ASYNC
+get_request_db = get_async_db if settings.DB_ASYNC else get_db
+
+
+async def run_db(db: Union[Session, Any], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run synchronous database code without blocking the event loop.
+
+    ``fn`` is called with a sync ``Session`` as its first argument. Async
+    sessions run it via ``AsyncSession.run_sync``; sync sessions run it in
+    the threadpool.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
@@ -0,0 +1,450 @@
+"""
+Line diff engine for prompt version texts.
+
+Lines are interned to integers and matched with patience diff: lines that
+occur exactly once on both sides anchor the match, and the gaps between
+anchors are diffed the same way. Gaps without unique lines fall back to
+Myers diff, capped at DIFF_MAX_EDIT_COST edits, beyond which the gap is
+reported as a single replacement. Inputs over DIFF_MAX_LINES lines only
+get their common prefix and suffix matched.
+"""
+
+import bisect
+import html
+import re
+from itertools import zip_longest
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from src.core.config import settings
+
+# Bumped whenever the output of the engine changes, so cached diffs made by
+# an older engine are not served
+DIFF_FORMAT_VERSION = 2
+
+# Words, runs of whitespace and single punctuation marks
+_WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+Opcode = Tuple[str, int, int, int, int]
+Block = Tuple[int, int, int]
+
+
+def _intern(lines_a: Sequence[Hashable], lines_b: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+    """Map lines to integers so equal lines compare in constant time."""
+    ids: Dict[Hashable, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in lines_a]
+    b = [ids.setdefault(line, len(ids)) for line in lines_b]
+    return a, b
+
+
+def _unique_anchors(a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Get the longest run of lines, in order on both sides, that occur once in each range."""
+    # line -> [count in a, position in a, count in b, position in b]
+    counts: Dict[int, List[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.get(a[i])
+        if entry is None:
+            counts[a[i]] = [1, i, 0, -1]
+        else:
+            entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+
+    pairs = sorted((e[1], e[3]) for e in counts.values() if e[0] == 1 and e[2] == 1)
+
+    # Longest increasing subsequence of b positions (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect.bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos else -1
+
+    anchors = []
+    index = tail_index[-1] if tail_index else -1
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int, max_cost: int) -> Optional[List[Block]]:
+    """Get the matching blocks of a shortest edit script, or None past ``max_cost`` edits."""
+    n = ahi - alo
+    m = bhi - blo
+    max_d = min(n + m, max_cost)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                trace.append(v[:])
+                return _myers_blocks(trace, offset, n, m, alo, blo)
+        trace.append(v[:])
+    return None
+
+
+def _myers_blocks(trace: List[List[int]], offset: int, x: int, y: int, alo: int, blo: int) -> List[Block]:
+    """Walk a Myers trace back from the end to collect the diagonal runs."""
+    blocks = []
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+            prev_k = k + 1
+            prev_x = v[offset + prev_k]
+            start_x, start_y = prev_x, prev_x - prev_k + 1
+        else:
+            prev_k = k - 1
+            prev_x = v[offset + prev_k]
+            start_x, start_y = prev_x + 1, prev_x - prev_k
+        if x > start_x:
+            blocks.append((alo + start_x, blo + start_y, x - start_x))
+        x, y = prev_x, prev_x - prev_k
+    if x > 0:
+        blocks.append((alo, blo, x))
+    return blocks
+
+
+def _matching_blocks(a: List[int], b: List[int]) -> Tuple[List[Block], bool]:
+    """Get sorted matching blocks of two interned sequences and whether the match is exact."""
+    blocks: List[Block] = []
+    exact = True
+    full = len(a) + len(b) <= settings.DIFF_MAX_LINES
+    stack = [(0, len(a), 0, len(b))]
+
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+
+        # Common prefix and suffix
+        size = 0
+        while alo + size < ahi and blo + size < bhi and a[alo + size] == b[blo + size]:
+            size += 1
+        if size:
+            blocks.append((alo, blo, size))
+            alo += size
+            blo += size
+        size = 0
+        while alo < ahi - size and blo < bhi - size and a[ahi - 1 - size] == b[bhi - 1 - size]:
+            size += 1
+        if size:
+            blocks.append((ahi - size, bhi - size, size))
+            ahi -= size
+            bhi -= size
+
+        if alo == ahi or blo == bhi:
+            continue
+        if not full:
+            exact = False
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                stack.append((alo, i, blo, j))
+                blocks.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            stack.append((alo, ahi, blo, bhi))
+        else:
+            found = _myers(a, alo, ahi, b, blo, bhi, settings.DIFF_MAX_EDIT_COST)
+            if found is None:
+                exact = False
+            else:
+                blocks.extend(found)
+
+    blocks.sort()
+    return blocks, exact
+
+
+def diff_interned(a: Sequence[int], b: Sequence[int]) -> Tuple[List[Opcode], bool]:
+    """Diff two sequences of interned line ids, as made by ``LineInterner``.
+
+    Returns ``difflib.SequenceMatcher.get_opcodes()``-style opcodes and
+    whether the diff is exact (False when a size cap was hit and part of it
+    is reported as a coarser replacement).
+    """
+    blocks, exact = _matching_blocks(a, b)
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in blocks + [(len(a), len(b), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(("insert", i, block_i, j, block_j))
+        i, j = block_i + size, block_j + size
+        if size:
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == block_i:
+                tag, i1, _, j1, _ = opcodes.pop()
+                opcodes.append((tag, i1, i, j1, j))
+            else:
+                opcodes.append(("equal", block_i, i, block_j, j))
+    return opcodes, exact
+
+
+def diff_opcodes(lines_a: Sequence[Hashable], lines_b: Sequence[Hashable]) -> Tuple[List[Opcode], bool]:
+    """Diff two line sequences; see ``diff_interned``."""
+    a, b = _intern(lines_a, lines_b)
+    return diff_interned(a, b)
+
+
+def diff_stats(opcodes: List[Opcode]) -> Dict[str, int]:
+    """Count added, deleted and modified lines in a diff."""
+    additions = 0
+    deletions = 0
+    modifications = 0
+
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "replace":
+            modifications += max(i2 - i1, j2 - j1)
+        elif tag == "delete":
+            deletions += i2 - i1
+        elif tag == "insert":
+            additions += j2 - j1
+
+    return {
+        "additions": additions,
+        "deletions": deletions,
+        "modifications": modifications,
+        "total_changes": additions + deletions + modifications
+    }
+
+
+def similarity(opcodes: List[Opcode]) -> float:
+    """Get the share of lines two texts have in common, from 0.0 to 1.0.
+
+    Same measure as ``difflib.SequenceMatcher.ratio`` over lines.
+    """
+    if not opcodes:
+        return 1.0
+    matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+    total = opcodes[-1][2] + opcodes[-1][4]
+    return 2.0 * matched / total if total else 1.0
+
+
+class LineInterner:
+    """Maps lines of any number of texts to shared integer ids.
+
+    Diffing many texts against each other then splits and hashes each text
+    only once.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, text: str) -> List[int]:
+        """Get the line ids of a text."""
+        ids = self._ids
+        return [ids.setdefault(line, len(ids)) for line in text.splitlines()]
+
+
+def group_opcodes(opcodes: List[Opcode], context: int = 3) -> List[List[Opcode]]:
+    """Group opcodes into hunks with up to ``context`` lines of context.
+
+    Same grouping as ``difflib.SequenceMatcher.get_grouped_opcodes``.
+    """
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    groups = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        # End the current group and start a new one at large unchanged runs
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _range(start: int, stop: int) -> str:
+    """Format a unified diff hunk range."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        start -= 1
+    return f"{start + 1},{length}"
+
+
+def word_changes(old: str, new: str) -> List[List[str]]:
+    """Diff two lines word by word.
+
+    Returns ``[op, text]`` segments in order, where op is "=" for text on
+    both lines, "-" for text only on the old line and "+" for text only on
+    the new line.
+    """
+    old_words = _WORD_PATTERN.findall(old)
+    new_words = _WORD_PATTERN.findall(new)
+    opcodes, _ = diff_opcodes(old_words, new_words)
+
+    segments = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            segments.append(["=", "".join(old_words[i1:i2])])
+            continue
+        if i2 > i1:
+            segments.append(["-", "".join(old_words[i1:i2])])
+        if j2 > j1:
+            segments.append(["+", "".join(new_words[j1:j2])])
+    return segments
+
+
+class LineDiff:
+    """Line diff of two texts, computed once and rendered in several forms."""
+
+    def __init__(self, text_a: str, text_b: str, *, context: int = 3):
+        self.lines_a = text_a.splitlines()
+        self.lines_b = text_b.splitlines()
+        self.opcodes, self.exact = diff_opcodes(self.lines_a, self.lines_b)
+        self.hunks = group_opcodes(self.opcodes, context)
+
+    def stats(self) -> Dict[str, int]:
+        """Count added, deleted and modified lines."""
+        return diff_stats(self.opcodes)
+
+    def unified_diff(self, fromfile: str = "", tofile: str = "") -> str:
+        """Render the diff in unified format."""
+        if not self.hunks:
+            return ""
+
+        lines = [f"--- {fromfile}\n", f"+++ {tofile}\n"]
+        for hunk in self.hunks:
+            first, last = hunk[0], hunk[-1]
+            lines.append(
+                f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@\n"
+            )
+            for tag, i1, i2, j1, j2 in hunk:
+                if tag == "equal":
+                    lines.extend(f" {line}\n" for line in self.lines_a[i1:i2])
+                    continue
+                lines.extend(f"-{line}\n" for line in self.lines_a[i1:i2])
+                lines.extend(f"+{line}\n" for line in self.lines_b[j1:j2])
+        return "".join(lines)
+
+    def structured_hunks(self, intraline: bool = False) -> List[Dict[str, Any]]:
+        """Get the hunks as line ranges and ops.
+
+        Each hunk has 1-based ``old_start``/``new_start``, ``old_count``/
+        ``new_count`` and a list of ops: ``{"op": "equal"|"delete"|"insert",
+        "lines": [...]}`` or ``{"op": "replace", "old": [...], "new": [...]}``.
+        With ``intraline``, replace ops also get ``words``: the
+        ``word_changes`` of each old line paired with the new line at the
+        same offset.
+        """
+        hunks = []
+        for hunk in self.hunks:
+            first, last = hunk[0], hunk[-1]
+            ops = []
+            for tag, i1, i2, j1, j2 in hunk:
+                if tag == "equal" or tag == "delete":
+                    ops.append({"op": tag, "lines": self.lines_a[i1:i2]})
+                elif tag == "insert":
+                    ops.append({"op": tag, "lines": self.lines_b[j1:j2]})
+                else:
+                    op = {"op": tag, "old": self.lines_a[i1:i2], "new": self.lines_b[j1:j2]}
+                    if intraline:
+                        op["words"] = [
+                            word_changes(old, new) for old, new in zip(op["old"], op["new"], strict=False)
+                        ]
+                    ops.append(op)
+            hunks.append({
+                "old_start": first[1] + 1,
+                "old_count": last[2] - first[1],
+                "new_start": first[3] + 1,
+                "new_count": last[4] - first[3],
+                "ops": ops
+            })
+        return hunks
+
+    def side_by_side(self) -> List[List[Dict[str, Any]]]:
+        """Get the hunks as rows pairing old and new lines.
+
+        Each row has a ``type`` (equal, delete, insert or replace), 1-based
+        ``old_number``/``new_number`` and ``old_text``/``new_text``; a side
+        without a line has None for both.
+        """
+        hunks = []
+        for hunk in self.hunks:
+            rows = []
+            for tag, i1, i2, j1, j2 in hunk:
+                pairs = zip_longest(range(i1, i2), range(j1, j2))
+                for i, j in pairs:
+                    rows.append({
+                        "type": tag,
+                        "old_number": i + 1 if i is not None else None,
+                        "old_text": self.lines_a[i] if i is not None else None,
+                        "new_number": j + 1 if j is not None else None,
+                        "new_text": self.lines_b[j] if j is not None else None,
+                    })
+            hunks.append(rows)
+        return hunks
+
+    def html_table(self, fromdesc: str = "", todesc: str = "") -> str:
+        """Render the side-by-side rows as an HTML table.
+
+        Uses the ``difflib.HtmlDiff`` CSS classes (diff_add, diff_sub,
+        diff_chg) without intraline highlighting; each hunk is a tbody.
+        """
+        classes = {"insert": "diff_add", "delete": "diff_sub", "replace": "diff_chg"}
+
+        def cell(number: Optional[int], text: Optional[str], css: str) -> str:
+            if number is None:
+                return '<td class="diff_header"></td><td></td>'
+            css_attr = f' class="{css}"' if css else ""
+            return (
+                f'<td class="diff_header">{number}</td>'
+                f'<td nowrap="nowrap"><span{css_attr}>{html.escape(text)}</span></td>'
+            )
+
+        parts = [
+            '<table class="diff" cellspacing="0" cellpadding="0" rules="groups">',
+            '<thead><tr><th class="diff_header" colspan="2">{}</th>'
+            '<th class="diff_header" colspan="2">{}</th></tr></thead>'.format(
+                html.escape(fromdesc), html.escape(todesc)
+            ),
+        ]
+        for rows in self.side_by_side():
+            parts.append("<tbody>")
+            for row in rows:
+                css = classes.get(row["type"], "")
+                parts.append(
+                    "<tr>"
+                    + cell(row["old_number"], row["old_text"], css)
+                    + cell(row["new_number"], row["new_text"], css)
+                    + "</tr>"
+                )
+            parts.append("</tbody>")
+        parts.append("</table>")
+        return "\n".join(parts)
@@ -6,10 +6,32 @@ from src.crud.prompt import prompt_crud
 from src.crud.prompt_version import prompt_version_crud
 from src.crud.llm_config import llm_config_crud
 from src.crud.comparison import comparison_crud
+from src.crud.comparison_job import comparison_job_crud
+from src.crud.tag import tag_crud
+from src.crud.content_blob import content_blob_crud
+from src.crud.diff_cache import diff_cache_crud
+from src.crud.async_crud import (
+    async_prompt_crud,
+    async_prompt_version_crud,
+    async_llm_config_crud,
+    async_comparison_crud,
+    async_comparison_job_crud,
+    async_tag_crud,
+)
 
 __all__ = [
     "prompt_crud",
     "prompt_version_crud", 
     "llm_config_crud",
     "comparison_crud",
+    "comparison_job_crud",
+    "tag_crud",
+    "content_blob_crud",
+    "diff_cache_crud",
+    "async_prompt_crud",
+    "async_prompt_version_crud",
+    "async_llm_config_crud",
+    "async_comparison_crud",
+    "async_comparison_job_crud",
+    "async_tag_crud",
 ]
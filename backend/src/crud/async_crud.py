@@ -0,0 +1,46 @@
+"""
+Awaitable CRUD operations for async request handlers.
+"""
+
+from functools import wraps
+from typing import Any, Callable
+
+from src.core.database import run_db
+from src.crud.prompt import prompt_crud
+from src.crud.prompt_version import prompt_version_crud
+from src.crud.llm_config import llm_config_crud
+from src.crud.comparison import comparison_crud
+from src.crud.comparison_job import comparison_job_crud
+from src.crud.tag import tag_crud
+
+
+class AsyncCRUD:
+    """Async counterpart of a CRUD object.
+
+    Exposes the same methods as the wrapped object, awaitable and accepting
+    either a sync ``Session`` or an ``AsyncSession``, so queries never block
+    the event loop.
+    """
+
+    def __init__(self, crud: Any):
+        self._crud = crud
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self._crud, name)
+        if not callable(method):
+            return method
+
+        @wraps(method)
+        async def run(db, *args, **kwargs):
+            return await run_db(db, method, *args, **kwargs)
+
+        return run
+
+
+# Create singleton instances
+async_prompt_crud = AsyncCRUD(prompt_crud)
+async_prompt_version_crud = AsyncCRUD(prompt_version_crud)
+async_llm_config_crud = AsyncCRUD(llm_config_crud)
+async_comparison_crud = AsyncCRUD(comparison_crud)
+async_comparison_job_crud = AsyncCRUD(comparison_job_crud)
+async_tag_crud = AsyncCRUD(tag_crud)
@@ -3,8 +3,9 @@ CRUD operations for Comparison model.
 """
 
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
+from src.crud.pagination import paginate
 from src.models.comparison import Comparison
 from src.models.comparison_prompt_version import ComparisonPromptVersion
 from src.schemas.comparison import ComparisonCreate
@@ -23,22 +24,40 @@ class ComparisonCRUD:
         *,
         skip: int = 0,
         limit: int = 20,
-        type: Optional[str] = None
-    ) -> tuple[List[Comparison], int]:
-        """Get multiple comparisons with filtering and pagination."""
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        type: Optional[str] = None,
+        view: str = "full"
+    ) -> tuple[List[Comparison], Optional[int], Optional[str]]:
+        """Get multiple comparisons with filtering and pagination, newest first.
+        The "summary" view doesn't load results.
+        Returns the comparisons, the total (only if include_total) and the
+        cursor for the next page.
+        """
         query = db.query(Comparison)
 
+        if view == "summary":
+            query = query.options(defer(Comparison.results))
+
         # Apply type filter
         if type:
             query = query.filter(Comparison.type == type)
 
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
 
         # Apply pagination
-        comparisons = query.order_by(Comparison.created_at.desc()).offset(skip).limit(limit).all()
+        comparisons, next_cursor = paginate(
+            query,
+            sort="created_at:desc",
+            keys=[Comparison.created_at, Comparison.id],
+            descending=True,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
+        )
 
-        return comparisons, total
+        return comparisons, total, next_cursor
 
     def create(self, db: Session, *, obj_in: ComparisonCreate) -> Comparison:
         """Create a new comparison."""
@@ -0,0 +1,139 @@
+"""
+CRUD operations for Comparison Job model.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from src.core.config import settings
+from src.models.comparison_job import ComparisonJob
+
+
+class ComparisonJobCRUD:
+    """CRUD operations for Comparison Job model."""
+
+    def get(self, db: Session, job_id: str) -> Optional[ComparisonJob]:
+        """Get a comparison job by ID."""
+        return db.query(ComparisonJob).filter(ComparisonJob.id == job_id).first()
+
+    def create(
+        self,
+        db: Session,
+        *,
+        type: str,
+        params: Dict[str, Any],
+        comparison_id: Optional[str] = None
+    ) -> ComparisonJob:
+        """Create a new pending comparison job."""
+        db_obj = ComparisonJob(
+            type=type,
+            status="pending",
+            params=params,
+            comparison_id=comparison_id
+        )
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def has_unfinished_for_comparison(self, db: Session, *, comparison_id: str) -> bool:
+        """Check whether a comparison still has a pending or running job."""
+        row = (
+            db.query(ComparisonJob.id)
+            .filter(
+                ComparisonJob.comparison_id == comparison_id,
+                ComparisonJob.status.in_(["pending", "running"])
+            )
+            .first()
+        )
+        return row is not None
+
+    @staticmethod
+    def _claimable():
+        """Filter for jobs a worker may claim: pending ones, and running ones whose lease expired."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        return or_(
+            ComparisonJob.status == "pending",
+            and_(
+                ComparisonJob.status == "running",
+                or_(ComparisonJob.heartbeat_at.is_(None), ComparisonJob.heartbeat_at < cutoff)
+            )
+        )
+
+    def get_claimable_ids(self, db: Session, *, limit: Optional[int] = None) -> List[str]:
+        """Get IDs of pending and abandoned running jobs, oldest first."""
+        query = (
+            db.query(ComparisonJob.id)
+            .filter(self._claimable())
+            .order_by(ComparisonJob.created_at.asc())
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return [job_id for (job_id,) in query.all()]
+
+    def claim(self, db: Session, *, job_id: str) -> bool:
+        """Atomically move a pending or abandoned job to running.
+
+        Returns False if another worker already claimed the job.
+        """
+        claimed = (
+            db.query(ComparisonJob)
+            .filter(ComparisonJob.id == job_id, self._claimable())
+            .update(
+                {
+                    "status": "running",
+                    "started_at": func.now(),
+                    "heartbeat_at": datetime.now(timezone.utc)
+                },
+                synchronize_session=False
+            )
+        )
+        db.commit()
+        return claimed == 1
+
+    def claim_next(self, db: Session) -> Optional[str]:
+        """Claim the oldest claimable job, returning its ID."""
+        for job_id in self.get_claimable_ids(db, limit=10):
+            if self.claim(db, job_id=job_id):
+                return job_id
+        return None
+
+    def heartbeat(self, db: Session, *, job_id: str) -> None:
+        """Renew the lease of a running job."""
+        db.query(ComparisonJob).filter(
+            ComparisonJob.id == job_id, ComparisonJob.status == "running"
+        ).update({"heartbeat_at": datetime.now(timezone.utc)}, synchronize_session=False)
+        db.commit()
+
+    def release(self, db: Session, *, job_id: str) -> None:
+        """Return an interrupted running job to the queue."""
+        db.query(ComparisonJob).filter(
+            ComparisonJob.id == job_id, ComparisonJob.status == "running"
+        ).update(
+            {"status": "pending", "started_at": None, "heartbeat_at": None},
+            synchronize_session=False
+        )
+        db.commit()
+
+    def mark_completed(self, db: Session, *, job_id: str) -> None:
+        """Mark a job as successfully completed."""
+        db.query(ComparisonJob).filter(ComparisonJob.id == job_id).update(
+            {"status": "completed", "finished_at": func.now()},
+            synchronize_session=False
+        )
+        db.commit()
+
+    def mark_failed(self, db: Session, *, job_id: str, error: str) -> None:
+        """Mark a job as failed with an error message."""
+        db.query(ComparisonJob).filter(ComparisonJob.id == job_id).update(
+            {"status": "failed", "error_message": error, "finished_at": func.now()},
+            synchronize_session=False
+        )
+        db.commit()
+
+
+# Create a singleton instance
+comparison_job_crud = ComparisonJobCRUD()
@@ -0,0 +1,51 @@
+"""
+CRUD operations for Content Blob model.
+"""
+
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.content_blob import ContentBlob, content_hash_for, encode_delta, text_cache
+
+
+class ContentBlobCRUD:
+    """CRUD operations for Content Blob model."""
+
+    def get_or_create(self, db: Session, content: str, *, base_hash: Optional[str] = None) -> ContentBlob:
+        """Get the blob holding a text, creating it if needed. Does not commit.
+
+        In "delta" VERSION_STORAGE_MODE a new blob is stored as a delta
+        against the ``base_hash`` blob (usually the previous version), unless
+        the chain is due a snapshot or the delta isn't smaller than the text.
+        """
+        content_hash = content_hash_for(content)
+        blob = db.get(ContentBlob, content_hash)
+        if blob is not None:
+            return blob
+
+        blob = ContentBlob(hash=content_hash, size=len(content))
+        base = None
+        if settings.VERSION_STORAGE_MODE == "delta" and base_hash is not None:
+            base = db.get(ContentBlob, base_hash)
+
+        if base is not None and base.depth + 1 < settings.VERSION_SNAPSHOT_INTERVAL:
+            delta = encode_delta(base.text, content)
+            if len(delta) < len(content.encode("utf-8")):
+                blob.base = base
+                blob.delta = delta
+                blob.depth = base.depth + 1
+
+        if blob.delta is None:
+            blob.content = content
+            blob.depth = 0
+        else:
+            text_cache.put(content_hash, content)
+            blob._text = content
+
+        db.add(blob)
+        return blob
+
+
+# Create a singleton instance
+content_blob_crud = ContentBlobCRUD()
@@ -0,0 +1,122 @@
+"""
+Cache of computed diffs between prompt version texts.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.cache import LRUCache
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.diff import DIFF_FORMAT_VERSION
+from src.models.diff_cache import DiffCacheEntry
+
+
+def diff_cache_key(kind: str, hash_a: str, hash_b: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Get the cache key for a diff of two texts (by content hash) with options."""
+    payload = json.dumps([DIFF_FORMAT_VERSION, kind, hash_a, hash_b, options or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiffCacheCRUD:
+    """Diff cache with an in-memory LRU tier and an optional database tier.
+
+    Version texts never change once stored, so entries are keyed by content
+    hash and never go stale. The database tier is read through the caller's
+    session but written through a session of its own, so caching never
+    commits or rolls back the caller's transaction.
+    """
+
+    def __init__(self):
+        self._memory: LRUCache[Dict[str, Any]] = LRUCache(settings.DIFF_CACHE_SIZE)
+
+    def get_or_compute(
+        self,
+        db: Session,
+        *,
+        kind: str,
+        hash_a: str,
+        hash_b: str,
+        compute: Callable[[], Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Get a cached diff, computing and caching it on a miss."""
+        return self.get_many_or_compute(
+            db,
+            kind=kind,
+            pairs=[(hash_a, hash_b)],
+            compute=lambda hash_a, hash_b: compute(),
+            options=options
+        )[(hash_a, hash_b)]
+
+    def get_many_or_compute(
+        self,
+        db: Session,
+        *,
+        kind: str,
+        pairs: Iterable[Tuple[str, str]],
+        compute: Callable[[str, str], Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get cached diffs of many pairs of texts, computing the misses.
+
+        Returns the diff of each distinct ``(hash_a, hash_b)`` pair. Results
+        are collected in the returned dict rather than read back from the
+        in-memory tier, so a batch larger than DIFF_CACHE_SIZE doesn't evict
+        its own entries. The database tier is read in one query and the
+        misses are written in one statement.
+        """
+        keys = {pair: diff_cache_key(kind, pair[0], pair[1], options) for pair in pairs}
+        values: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        missing: Dict[str, Tuple[str, str]] = {}
+        for pair, key in keys.items():
+            value = self._memory.get(key)
+            if value is None:
+                missing[key] = pair
+            else:
+                values[pair] = value
+
+        if missing and settings.DIFF_CACHE_PERSISTENT:
+            entries = db.query(DiffCacheEntry).filter(DiffCacheEntry.key.in_(list(missing))).all()
+            for entry in entries:
+                values[missing.pop(entry.key)] = entry.value
+                self._memory.put(entry.key, entry.value)
+
+        computed = []
+        for key, (hash_a, hash_b) in missing.items():
+            value = compute(hash_a, hash_b)
+            values[(hash_a, hash_b)] = value
+            self._memory.put(key, value)
+            computed.append({"key": key, "hash_a": hash_a, "hash_b": hash_b, "value": value})
+
+        if settings.DIFF_CACHE_PERSISTENT:
+            self._store(computed)
+        return values
+
+    @staticmethod
+    def _store(entries: List[Dict[str, Any]]) -> None:
+        """Write entries to the database tier in one statement.
+
+        Entries another request stored first are kept as they are.
+        """
+        if not entries:
+            return
+        db = SessionLocal()
+        try:
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            db.execute(dialect.insert(DiffCacheEntry).on_conflict_do_nothing(index_elements=["key"]), entries)
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        """Drop the in-memory tier."""
+        self._memory.clear()
+
+
+# Create a singleton instance
+diff_cache_crud = DiffCacheCRUD()
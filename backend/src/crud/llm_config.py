@@ -6,6 +6,7 @@ from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
+from src.crud.pagination import paginate
 from src.models.llm_config import LLMConfig
 from src.schemas.llm_config import LLMConfigCreate, LLMConfigUpdate
 
@@ -23,10 +24,15 @@ class LLMConfigCRUD:
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
         provider: Optional[str] = None,
         active: Optional[bool] = None
-    ) -> Tuple[List[LLMConfig], int]:
-        """Get multiple LLM configs with filtering."""
+    ) -> Tuple[List[LLMConfig], Optional[int], Optional[str]]:
+        """Get multiple LLM configs with filtering, oldest first.
+        Returns the configs, the total (only if include_total) and the
+        cursor for the next page.
+        """
         query = db.query(LLMConfig)
         
         # Apply filters
@@ -36,12 +42,19 @@ class LLMConfigCRUD:
             query = query.filter(LLMConfig.is_active == active)
         
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
         
         # Apply pagination
-        configs = query.offset(skip).limit(limit).all()
+        configs, next_cursor = paginate(
+            query,
+            sort="created_at:asc",
+            keys=[LLMConfig.created_at, LLMConfig.id],
+            cursor=cursor,
+            skip=skip,
+            limit=limit
+        )
         
-        return configs, total
+        return configs, total, next_cursor
     
     def get_active_configs(self, db: Session) -> List[LLMConfig]:
         """Get all active LLM configs."""
@@ -66,6 +79,8 @@ class LLMConfigCRUD:
             base_url=obj_in.base_url,
             temperature=str(obj_in.temperature),
             max_tokens=obj_in.max_tokens,
+            requests_per_minute=obj_in.requests_per_minute,
+            tokens_per_minute=obj_in.tokens_per_minute,
             is_active=obj_in.active
         )
         db.add(db_obj)
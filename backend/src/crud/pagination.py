@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination helpers for list queries.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, String, literal, tuple_
+from sqlalchemy.orm import Query
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a sort key value to a JSON-safe value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _from_json(key: Any, value: Any) -> Any:
+    """Convert a JSON cursor value back to the type of its sort key."""
+    if value is not None and isinstance(getattr(key, "type", None), DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _bind_value(key: Any, value: Any, dialect: str) -> Any:
+    """Bind a decoded cursor value for comparison with its sort key."""
+    if dialect == "sqlite" and isinstance(value, datetime):
+        # SQLite keeps CURRENT_TIMESTAMP defaults as text without fractional
+        # seconds; compare against the same text, not the driver's format
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text, String)
+    return literal(value, getattr(key, "type", None))
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode the sort key values of the last row of a page as a cursor."""
+    payload = json.dumps({"s": sort, "v": [_to_json(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, keys: Sequence[Any]) -> List[Any]:
+    """Decode a cursor made by ``encode_cursor`` for the given sort keys.
+
+    Raises ValueError if the cursor is malformed or was made for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        if payload["s"] != sort or len(values) != len(keys):
+            raise ValueError
+        return [_from_json(key, value) for key, value in zip(keys, values, strict=True)]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+
+def paginate(
+    query: Query,
+    *,
+    sort: str,
+    keys: Sequence[Any],
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20
+) -> Tuple[List[Any], Optional[str]]:
+    """Get one page of a query ordered by ``keys`` (the last one unique).
+
+    Pages after a ``cursor`` are read with a keyset filter; without one,
+    ``skip`` rows are skipped. Returns the rows and the cursor for the next
+    page, or ``None`` on the last page. ``sort`` names the ordering so a
+    cursor can't be reused with a different one.
+    """
+    keys = list(keys)
+    if cursor is not None:
+        dialect = query.session.get_bind().dialect.name
+        values = [
+            _bind_value(key, value, dialect)
+            for key, value in zip(keys, decode_cursor(cursor, sort, keys), strict=True)
+        ]
+        if descending:
+            query = query.filter(tuple_(*keys) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+
+    # ORDER BY must come before OFFSET/LIMIT in a Query
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if cursor is None and skip:
+        query = query.offset(skip)
+
+    # Sort key values are selected alongside each row for the next cursor
+    rows = query.add_columns(*keys).limit(limit + 1).all()
+    items = [row[0] for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(sort, list(rows[limit - 1][1:]))
+    return items, next_cursor
@@ -2,13 +2,24 @@
 CRUD operations for Prompt model.
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-
+import re
+from typing import List, Optional, Any
+from sqlalchemy.orm import Query, Session, defer, with_expression
+from sqlalchemy import or_, column, func, literal_column, table
+
+from src.crud.pagination import paginate
+from src.crud.tag import tag_crud
+from src.models.base import PREVIEW_LENGTH
 from src.models.prompt import Prompt
 from src.schemas.prompt import PromptCreate, PromptUpdate
 
+# Trigram FTS5 index of prompts on SQLite, keyed on prompts.id (see
+# src.models.prompt); PostgreSQL serves ILIKE from pg_trgm indexes instead
+prompts_fts = table("prompts_fts", column("id"))
+
+# Words shorter than this have no trigram to look up
+TRIGRAM_MIN_LENGTH = 3
+
 
 class PromptCRUD:
     """CRUD operations for Prompt model."""
@@ -23,65 +34,123 @@ class PromptCRUD:
         *,
         skip: int = 0,
         limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
         search: Optional[str] = None,
         tags: Optional[List[str]] = None,
-        sort_by: str = "created_at",
-        sort_order: str = "desc"
-    ) -> tuple[List[Prompt], int]:
-        """Get multiple prompts with filtering and pagination."""
+        tags_match: str = "all",
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        view: str = "full"
+    ) -> tuple[List[Prompt], Optional[int], Optional[str]]:
+        """Get multiple prompts with filtering and pagination.
+        Tags match exactly; tags_match is "all" or "any" of them.
+        Searches sort by relevance unless another sort field is given.
+        The "summary" view loads only the start of content, for previews.
+        Returns the prompts, the total (only if include_total) and the
+        cursor for the next page.
+        """
         query = db.query(Prompt)
+        rank = None
+
+        if view == "summary":
+            # One extra character tells whether the preview is truncated
+            query = query.options(
+                defer(Prompt.content),
+                with_expression(Prompt.content_head, func.substr(Prompt.content, 1, PREVIEW_LENGTH + 1))
+            )
 
         # Apply search filter
         if search:
-            search_filter = or_(
-                Prompt.title.ilike(f"%{search}%"),
-                Prompt.description.ilike(f"%{search}%"),
-                Prompt.content.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query, rank = self._apply_search(db, query, search)
 
         # Apply tags filter
         if tags:
-            tag_filters = []
-            for tag in tags:
-                tag_filters.append(Prompt.tags.ilike(f"%{tag}%"))
-            if tag_filters:
-                query = query.filter(and_(*tag_filters))
+            query = tag_crud.filter_prompts(query, tags, match_all=tags_match != "any")
 
         # Get total count
-        total = query.count()
-
-        # Apply sorting
-        if sort_by == "created_at":
-            order_column = Prompt.created_at
-        elif sort_by == "updated_at":
-            order_column = Prompt.updated_at
-        elif sort_by == "title":
-            order_column = Prompt.title
-        else:
-            order_column = Prompt.created_at
+        total = query.count() if include_total else None
 
-        if sort_order == "desc":
-            query = query.order_by(order_column.desc())
+        # Apply sorting, with the id as tie-breaker so the order is stable
+        if rank is not None and sort_by in (None, "relevance"):
+            # Best match first
+            sort, sort_column, descending = "relevance", rank, False
         else:
-            query = query.order_by(order_column.asc())
+            if sort_by == "updated_at":
+                sort_column = Prompt.updated_at
+            elif sort_by == "title":
+                sort_column = Prompt.title
+            else:
+                sort_column = Prompt.created_at
+            descending = sort_order == "desc"
+            sort = f"{sort_column.key}:{sort_order}"
+
+        prompts, next_cursor = paginate(
+            query,
+            sort=sort,
+            keys=[sort_column, Prompt.id],
+            descending=descending,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
+        )
+
+        return prompts, total, next_cursor
 
-        # Apply pagination
-        prompts = query.offset(skip).limit(limit).all()
+    @staticmethod
+    def _contains(text: str) -> Any:
+        """Filter for prompts with a text anywhere in the title, description or content."""
+        return or_(
+            Prompt.title.icontains(text, autoescape=True),
+            Prompt.description.icontains(text, autoescape=True),
+            Prompt.content.icontains(text, autoescape=True)
+        )
+
+    def _apply_search(self, db: Session, query: Query, search: str) -> tuple[Query, Optional[Any]]:
+        """Filter a prompt query by a search string.
+
+        Every word must occur in the title, description or content, anywhere
+        in a word (so part of a CJK word matches too). On SQLite, words of
+        TRIGRAM_MIN_LENGTH or more characters are looked up in the trigram
+        full-text index; shorter words, and all words on other databases,
+        are matched with ILIKE. Returns the filtered query and a relevance
+        score that is lower for better matches, or ``None`` when no words
+        went through the full-text index.
+        """
+        terms = re.findall(r"\w+", search)
+        if not terms:
+            return query.filter(self._contains(search)), None
+
+        indexed = []
+        if db.get_bind().dialect.name == "sqlite":
+            indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+
+        rank = None
+        if indexed:
+            # Words are \w+, so quoting them needs no escaping
+            match = " ".join(f'"{term}"' for term in indexed)
+            query = (
+                query.join(prompts_fts, prompts_fts.c.id == Prompt.id)
+                .filter(literal_column("prompts_fts").match(match))
+            )
+            # bm25() is lower for better matches; title hits weigh the most
+            # (the first weight is for the unindexed id column)
+            rank = func.bm25(literal_column("prompts_fts"), 0.0, 10.0, 5.0, 1.0)
 
-        return prompts, total
+        for term in terms:
+            if term not in indexed:
+                query = query.filter(self._contains(term))
+        return query, rank
 
     def create(self, db: Session, *, obj_in: PromptCreate) -> Prompt:
         """Create a new prompt."""
-        import json
-        
         db_obj = Prompt(
             title=obj_in.title,
             description=obj_in.description,
-            content=obj_in.content,
-            tags=json.dumps(obj_in.tags) if obj_in.tags else None
+            content=obj_in.content
         )
         db.add(db_obj)
+        tag_crud.set_prompt_tags(db, prompt=db_obj, names=obj_in.tags)
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -94,13 +163,11 @@ class PromptCRUD:
         obj_in: PromptUpdate
     ) -> Prompt:
         """Update a prompt."""
-        import json
-        
         update_data = obj_in.model_dump(exclude_unset=True)
-        
+
         if "tags" in update_data:
-            update_data["tags"] = json.dumps(update_data["tags"]) if update_data["tags"] else None
-        
+            tag_crud.set_prompt_tags(db, prompt=db_obj, names=update_data.pop("tags"))
+
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
@@ -2,58 +2,92 @@
 CRUD operations for Prompt Version model.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from src.models.prompt_version import PromptVersion
+from src.core.diff import LineDiff
+from src.crud.content_blob import content_blob_crud
+from src.crud.diff_cache import diff_cache_crud
+from src.models.prompt_version import PromptVersion, version_tuple
 from src.schemas.prompt_version import PromptVersionCreate, PromptVersionUpdate
 
 
 class PromptVersionCRUD:
     """CRUD operations for Prompt Version model."""
 
+    @staticmethod
+    def _load_content(versions: List[PromptVersion]) -> List[PromptVersion]:
+        """Rebuild delta-stored content while the session is still open."""
+        for version in versions:
+            _ = version.blob.text
+        return versions
+
     def get(self, db: Session, version_id: str) -> Optional[PromptVersion]:
         """Get a prompt version by ID."""
-        return db.query(PromptVersion).filter(PromptVersion.id == version_id).first()
+        version = db.query(PromptVersion).filter(PromptVersion.id == version_id).first()
+        if version:
+            self._load_content([version])
+        return version
 
     def get_versions(self, db: Session, prompt_id: str) -> List[PromptVersion]:
         """Get all versions for a specific prompt.
-        Sorted by version number descending (numerically, not lexically).
+        Sorted by version number descending, segment by segment ("2.10" before "2.9").
         """
         versions = (
             db.query(PromptVersion)
             .filter(PromptVersion.prompt_id == prompt_id)
+            .order_by(PromptVersion.version_key.desc(), PromptVersion.created_at.desc())
+            .all()
+        )
+        return self._load_content(versions)
+
+    def get_version_summaries(self, db: Session, prompt_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get latest version number and version count for several prompts.
+        Reads one row per prompt, in a single query for all prompts.
+        """
+        if not prompt_ids:
+            return {}
+
+        # Rank each prompt's versions newest first; ties on the key go to the latest created
+        ranked = (
+            db.query(
+                PromptVersion.prompt_id.label("prompt_id"),
+                PromptVersion.version_number.label("version_number"),
+                func.row_number().over(
+                    partition_by=PromptVersion.prompt_id,
+                    order_by=(
+                        PromptVersion.version_key.desc(),
+                        PromptVersion.created_at.desc(),
+                        PromptVersion.id.desc()
+                    )
+                ).label("rank"),
+                func.count(PromptVersion.id).over(partition_by=PromptVersion.prompt_id).label("total_versions")
+            )
+            .filter(PromptVersion.prompt_id.in_(prompt_ids))
+            .subquery()
+        )
+        rows = (
+            db.query(ranked.c.prompt_id, ranked.c.version_number, ranked.c.total_versions)
+            .filter(ranked.c.rank == 1)
             .all()
         )
 
-        if not versions:
-            return []
-
-        # Sort by version number numerically (handles both int and str)
-        def version_sort_key(v):
-            try:
-                version_value = v.version_number
-                # Handle None
-                if version_value is None:
-                    return 0.0
-                # Handle both integer (old) and string (new) version numbers
-                if isinstance(version_value, int):
-                    return float(version_value)
-                elif isinstance(version_value, str):
-                    return float(version_value)
-                else:
-                    return 0.0
-            except (ValueError, TypeError, AttributeError) as e:
-                # Log the error for debugging
-                print(f"Error sorting version {v.id}: {e}, version_number={version_value}")
-                return 0.0
-
-        try:
-            return sorted(versions, key=version_sort_key, reverse=True)
-        except Exception as e:
-            # Fallback: return unsorted if sorting fails
-            print(f"Failed to sort versions: {e}")
-            return versions
+        summaries = {
+            prompt_id: {"latest_version": "0.0", "total_versions": 0}
+            for prompt_id in prompt_ids
+        }
+        for prompt_id, version_number, total_versions in rows:
+            summaries[prompt_id] = {
+                # Versions without a positive numeric version number don't count as latest
+                "latest_version": str(version_number) if any(version_tuple(version_number)) else "0.0",
+                "total_versions": total_versions
+            }
+        return summaries
+
+    def get_version_summary(self, db: Session, prompt_id: str) -> Dict[str, Any]:
+        """Get latest version number and version count for a prompt."""
+        return self.get_version_summaries(db, [prompt_id])[prompt_id]
 
     def get_by_prompt(
         self,
@@ -64,81 +98,45 @@ class PromptVersionCRUD:
         limit: int = 20
     ) -> List[PromptVersion]:
         """Get versions for a specific prompt.
-        Sorted by version number descending (numerically, not lexically).
+        Sorted by version number descending, segment by segment ("2.10" before "2.9").
         """
         versions = (
             db.query(PromptVersion)
             .filter(PromptVersion.prompt_id == prompt_id)
+            .order_by(PromptVersion.version_key.desc(), PromptVersion.created_at.desc())
+            .offset(skip)
+            .limit(limit)
             .all()
         )
+        return self._load_content(versions)
 
-        if not versions:
-            return []
-
-        # Sort by version number numerically (handles both int and str)
-        def version_sort_key(v):
-            try:
-                version_value = v.version_number
-                # Handle None
-                if version_value is None:
-                    return 0.0
-                # Handle both integer (old) and string (new) version numbers
-                if isinstance(version_value, int):
-                    return float(version_value)
-                elif isinstance(version_value, str):
-                    return float(version_value)
-                else:
-                    return 0.0
-            except (ValueError, TypeError, AttributeError) as e:
-                # Log the error for debugging
-                print(f"Error sorting version {v.id}: {e}, version_number={version_value}")
-                return 0.0
-
-        try:
-            sorted_versions = sorted(versions, key=version_sort_key, reverse=True)
-            # Apply skip and limit
-            return sorted_versions[skip:skip + limit]
-        except Exception as e:
-            # Fallback: return unsorted if sorting fails
-            print(f"Failed to sort versions: {e}")
-            return versions[skip:skip + limit]
+    def get_latest_content_hash(self, db: Session, prompt_id: str) -> Optional[str]:
+        """Get the content hash of a prompt's latest version, without its content."""
+        return (
+            db.query(PromptVersion.content_hash)
+            .filter(PromptVersion.prompt_id == prompt_id)
+            .order_by(PromptVersion.version_key.desc(), PromptVersion.created_at.desc())
+            .limit(1)
+            .scalar()
+        )
 
     def get_next_version_number(self, db: Session, prompt_id: str) -> str:
-        """Get the next version number for a prompt.
-        Handles both integer (old DB schema) and string (new DB schema) version numbers.
-        """
-        versions = (
+        """Get the next version number for a prompt."""
+        latest = (
             db.query(PromptVersion.version_number)
             .filter(PromptVersion.prompt_id == prompt_id)
-            .all()
+            .order_by(PromptVersion.version_key.desc(), PromptVersion.created_at.desc(), PromptVersion.id.desc())
+            .limit(1)
+            .scalar()
         )
+        parts = version_tuple(latest)
 
-        if not versions:
+        # Increment the major number, keeping any minor numbers ("2.5" -> "3.5")
+        if not parts:
             return "1.0"
-
-        # Parse all version numbers and find the maximum
-        max_num = 0.0
-        for (version_value,) in versions:
-            try:
-                # Handle both integer (old) and string (new) version numbers
-                if isinstance(version_value, int):
-                    num = float(version_value)
-                else:
-                    num = float(version_value)
-
-                if num > max_num:
-                    max_num = num
-            except (ValueError, TypeError):
-                # If not a valid number, skip it
-                continue
-
-        # Increment by 1.0
-        next_version = max_num + 1.0
-        # Format: if it's a whole number, return "X.0", otherwise keep decimal
-        if next_version.is_integer():
-            return f"{int(next_version)}.0"
-        else:
-            return str(next_version)
+        if not any(parts[1:]):
+            return f"{parts[0] + 1}.0"
+        return ".".join(str(part) for part in (parts[0] + 1,) + parts[1:])
 
     def create(self, db: Session, *, obj_in: PromptVersionCreate, prompt_id: str) -> PromptVersion:
         """Create a new prompt version."""
@@ -146,7 +144,7 @@ class PromptVersionCRUD:
         version_number = obj_in.version_number if obj_in.version_number is not None else self.get_next_version_number(db, prompt_id)
 
         # Check if version number already exists
-        existing = db.query(PromptVersion).filter(
+        existing = db.query(PromptVersion.id).filter(
             PromptVersion.prompt_id == prompt_id,
             PromptVersion.version_number == version_number
         ).first()
@@ -154,10 +152,14 @@ class PromptVersionCRUD:
         if existing:
             raise ValueError(f"Version {version_number} already exists for this prompt")
 
+        # Delta storage diffs against the latest version
+        blob = content_blob_crud.get_or_create(
+            db, obj_in.content, base_hash=self.get_latest_content_hash(db, prompt_id)
+        )
         db_obj = PromptVersion(
             prompt_id=prompt_id,
             version_number=version_number,
-            content=obj_in.content,
+            blob=blob,
             change_notes=obj_in.change_notes
         )
         db.add(db_obj)
@@ -174,6 +176,11 @@ class PromptVersionCRUD:
     ) -> PromptVersion:
         """Update a prompt version."""
         update_data = obj_in.model_dump(exclude_unset=True)
+
+        if "content" in update_data:
+            db_obj.blob = content_blob_crud.get_or_create(
+                db, update_data.pop("content"), base_hash=db_obj.content_hash
+            )
         
         for field, value in update_data.items():
             setattr(db_obj, field, value)
@@ -222,17 +229,19 @@ class PromptVersionCRUD:
         if not version_a_obj or not version_b_obj:
             return None
         
-        # Simple diff implementation
-        import difflib
-        
-        diff = list(difflib.unified_diff(
-            version_a_obj.content.splitlines(keepends=True),
-            version_b_obj.content.splitlines(keepends=True),
-            fromfile=f"version_{version_a}",
-            tofile=f"version_{version_b}",
-            lineterm=""
-        ))
-        
+        def compute() -> dict:
+            diff = LineDiff(version_a_obj.content, version_b_obj.content)
+            return {"diff": diff.unified_diff(f"version_{version_a}", f"version_{version_b}")}
+
+        cached = diff_cache_crud.get_or_compute(
+            db,
+            kind="unified",
+            hash_a=version_a_obj.content_hash,
+            hash_b=version_b_obj.content_hash,
+            options={"labels": [version_a, version_b]},
+            compute=compute
+        )
+
         return {
             "version_a": {
                 "version_number": version_a_obj.version_number,
@@ -242,7 +251,7 @@ class PromptVersionCRUD:
                 "version_number": version_b_obj.version_number,
                 "content": version_b_obj.content
             },
-            "diff": "".join(diff)
+            "diff": cached["diff"]
         }
 
 
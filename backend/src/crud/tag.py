@@ -0,0 +1,86 @@
+"""
+CRUD operations for Tag model.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session
+
+from src.models.prompt import Prompt
+from src.models.tag import Tag, PromptTag
+
+
+def normalize_tag_names(names: Optional[Iterable[str]]) -> List[str]:
+    """Strip tag names and drop empty and duplicate ones, keeping their order."""
+    normalized: List[str] = []
+    for name in names or []:
+        name = name.strip()
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+class TagCRUD:
+    """CRUD operations for Tag model."""
+
+    def get_or_create_many(self, db: Session, names: List[str]) -> List[Tag]:
+        """Get tags by name, creating the missing ones. Does not commit."""
+        if not names:
+            return []
+
+        existing = {tag.name: tag for tag in db.query(Tag).filter(Tag.name.in_(names)).all()}
+        tags = []
+        for name in names:
+            tag = existing.get(name)
+            if tag is None:
+                tag = Tag(name=name)
+                db.add(tag)
+                existing[name] = tag
+            tags.append(tag)
+        return tags
+
+    def set_prompt_tags(self, db: Session, *, prompt: Prompt, names: Optional[Iterable[str]]) -> None:
+        """Replace a prompt's tags, keeping the given order. Does not commit."""
+        tags = self.get_or_create_many(db, normalize_tag_names(names))
+
+        # Reuse existing links so unchanged tags don't hit the unique constraint
+        links = {link.tag.name: link for link in prompt.tag_links}
+        new_links = []
+        for position, tag in enumerate(tags):
+            link = links.get(tag.name) or PromptTag(tag=tag)
+            link.position = position
+            new_links.append(link)
+        prompt.tag_links = new_links
+
+    def filter_prompts(self, query: Query, names: List[str], *, match_all: bool = True) -> Query:
+        """Filter a prompt query to prompts with all (or any) of the given tags."""
+        names = normalize_tag_names(names)
+        if not names:
+            return query
+
+        tagged = (
+            select(PromptTag.prompt_id)
+            .join(Tag, Tag.id == PromptTag.tag_id)
+            .where(Tag.name.in_(names))
+        )
+        if match_all:
+            tagged = tagged.group_by(PromptTag.prompt_id).having(func.count(PromptTag.tag_id) == len(names))
+
+        return query.filter(Prompt.id.in_(tagged))
+
+    def get_counts(self, db: Session, *, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get tags with the number of prompts using each, most used first."""
+        prompt_count = func.count(PromptTag.id)
+        rows = (
+            db.query(Tag.name, prompt_count)
+            .join(PromptTag, PromptTag.tag_id == Tag.id)
+            .group_by(Tag.id, Tag.name)
+            .order_by(prompt_count.desc(), Tag.name)
+            .limit(limit)
+            .all()
+        )
+        return [{"name": name, "count": count} for name, count in rows]
+
+
+# Create a singleton instance
+tag_crud = TagCRUD()
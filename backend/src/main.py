@@ -3,17 +3,36 @@ FastAPI application entry point.
 This implements the basic FastAPI application to satisfy contract tests (Task 1.4).
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import structlog
 
 from src.api.v1.api import router as api_v1_router
+from src.core.database import dispose_async_engine
 from src.core.logging import logger
+from src.services import llm_service, comparison_job_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage long-lived resources for the application lifetime."""
+    await llm_service.startup()
+    await comparison_job_service.start()
+    try:
+        yield
+    finally:
+        await comparison_job_service.stop()
+        await llm_service.shutdown()
+        await dispose_async_engine()
+
 
 app = FastAPI(
     title="Prompt Center API",
     description="API for prompt management system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware - Allow frontend to access API
@@ -4,18 +4,29 @@ SQLAlchemy models for Prompt Center.
 
 from src.models.base import BaseModel, UUIDMixin, TimestampMixin
 from src.models.prompt import Prompt
+from src.models.content_blob import ContentBlob
 from src.models.prompt_version import PromptVersion
+from src.models.diff_cache import DiffCacheEntry
+from src.models.tag import Tag, PromptTag
 from src.models.llm_config import LLMConfig
 from src.models.comparison import Comparison
 from src.models.comparison_prompt_version import ComparisonPromptVersion
+from src.models.comparison_job import ComparisonJob
+from src.models.llm_response_cache import LLMResponseCacheEntry
 
 __all__ = [
     "BaseModel",
     "UUIDMixin", 
     "TimestampMixin",
     "Prompt",
+    "ContentBlob",
     "PromptVersion",
+    "DiffCacheEntry",
+    "Tag",
+    "PromptTag",
     "LLMConfig",
     "Comparison",
     "ComparisonPromptVersion",
+    "ComparisonJob",
+    "LLMResponseCacheEntry",
 ]
@@ -2,6 +2,8 @@
 Base model classes for SQLAlchemy.
 """
 
+from typing import Optional
+
 from sqlalchemy import Column, String, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql import func
@@ -9,6 +11,16 @@ import uuid
 
 from src.core.database import Base
 
+# Number of characters shown in content previews
+PREVIEW_LENGTH = 100
+
+
+def make_preview(text: Optional[str]) -> str:
+    """Get a preview of a text (first PREVIEW_LENGTH characters)."""
+    if text:
+        return text[:PREVIEW_LENGTH] + "..." if len(text) > PREVIEW_LENGTH else text
+    return ""
+
 
 class TimestampMixin:
     """Mixin for timestamp fields."""
@@ -2,7 +2,7 @@
 Comparison model for storing prompt comparison results.
 """
 
-from sqlalchemy import Column, String, Text, Integer, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from src.models.base import BaseModel
@@ -30,6 +30,11 @@ class Comparison(BaseModel):
     # Relationships
     llm_config = relationship("LLMConfig")
     prompt_versions = relationship("ComparisonPromptVersion", back_populates="comparison", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        Index('ix_comparisons_created_at_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f"<Comparison(id={self.id}, name={self.name}, type={self.type})>"
@@ -0,0 +1,29 @@
+"""
+Comparison job model for tracking background comparison execution.
+"""
+
+from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class ComparisonJob(BaseModel):
+    """Comparison job model for queued, running and finished comparisons."""
+
+    __tablename__ = "comparison_jobs"
+
+    type = Column(String(50), nullable=False)  # same_llm, different_llm
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, running, completed, failed
+    params = Column(JSON, nullable=False)  # Execution parameters for the comparison
+    comparison_id = Column(String, ForeignKey("comparisons.id", ondelete="SET NULL"), nullable=True, index=True)
+    error_message = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Renewed while running; a stale one lets the job be reclaimed
+
+    # Relationships
+    comparison = relationship("Comparison")
+
+    def __repr__(self):
+        return f"<ComparisonJob(id={self.id}, type={self.type}, status={self.status})>"
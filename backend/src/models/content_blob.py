@@ -0,0 +1,110 @@
+"""
+Content blob model for content-addressed storage of version content.
+"""
+
+import hashlib
+import json
+import zlib
+
+from sqlalchemy import Column, String, Text, Integer, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.core.cache import LRUCache
+from src.core.config import settings
+from src.core.diff import diff_opcodes
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+def content_hash_for(content: str) -> str:
+    """Get the content address (SHA-256 hex digest) of a text."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def encode_delta(base: str, content: str) -> bytes:
+    """Encode a text as a compressed line delta against a base text.
+
+    The delta is a list of ``[start, end]`` ranges of base lines to copy
+    and strings to insert, in order.
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = content.splitlines(keepends=True)
+    opcodes, _ = diff_opcodes(base_lines, lines)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(lines[j1:j2]))
+    return zlib.compress(json.dumps(ops).encode("utf-8"))
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild a text from its base text and an ``encode_delta`` delta."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+# Rebuilt texts by content hash; blobs never change, so entries never go stale
+text_cache: LRUCache[str] = LRUCache(settings.VERSION_CACHE_SIZE)
+
+
+class ContentBlob(Base, TimestampMixin):
+    """Content blob model, one row per distinct text keyed by its hash.
+
+    A blob holds either the full text (a snapshot) or a compressed delta
+    against a base blob, as written in "delta" VERSION_STORAGE_MODE.
+    """
+
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 hex digest of the full text
+    content = Column(Text, nullable=True)  # Full text; NULL for delta blobs
+    size = Column(Integer, nullable=False)  # Length of the full text in characters
+    base_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=True)
+    delta = Column(LargeBinary, nullable=True)  # encode_delta() against the base blob
+    depth = Column(Integer, nullable=False, default=0)  # Deltas between this blob and its snapshot
+
+    # Relationships
+    base = relationship("ContentBlob", remote_side=[hash])
+
+    @property
+    def text(self) -> str:
+        """Get the full text, rebuilding it from the delta chain if needed."""
+        if self.content is not None:
+            return self.content
+
+        # Rebuilt texts stay on the instance so they can be read after the
+        # session is gone, whatever the shared cache evicts
+        text = getattr(self, "_text", None)
+        if text is None:
+            text = text_cache.get(self.hash)
+        if text is None:
+            # Walk back to the nearest snapshot or cached text, then replay
+            chain = [self]
+            base_text = None
+            while base_text is None:
+                base = chain[-1].base
+                if base.content is not None:
+                    base_text = base.content
+                else:
+                    base_text = text_cache.get(base.hash)
+                    if base_text is None:
+                        chain.append(base)
+
+            for blob in reversed(chain):
+                base_text = apply_delta(base_text, blob.delta)
+                text_cache.put(blob.hash, base_text)
+            text = base_text
+        self._text = text
+        return text
+
+    def __repr__(self):
+        return f"<ContentBlob(hash={self.hash}, size={self.size}, depth={self.depth})>"
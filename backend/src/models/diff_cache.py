@@ -0,0 +1,22 @@
+"""
+Diff cache entry model for the persistent tier of the version diff cache.
+"""
+
+from sqlalchemy import Column, String, JSON
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class DiffCacheEntry(Base, TimestampMixin):
+    """Computed diff between two version texts, keyed by content and options."""
+
+    __tablename__ = "diff_cache_entries"
+
+    key = Column(String(64), primary_key=True)  # SHA-256 of kind, content hashes and options
+    hash_a = Column(String(64), nullable=False, index=True)  # Content hash of the old text
+    hash_b = Column(String(64), nullable=False, index=True)  # Content hash of the new text
+    value = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<DiffCacheEntry(key={self.key})>"
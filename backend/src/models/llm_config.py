@@ -2,7 +2,7 @@
 LLM Configuration model for storing LLM provider settings.
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer
+from sqlalchemy import Column, String, Text, Boolean, Integer, Index
 
 from src.models.base import BaseModel
 
@@ -19,7 +19,14 @@ class LLMConfig(BaseModel):
     base_url = Column(String(500), nullable=True)  # Custom API base URL for proxies or custom providers
     temperature = Column(String(10), nullable=True)
     max_tokens = Column(Integer, nullable=True)
+    requests_per_minute = Column(Integer, nullable=True)  # Client-side request rate limit; NULL uses the default
+    tokens_per_minute = Column(Integer, nullable=True)  # Client-side token rate limit; NULL uses the default
     is_active = Column(Boolean, default=True, nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        Index('ix_llm_configs_created_at_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f"<LLMConfig(id={self.id}, name={self.name}, provider={self.provider})>"
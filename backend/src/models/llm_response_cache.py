@@ -0,0 +1,23 @@
+"""
+LLM response cache entry model for the persistent tier of the LLM response cache.
+"""
+
+from sqlalchemy import Column, String, JSON, DateTime
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class LLMResponseCacheEntry(Base, TimestampMixin):
+    """Successful LLM call result, keyed by provider, model, parameters and prompt."""
+
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)  # SHA-256 of the request fields, see llm_cache_key()
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=True)
+    result = Column(JSON, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<LLMResponseCacheEntry(key={self.key}, provider={self.provider}, model={self.model})>"
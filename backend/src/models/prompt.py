@@ -2,44 +2,88 @@
 Prompt model for storing prompt templates.
 """
 
-from sqlalchemy import Column, String, Text, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, String, Text, Integer, Index, event
+from sqlalchemy.orm import relationship, query_expression
 
-from src.models.base import BaseModel
+from src.models.base import BaseModel, make_preview
 
 
 class Prompt(BaseModel):
     """Prompt model for storing prompt templates."""
-    
+
     __tablename__ = "prompts"
-    
+
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
     content = Column(Text, nullable=False)
-    tags = Column(Text, nullable=True)  # JSON string of tags
-    
+
+    # Start of content, loaded by summary queries that defer content
+    content_head = query_expression()
+
     # Relationships
     versions = relationship("PromptVersion", back_populates="prompt", cascade="all, delete-orphan")
-    
+    tag_links = relationship(
+        "PromptTag",
+        back_populates="prompt",
+        cascade="all, delete-orphan",
+        order_by="PromptTag.position",
+        lazy="selectin"
+    )
+
+    __table_args__ = (
+        # Keyset pagination orders by (sort column, id)
+        Index('ix_prompts_created_at_id', 'created_at', 'id'),
+        Index('ix_prompts_updated_at_id', 'updated_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Prompt(id={self.id}, title={self.title})>"
-    
+
+    @property
+    def content_preview(self) -> str:
+        """Get a preview of the content (first 100 characters)."""
+        if self.content_head is not None:
+            return make_preview(self.content_head)
+        return make_preview(self.content)
+
     @property
     def tag_list(self):
         """Get tags as list."""
-        if self.tags:
-            import json
-            try:
-                return json.loads(self.tags)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
-    
-    @tag_list.setter
-    def tag_list(self, value):
-        """Set tags from list."""
-        if value:
-            import json
-            self.tags = json.dumps(value)
-        else:
-            self.tags = None
+        return [link.tag.name for link in self.tag_links]
+
+
+# Full-text index of prompts on SQLite: a trigram FTS5 table keyed on
+# prompts.id (not the implicit rowid, which VACUUM may renumber), kept in
+# sync by triggers. Trigrams match any substring, including parts of CJK
+# words that have no separators. The key_prompt_search_index_on_id
+# migration creates the same objects on databases managed by Alembic.
+SQLITE_SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS prompts_fts USING fts5(
+        id UNINDEXED, title, description, content,
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS prompts_fts_ai AFTER INSERT ON prompts BEGIN
+        INSERT INTO prompts_fts(id, title, description, content)
+        VALUES (new.id, new.title, new.description, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS prompts_fts_ad AFTER DELETE ON prompts BEGIN
+        DELETE FROM prompts_fts WHERE id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS prompts_fts_au AFTER UPDATE OF id, title, description, content ON prompts BEGIN
+        DELETE FROM prompts_fts WHERE id = old.id;
+        INSERT INTO prompts_fts(id, title, description, content)
+        VALUES (new.id, new.title, new.description, new.content);
+    END
+    """,
+]
+
+for statement in SQLITE_SEARCH_INDEX_DDL:
+    event.listen(Prompt.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Prompt.__table__, "after_drop", DDL("DROP TABLE IF EXISTS prompts_fts").execute_if(dialect="sqlite"))
@@ -2,10 +2,54 @@
 Prompt version model for storing different versions of prompt content.
 """
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
+import re
+from typing import Any, Tuple
 
-from src.models.base import BaseModel
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, validates
+
+from src.models.base import BaseModel, make_preview
+
+VERSION_KEY_DIGITS = 10
+
+_NUMERIC_VERSION = re.compile(r"[0-9]+(?:\.[0-9]+)*")
+
+
+def version_tuple(version_number: Any) -> Tuple[int, ...]:
+    """Get the numeric segments of a version number ("2.10" -> (2, 10)).
+
+    Version numbers that are not dot-separated non-negative integers give
+    an empty tuple.
+    """
+    if version_number is None or not _NUMERIC_VERSION.fullmatch(str(version_number)):
+        return ()
+    return tuple(int(part) for part in str(version_number).split("."))
+
+
+def version_key_for(version_number: Any) -> str:
+    """Get the sort key for a version number ("2.10" -> "0000000002.0000000010").
+
+    Versions sort segment by segment, like software versions rather than
+    decimals: "2.10" comes after "2.9" and "2.5", and "2" before "2.0".
+    Segments are zero-padded so the keys sort like the version tuples;
+    version numbers that are not numeric get "" and sort first.
+    """
+    limit = 10 ** VERSION_KEY_DIGITS - 1
+    return ".".join(f"{min(part, limit):0{VERSION_KEY_DIGITS}d}" for part in version_tuple(version_number))
+
+
+def check_version_number(version_number: str) -> str:
+    """Reject numeric version numbers that would share another's sort key.
+
+    Segments with leading zeros ("1.05" sorts like "1.5") or more than
+    VERSION_KEY_DIGITS digits are not accepted. Raises ValueError.
+    """
+    for part in version_number.split(".") if version_tuple(version_number) else []:
+        if len(part) > 1 and part.startswith("0"):
+            raise ValueError(f"Version number segments can't have leading zeros: {version_number}")
+        if len(part) > VERSION_KEY_DIGITS:
+            raise ValueError(f"Version number segments can't have more than {VERSION_KEY_DIGITS} digits")
+    return version_number
 
 
 class PromptVersion(BaseModel):
@@ -15,11 +59,13 @@ class PromptVersion(BaseModel):
 
     prompt_id = Column(String, ForeignKey("prompts.id", ondelete="CASCADE"), nullable=False, index=True)
     version_number = Column(String(50), nullable=False)  # Changed from Integer to String to support decimal versions like "2.5"
-    content = Column(Text, nullable=False)
+    version_key = Column(String, nullable=False, default="", server_default="")  # Zero-padded version_number segments, kept in sync for SQL sorting
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=False, index=True)
     change_notes = Column(Text, nullable=True)
     
     # Relationships
     prompt = relationship("Prompt", back_populates="versions")
+    blob = relationship("ContentBlob", lazy="joined")
 
     # Comparison relationships
     comparison_executions = relationship(
@@ -30,14 +76,24 @@ class PromptVersion(BaseModel):
     
     __table_args__ = (
         UniqueConstraint('prompt_id', 'version_number', name='unique_prompt_version'),
+        Index('ix_prompt_versions_prompt_id_version_key', 'prompt_id', 'version_key'),
     )
+
+    @validates("version_number")
+    def _sync_version_key(self, key, value):
+        """Keep version_key in sync whenever version_number is set."""
+        self.version_key = version_key_for(value)
+        return value
     
     def __repr__(self):
         return f"<PromptVersion(id={self.id}, prompt_id={self.prompt_id}, version={self.version_number})>"
     
+    @property
+    def content(self) -> str:
+        """Get the content, stored once per distinct text in content_blobs."""
+        return self.blob.text
+
     @property
     def content_preview(self) -> str:
         """Get a preview of the content (first 100 characters)."""
-        if self.content:
-            return self.content[:100] + "..." if len(self.content) > 100 else self.content
-        return ""
+        return make_preview(self.content)
@@ -0,0 +1,43 @@
+"""
+Tag models for labelling prompts.
+"""
+
+from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class Tag(BaseModel):
+    """Tag model, one row per distinct tag name."""
+
+    __tablename__ = "tags"
+
+    name = Column(String(100), nullable=False, unique=True, index=True)
+
+    # Relationships
+    prompt_links = relationship("PromptTag", back_populates="tag", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name={self.name})>"
+
+
+class PromptTag(BaseModel):
+    """Junction model for prompts and tags."""
+
+    __tablename__ = "prompt_tags"
+
+    prompt_id = Column(String, ForeignKey("prompts.id", ondelete="CASCADE"), nullable=False)
+    tag_id = Column(String, ForeignKey("tags.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)  # Order of the tag on the prompt
+
+    # Relationships
+    prompt = relationship("Prompt", back_populates="tag_links")
+    tag = relationship("Tag", back_populates="prompt_links", lazy="joined")
+
+    __table_args__ = (
+        UniqueConstraint('prompt_id', 'tag_id', name='unique_prompt_tag'),
+    )
+
+    def __repr__(self):
+        return f"<PromptTag(prompt_id={self.prompt_id}, tag_id={self.tag_id})>"
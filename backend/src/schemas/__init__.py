@@ -3,7 +3,7 @@ Pydantic schemas for Prompt Center API.
 """
 
 from src.schemas.prompt import (
-    PromptBase, PromptCreate, PromptUpdate, PromptResponse, PromptListResponse
+    PromptBase, PromptCreate, PromptUpdate, PromptResponse, PromptSummaryResponse, PromptListResponse
 )
 from src.schemas.prompt_version import (
     PromptVersionBase, PromptVersionCreate, PromptVersionUpdate, PromptVersionResponse
@@ -12,16 +12,22 @@ from src.schemas.llm_config import (
     LLMConfigBase, LLMConfigCreate, LLMConfigUpdate, LLMConfigResponse, LLMConfigListResponse
 )
 from src.schemas.comparison import (
-    ComparisonBase, ComparisonCreate, ComparisonResponse, ComparisonListResponse
+    ComparisonBase, ComparisonCreate, ComparisonResponse, ComparisonSummaryResponse, ComparisonListResponse
 )
+from src.schemas.comparison_job import ComparisonJobResponse
+from src.schemas.tag import TagCountResponse, TagListResponse
 
 __all__ = [
     # Prompt schemas
-    "PromptBase", "PromptCreate", "PromptUpdate", "PromptResponse", "PromptListResponse",
+    "PromptBase", "PromptCreate", "PromptUpdate", "PromptResponse", "PromptSummaryResponse", "PromptListResponse",
     # Prompt version schemas
     "PromptVersionBase", "PromptVersionCreate", "PromptVersionUpdate", "PromptVersionResponse",
     # LLM config schemas
     "LLMConfigBase", "LLMConfigCreate", "LLMConfigUpdate", "LLMConfigResponse", "LLMConfigListResponse",
     # Comparison schemas
-    "ComparisonBase", "ComparisonCreate", "ComparisonResponse", "ComparisonListResponse"
+    "ComparisonBase", "ComparisonCreate", "ComparisonResponse", "ComparisonSummaryResponse", "ComparisonListResponse",
+    # Comparison job schemas
+    "ComparisonJobResponse",
+    # Tag schemas
+    "TagCountResponse", "TagListResponse"
 ]
@@ -2,7 +2,7 @@
 Pydantic schemas for Comparison API.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -37,12 +37,27 @@ class ComparisonResponse(ComparisonBase):
         from_attributes = True
 
 
+class ComparisonSummaryResponse(ComparisonBase):
+    """Schema for comparison list items without results."""
+    id: str
+    successful_executions: int
+    total_executions: int
+    average_execution_time_ms: int
+    total_tokens_used: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ComparisonListResponse(BaseModel):
     """Schema for paginated comparison list response."""
-    items: List[ComparisonResponse]
-    total: int
+    items: List[Union[ComparisonResponse, ComparisonSummaryResponse]]
+    total: Optional[int] = None  # Only when requested with include_total
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
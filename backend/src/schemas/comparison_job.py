@@ -0,0 +1,24 @@
+"""
+Pydantic schemas for Comparison Job API.
+"""
+
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ComparisonJobResponse(BaseModel):
+    """Schema for comparison job status response."""
+    id: str
+    type: str
+    status: str
+    params: Dict[str, Any]
+    comparison_id: Optional[str] = None
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -14,6 +14,8 @@ class LLMConfigBase(BaseModel):
     base_url: Optional[str] = Field(None, description="Custom API base URL for proxies or custom providers")
     temperature: float = Field(0.7, ge=0.0, le=2.0, description="Temperature for generation")
     max_tokens: int = Field(1000, ge=1, le=8000, description="Maximum tokens to generate")
+    requests_per_minute: Optional[int] = Field(None, ge=1, description="Request rate limit (default when unset)")
+    tokens_per_minute: Optional[int] = Field(None, ge=1, description="Token rate limit (default when unset)")
     active: bool = Field(True, description="Whether this config is active")
 
 
@@ -30,12 +32,15 @@ class LLMConfigUpdate(BaseModel):
     base_url: Optional[str] = Field(None, description="Custom API base URL for proxies or custom providers")
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Temperature for generation")
     max_tokens: Optional[int] = Field(None, ge=1, le=8000, description="Maximum tokens to generate")
+    requests_per_minute: Optional[int] = Field(None, ge=1, description="Request rate limit")
+    tokens_per_minute: Optional[int] = Field(None, ge=1, description="Token rate limit")
     active: Optional[bool] = Field(None, description="Whether this config is active")
 
 
 class LLMConfigResponse(LLMConfigBase):
     """Schema for LLM config response."""
     id: str = Field(..., description="LLM config ID")
+    circuit_state: str = Field("closed", description="Circuit breaker state of the endpoint: closed, open or half_open")
     created_at: str = Field(..., description="Creation timestamp")
     updated_at: str = Field(..., description="Last update timestamp")
     
@@ -46,9 +51,10 @@ class LLMConfigResponse(LLMConfigBase):
 class LLMConfigListResponse(BaseModel):
     """Schema for LLM config list response."""
     items: list[LLMConfigResponse]
-    total: int
+    total: Optional[int] = None  # Only when requested with include_total
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
@@ -2,7 +2,7 @@
 Pydantic schemas for Prompt API.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -40,12 +40,29 @@ class PromptResponse(PromptBase):
         from_attributes = True
 
 
+class PromptSummaryResponse(BaseModel):
+    """Schema for prompt list items with a content preview instead of content."""
+    id: str
+    title: str
+    description: Optional[str] = None
+    content_preview: str
+    tags: List[str] = []
+    created_at: datetime
+    updated_at: datetime
+    latest_version: str = "0.0"
+    total_versions: int = 0
+
+    class Config:
+        from_attributes = True
+
+
 class PromptListResponse(BaseModel):
     """Schema for paginated prompt list response."""
-    items: List[PromptResponse]
-    total: int
+    items: List[Union[PromptResponse, PromptSummaryResponse]]
+    total: Optional[int] = None  # Only when requested with include_total
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
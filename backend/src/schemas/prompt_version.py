@@ -6,6 +6,8 @@ from typing import Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, field_validator
 
+from src.models.prompt_version import check_version_number
+
 
 class PromptVersionBase(BaseModel):
     """Base prompt version schema."""
@@ -17,6 +19,12 @@ class PromptVersionCreate(PromptVersionBase):
     """Schema for creating a prompt version."""
     version_number: Optional[str] = None  # If not provided, auto-generate (supports decimal like "2.5")
 
+    @field_validator('version_number')
+    @classmethod
+    def validate_version_number(cls, v: Optional[str]) -> Optional[str]:
+        """Reject version numbers that would sort the same as another."""
+        return check_version_number(v) if v is not None else v
+
 
 class PromptVersionUpdate(BaseModel):
     """Schema for updating a prompt version."""
@@ -0,0 +1,17 @@
+"""
+Pydantic schemas for Tag API.
+"""
+
+from typing import List
+from pydantic import BaseModel
+
+
+class TagCountResponse(BaseModel):
+    """Schema for a tag and the number of prompts using it."""
+    name: str
+    count: int
+
+
+class TagListResponse(BaseModel):
+    """Schema for tag facet counts response."""
+    items: List[TagCountResponse]
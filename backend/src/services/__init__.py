@@ -5,5 +5,6 @@ Business logic services for Prompt Center.
 from src.services.prompt_version import prompt_version_service
 from src.services.llm import llm_service
 from src.services.comparison import comparison_service
+from src.services.jobs import comparison_job_service
 
-__all__ = ["prompt_version_service", "llm_service", "comparison_service"]
+__all__ = ["prompt_version_service", "llm_service", "comparison_service", "comparison_job_service"]
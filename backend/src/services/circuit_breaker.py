@@ -0,0 +1,178 @@
+"""
+Circuit breakers tracking the health of LLM provider endpoints.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.logging import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_endpoint_failure(result: Dict[str, Any]) -> bool:
+    """Check whether a call result points at an unhealthy endpoint.
+
+    Server errors, request timeouts and connection errors count; other
+    client errors (invalid keys or requests, rate limiting) say nothing
+    about the endpoint's health.
+    """
+    if result.get("success"):
+        return False
+    status_code = result.get("status_code")
+    if status_code is not None:
+        return status_code >= 500 or status_code == 408
+    return bool(result.get("retryable"))
+
+
+class CircuitBreaker:
+    """Circuit breaker and health statistics of one provider endpoint.
+
+    While closed, calls go through and consecutive failures are counted:
+    ``is_endpoint_failure`` errors, and successful calls slower than
+    LLM_CIRCUIT_SLOW_CALL_SECONDS. LLM_CIRCUIT_FAILURE_THRESHOLD of them in
+    a row open the circuit, failing calls without a request for
+    LLM_CIRCUIT_OPEN_SECONDS. It is then half-open: one probe call goes
+    through, and the circuit closes if it succeeds or opens again if it
+    fails. Used from the event loop only.
+    """
+
+    def __init__(self, provider: str, base_url: str):
+        self.provider = provider
+        self.base_url = base_url
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False  # A half-open probe call is in flight
+        self.successes = 0
+        self.failures = 0
+        self.average_latency_ms: Optional[float] = None  # Exponential moving average
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.opened_at: Optional[datetime] = None
+
+    @property
+    def current_state(self) -> str:
+        """Get the state, counting an open circuit that is due for a probe as half-open."""
+        if self.state == OPEN and time.monotonic() >= self.open_until:
+            return HALF_OPEN
+        return self.state
+
+    def allow(self) -> bool:
+        """Check whether a call may be sent now, claiming the probe when half-open."""
+        if not settings.LLM_CIRCUIT_BREAKER_ENABLED:
+            return True
+        if self.current_state != self.state:
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Get the seconds until the open circuit lets a probe through."""
+        return max(0.0, self.open_until - time.monotonic())
+
+    def release(self) -> None:
+        """Give up an allowed call without a result, such as a cancelled one."""
+        self.probing = False
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """Update the endpoint's health with the result of an allowed call."""
+        self.probing = False
+        latency_ms = result.get("execution_time_ms", 0)
+        slow = (
+            result.get("success")
+            and settings.LLM_CIRCUIT_SLOW_CALL_SECONDS > 0
+            and latency_ms > settings.LLM_CIRCUIT_SLOW_CALL_SECONDS * 1000
+        )
+        if result.get("success"):
+            self.successes += 1
+            if self.average_latency_ms is None:
+                self.average_latency_ms = float(latency_ms)
+            else:
+                self.average_latency_ms += 0.2 * (latency_ms - self.average_latency_ms)
+
+        # A half-open probe only has to come back, however slowly, to close the circuit
+        if not is_endpoint_failure(result) and not (slow and self.state == CLOSED):
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                logger.info("LLM endpoint circuit closed", provider=self.provider, base_url=self.base_url)
+            return
+
+        self.consecutive_failures += 1
+        if not result.get("success"):
+            self.failures += 1
+            self.last_error = result.get("error")
+            self.last_failure_at = datetime.now(timezone.utc)
+
+        if settings.LLM_CIRCUIT_BREAKER_ENABLED and (
+            self.state == HALF_OPEN or self.consecutive_failures >= settings.LLM_CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self.state = OPEN
+            self.open_until = time.monotonic() + settings.LLM_CIRCUIT_OPEN_SECONDS
+            self.opened_at = datetime.now(timezone.utc)
+            logger.warning(
+                "LLM endpoint circuit opened",
+                provider=self.provider,
+                base_url=self.base_url,
+                consecutive_failures=self.consecutive_failures,
+                error=self.last_error
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the endpoint's state and health statistics."""
+        state = self.current_state
+        return {
+            "provider": self.provider,
+            "base_url": self.base_url or None,
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after_seconds": round(self.retry_after(), 3) if state == OPEN else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "average_latency_ms": round(self.average_latency_ms) if self.average_latency_ms is not None else None,
+            "last_error": self.last_error,
+            "last_failure_at": self.last_failure_at.isoformat() if self.last_failure_at else None,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers by provider and base URL, shared by every LLM config using the endpoint."""
+
+    def __init__(self):
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    @staticmethod
+    def _key(provider: str, base_url: Optional[str]) -> Tuple[str, str]:
+        return provider, (base_url or "").rstrip("/")
+
+    def get(self, provider: str, base_url: Optional[str]) -> CircuitBreaker:
+        """Get the breaker of an endpoint, creating it on first use."""
+        key = self._key(provider, base_url)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(*key)
+        return breaker
+
+    def state(self, provider: str, base_url: Optional[str]) -> str:
+        """Get an endpoint's circuit state; endpoints not called yet are closed."""
+        breaker = self._breakers.get(self._key(provider, base_url))
+        return breaker.current_state if breaker is not None else CLOSED
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Get the state and health of every endpoint called so far."""
+        return [breaker.snapshot() for breaker in self._breakers.values()]
+
+
+# Create a singleton instance
+circuit_breakers = CircuitBreakerRegistry()
@@ -2,30 +2,36 @@
 Comparison service for managing prompt comparisons.
 """
 
+import asyncio
 import json
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 from sqlalchemy.orm import Session
-import uuid
 
-from src.crud import comparison_crud, prompt_version_crud, llm_config_crud
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.crud import comparison_crud, comparison_job_crud, prompt_version_crud, llm_config_crud
 from src.models.comparison import Comparison
+from src.models.comparison_prompt_version import ComparisonPromptVersion
 from src.models.prompt_version import PromptVersion
 from src.models.llm_config import LLMConfig
 from src.services.llm import llm_service
+from src.services.progress import RunningStats, comparison_progress
 from src.schemas.comparison import ComparisonCreate
 
 
 class ComparisonService:
     """Service for managing prompt comparisons."""
     
-    async def create_same_llm_comparison(
+    def prepare_same_llm_comparison(
         self,
         db: Session,
         *,
         comparison_data: ComparisonCreate,
         prompt_version_ids: List[str]
-    ) -> Comparison:
-        """Create a comparison using the same LLM for multiple prompt versions."""
+    ) -> Tuple[Comparison, List[PromptVersion]]:
+        """Validate inputs and create the comparison record for a same-LLM comparison."""
         
         # Validate prompt versions exist
         prompt_versions = []
@@ -43,16 +49,65 @@ class ComparisonService:
         # Create comparison record
         comparison = comparison_crud.create(db=db, obj_in=comparison_data)
         
-        # Execute comparison
-        results = await llm_service.compare_prompt_versions(
+        return comparison, prompt_versions
+    
+    async def execute_same_llm_comparison(
+        self,
+        db: Session,
+        *,
+        comparison: Comparison,
+        prompt_versions: List[PromptVersion],
+        max_concurrency: Optional[int] = None
+    ) -> Comparison:
+        """Run the LLM calls for a prepared same-LLM comparison.
+
+        Each result is published to ``comparison_progress`` as it completes.
+        """
+        version_refs = [(version.id, version.version_number) for version in prompt_versions]
+        stats = RunningStats(len(prompt_versions))
+
+        def publish_result(index: int, result: Dict[str, Any]) -> None:
+            version_id, version_number = version_refs[index]
+            self._publish_result(
+                comparison.id, stats, index, result,
+                version_id=version_id,
+                version_number=version_number
+            )
+
+        with self._progress(comparison.id, stats):
+            await llm_service.compare_prompt_versions(
+                db=db,
+                comparison=comparison,
+                prompt_versions=prompt_versions,
+                max_concurrency=max_concurrency,
+                on_result=publish_result
+            )
+        
+        return comparison
+    
+    async def create_same_llm_comparison(
+        self,
+        db: Session,
+        *,
+        comparison_data: ComparisonCreate,
+        prompt_version_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> Comparison:
+        """Create a comparison using the same LLM for multiple prompt versions."""
+        comparison, prompt_versions = self.prepare_same_llm_comparison(
             db=db,
-            comparison=comparison,
-            prompt_versions=prompt_versions
+            comparison_data=comparison_data,
+            prompt_version_ids=prompt_version_ids
         )
         
-        return comparison
+        return await self.execute_same_llm_comparison(
+            db=db,
+            comparison=comparison,
+            prompt_versions=prompt_versions,
+            max_concurrency=max_concurrency
+        )
     
-    async def create_different_llm_comparison(
+    def prepare_different_llm_comparison(
         self,
         db: Session,
         *,
@@ -61,8 +116,8 @@ class ComparisonService:
         input_text: str,
         name: Optional[str] = None,
         description: Optional[str] = None
-    ) -> Comparison:
-        """Create a comparison using different LLMs for the same prompt version."""
+    ) -> Tuple[Comparison, List[LLMConfig]]:
+        """Validate inputs and create the comparison record for a different-LLM comparison."""
         
         # Validate prompt version exists
         prompt_version = prompt_version_crud.get(db=db, version_id=prompt_version_id)
@@ -89,23 +144,56 @@ class ComparisonService:
         
         comparison = comparison_crud.create(db=db, obj_in=comparison_data)
         
-        # Execute comparison with different LLMs
+        return comparison, llm_configs
+    
+    async def execute_different_llm_comparison(
+        self,
+        db: Session,
+        *,
+        comparison: Comparison,
+        prompt_version_id: str,
+        llm_configs: List[LLMConfig],
+        provider_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Comparison:
+        """Run the LLM calls for a prepared different-LLM comparison.
+
+        Providers are called in parallel; any call still running after
+        ``timeout`` seconds is recorded as a timed-out failure.
+        """
+        config_refs = [(config.id, config.provider, config.model) for config in llm_configs]
+        stats = RunningStats(len(llm_configs))
+
+        def publish_result(index: int, result: Dict[str, Any]) -> None:
+            config_id, provider, model = config_refs[index]
+            self._publish_result(
+                comparison.id, stats, index, result,
+                llm_config_id=config_id,
+                llm_provider=provider,
+                llm_model=model
+            )
+
+        # Execute comparison with different LLMs in parallel
+        with self._progress(comparison.id, stats):
+            call_results = await llm_service.call_llm_concurrently(
+                comparison.input_text,
+                llm_configs,
+                provider_concurrency=provider_concurrency,
+                timeout=timeout,
+                on_result=publish_result
+            )
+
         results = []
-        for llm_config in llm_configs:
-            result = await llm_service.call_llm(input_text, llm_config)
-            
-            # Store result
-            from src.models.comparison_prompt_version import ComparisonPromptVersion
-            comparison_prompt_version = ComparisonPromptVersion(
+        comparison_prompt_versions = []
+        for llm_config, result in zip(llm_configs, call_results, strict=True):
+            comparison_prompt_versions.append(ComparisonPromptVersion(
                 comparison_id=comparison.id,
                 prompt_version_id=prompt_version_id,
                 result=json.dumps(result) if result else None,
                 execution_time_ms=result["execution_time_ms"],
                 tokens_used=result["tokens_used"],
                 error_message=result.get("error")
-            )
-            
-            db.add(comparison_prompt_version)
+            ))
             
             results.append({
                 "llm_config_id": llm_config.id,
@@ -114,7 +202,7 @@ class ComparisonService:
                 "result": result
             })
         
-        db.commit()
+        db.add_all(comparison_prompt_versions)
         
         # Update comparison statistics
         successful_results = [r for r in results if r["result"]["success"]]
@@ -138,6 +226,120 @@ class ComparisonService:
         
         return comparison
     
+    async def create_different_llm_comparison(
+        self,
+        db: Session,
+        *,
+        prompt_version_id: str,
+        llm_config_ids: List[str],
+        input_text: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        provider_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Comparison:
+        """Create a comparison using different LLMs for the same prompt version."""
+        comparison, llm_configs = self.prepare_different_llm_comparison(
+            db=db,
+            prompt_version_id=prompt_version_id,
+            llm_config_ids=llm_config_ids,
+            input_text=input_text,
+            name=name,
+            description=description
+        )
+        
+        return await self.execute_different_llm_comparison(
+            db=db,
+            comparison=comparison,
+            prompt_version_id=prompt_version_id,
+            llm_configs=llm_configs,
+            provider_concurrency=provider_concurrency,
+            timeout=timeout
+        )
+    
+    @contextmanager
+    def _progress(self, comparison_id: str, stats: RunningStats) -> Iterator[None]:
+        """Open a progress stream for a run and close it with the final status."""
+        comparison_progress.open(comparison_id)
+        try:
+            yield
+        except asyncio.CancelledError:
+            comparison_progress.close(
+                comparison_id, "error", {"error": "Comparison run was interrupted", "stats": stats.to_dict()}
+            )
+            raise
+        except Exception as e:
+            comparison_progress.close(comparison_id, "error", {"error": str(e), "stats": stats.to_dict()})
+            raise
+        comparison_progress.close(comparison_id, "complete", {"comparison_id": comparison_id, "stats": stats.to_dict()})
+
+    def _publish_result(
+        self,
+        comparison_id: str,
+        stats: RunningStats,
+        index: int,
+        result: Dict[str, Any],
+        **details: Any
+    ) -> None:
+        """Publish a single execution result with updated running statistics."""
+        stats.add(result)
+        comparison_progress.publish(comparison_id, "result", {
+            "index": index,
+            **details,
+            "result": result,
+            "stats": stats.to_dict()
+        })
+    
+    async def stream_events(self, comparison_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield progress events for a comparison.
+
+        Running comparisons stream each result as it completes. Comparisons
+        with a queued job are polled until the job finishes, and finished
+        comparisons replay their stored results. ``None`` is yielded as a
+        heartbeat while waiting. Waiting for a queued job ends with an
+        ``error`` event after SSE_JOB_WAIT_TIMEOUT_SECONDS.
+        """
+        heartbeat = settings.SSE_HEARTBEAT_SECONDS
+        deadline = time.monotonic() + settings.SSE_JOB_WAIT_TIMEOUT_SECONDS
+        db = SessionLocal()
+        try:
+            while True:
+                if comparison_progress.is_active(comparison_id):
+                    async for message in comparison_progress.subscribe(comparison_id, heartbeat=heartbeat):
+                        yield message
+                    return
+                if not comparison_job_crud.has_unfinished_for_comparison(db, comparison_id=comparison_id):
+                    break
+                if time.monotonic() >= deadline:
+                    yield {"event": "error", "data": {
+                        "comparison_id": comparison_id,
+                        "error": "Timed out waiting for the comparison job"
+                    }}
+                    return
+                yield None
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+            results = llm_service.get_comparison_results(db, comparison_id)
+            stats = RunningStats(len(results))
+            for index, stored in enumerate(results):
+                result = stored["execution_result"] or {
+                    "success": False,
+                    "error": stored["error_message"],
+                    "execution_time_ms": stored["execution_time_ms"],
+                    "tokens_used": stored["tokens_used"]
+                }
+                stats.add(result)
+                yield {"event": "result", "data": {
+                    "index": index,
+                    "version_id": stored["version_id"],
+                    "version_number": stored["version_number"],
+                    "result": result,
+                    "stats": stats.to_dict()
+                }}
+            yield {"event": "complete", "data": {"comparison_id": comparison_id, "stats": stats.to_dict()}}
+        finally:
+            db.close()
+    
     def get_comparison_summary(
         self,
         db: Session,
@@ -0,0 +1,74 @@
+"""
+Pooled HTTP client management for outgoing LLM provider requests.
+"""
+
+import importlib.util
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.config import settings
+
+
+def _http2_available() -> bool:
+    """Check whether the optional ``h2`` package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientPool:
+    """Long-lived ``httpx.AsyncClient`` instances keyed by upstream origin.
+
+    Each origin (scheme, host and port) gets its own connection pool so
+    keep-alive connections are reused across LLM calls instead of paying
+    DNS, TCP and TLS setup on every request.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        self.timeout = timeout if timeout is not None else settings.LLM_HTTP_TIMEOUT
+        self.limits = httpx.Limits(
+            max_connections=max_connections if max_connections is not None else settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                max_keepalive_connections
+                if max_keepalive_connections is not None
+                else settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else settings.LLM_HTTP_KEEPALIVE_EXPIRY
+        )
+        # HTTP/2 is negotiated via ALPN, so upstreams without it fall back to HTTP/1.1
+        self.http2 = (settings.LLM_HTTP2 if http2 is None else http2) and _http2_available()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        """Get the pool key (scheme://host[:port]) for a URL."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Get the pooled client for the origin of the given URL."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+            self._clients[origin] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all pooled clients and their connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
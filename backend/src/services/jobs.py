@@ -0,0 +1,268 @@
+"""
+Background job execution for long-running comparisons.
+"""
+
+import asyncio
+from typing import List, Optional, Set
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.logging import logger
+from src.crud import comparison_crud, comparison_job_crud, llm_config_crud, prompt_version_crud
+from src.models.comparison_job import ComparisonJob
+from src.schemas.comparison import ComparisonCreate
+from src.services.comparison import comparison_service
+
+
+class ComparisonJobService:
+    """Service for submitting comparison jobs and running them in the background.
+
+    Jobs are persisted in the ``comparison_jobs`` table. When ``JOB_WORKERS``
+    is greater than zero they are executed by an in-process asyncio worker
+    pool; otherwise they stay pending until a separate ``python -m src.worker``
+    process claims them. Running jobs renew a lease every
+    JOB_HEARTBEAT_SECONDS; jobs whose worker died without releasing them are
+    claimed again once their lease is JOB_LEASE_SECONDS old.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+
+    def submit_same_llm_comparison(
+        self,
+        db: Session,
+        *,
+        comparison_data: ComparisonCreate,
+        prompt_version_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> ComparisonJob:
+        """Validate and queue a same-LLM comparison."""
+        comparison, _ = comparison_service.prepare_same_llm_comparison(
+            db=db,
+            comparison_data=comparison_data,
+            prompt_version_ids=prompt_version_ids
+        )
+        job = comparison_job_crud.create(
+            db=db,
+            type="same_llm",
+            params={
+                "prompt_version_ids": prompt_version_ids,
+                "max_concurrency": max_concurrency
+            },
+            comparison_id=comparison.id
+        )
+        self._enqueue(job.id)
+        return job
+
+    def submit_different_llm_comparison(
+        self,
+        db: Session,
+        *,
+        prompt_version_id: str,
+        llm_config_ids: List[str],
+        input_text: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        provider_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> ComparisonJob:
+        """Validate and queue a different-LLM comparison."""
+        comparison, _ = comparison_service.prepare_different_llm_comparison(
+            db=db,
+            prompt_version_id=prompt_version_id,
+            llm_config_ids=llm_config_ids,
+            input_text=input_text,
+            name=name,
+            description=description
+        )
+        job = comparison_job_crud.create(
+            db=db,
+            type="different_llm",
+            params={
+                "prompt_version_id": prompt_version_id,
+                "llm_config_ids": llm_config_ids,
+                "provider_concurrency": provider_concurrency,
+                "timeout": timeout
+            },
+            comparison_id=comparison.id
+        )
+        self._enqueue(job.id)
+        return job
+
+    def _enqueue(self, job_id: str) -> None:
+        """Hand a job to the in-process workers, if they are running and don't have it yet."""
+        if self._queue is not None and job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def start(self, workers: Optional[int] = None) -> None:
+        """Start the in-process worker pool and queue pending and abandoned jobs."""
+        worker_count = settings.JOB_WORKERS if workers is None else workers
+        if worker_count <= 0 or self._workers:
+            return
+
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(worker_count)
+        ]
+        self._workers.append(asyncio.create_task(self._recovery_loop()))
+
+    async def stop(self) -> None:
+        """Stop the in-process worker pool, returning interrupted jobs to the queue."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._queued.clear()
+
+    def _recover(self) -> None:
+        """Queue the jobs left pending or abandoned by this or another process."""
+        db = SessionLocal()
+        try:
+            for job_id in comparison_job_crud.get_claimable_ids(db):
+                self._enqueue(job_id)
+        except SQLAlchemyError as e:
+            logger.warning("Could not recover comparison jobs", error=str(e))
+        finally:
+            db.close()
+
+    async def _recovery_loop(self) -> None:
+        """Recover jobs at startup and then once per lease period."""
+        while True:
+            self._recover()
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS)
+
+    async def _worker_loop(self) -> None:
+        """Execute queued jobs one at a time."""
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                logger.error("Comparison job crashed", job_id=job_id, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def run_worker(
+        self,
+        *,
+        concurrency: int = 1,
+        poll_interval: Optional[float] = None
+    ) -> None:
+        """Poll the database for pending jobs until cancelled.
+
+        Used by the standalone worker process.
+        """
+        interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL_SECONDS
+
+        async def poll() -> None:
+            while True:
+                db = SessionLocal()
+                try:
+                    job_id = comparison_job_crud.claim_next(db)
+                finally:
+                    db.close()
+
+                if job_id is None:
+                    await asyncio.sleep(interval)
+                    continue
+                await self.run_job(job_id, claimed=True)
+
+        await asyncio.gather(*(poll() for _ in range(max(1, concurrency))))
+
+    async def run_job(self, job_id: str, *, claimed: bool = False) -> bool:
+        """Claim and execute a job in its own database session.
+
+        Returns False if the job was already claimed by another worker. A
+        job interrupted by cancellation goes back to pending.
+        """
+        db = SessionLocal()
+        try:
+            if not claimed and not comparison_job_crud.claim(db, job_id=job_id):
+                return False
+
+            job = comparison_job_crud.get(db, job_id)
+            logger.info("Running comparison job", job_id=job_id, type=job.type)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                await self._execute(db, job)
+            except asyncio.CancelledError:
+                db.rollback()
+                comparison_job_crud.release(db, job_id=job_id)
+                logger.warning("Comparison job interrupted and requeued", job_id=job_id)
+                raise
+            except Exception as e:
+                db.rollback()
+                comparison_job_crud.mark_failed(db, job_id=job_id, error=str(e))
+                logger.error("Comparison job failed", job_id=job_id, error=str(e))
+            else:
+                comparison_job_crud.mark_completed(db, job_id=job_id)
+            finally:
+                heartbeat.cancel()
+            return True
+        finally:
+            db.close()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew a running job's lease until cancelled."""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            db = SessionLocal()
+            try:
+                comparison_job_crud.heartbeat(db, job_id=job_id)
+            except SQLAlchemyError as e:
+                logger.warning("Could not renew comparison job lease", job_id=job_id, error=str(e))
+            finally:
+                db.close()
+
+    async def _execute(self, db: Session, job: ComparisonJob) -> None:
+        """Run the comparison described by a job."""
+        params = job.params or {}
+        comparison = comparison_crud.get(db, job.comparison_id) if job.comparison_id else None
+        if not comparison:
+            raise ValueError("Comparison not found")
+
+        if job.type == "same_llm":
+            prompt_versions = []
+            for version_id in params["prompt_version_ids"]:
+                version = prompt_version_crud.get(db=db, version_id=version_id)
+                if not version:
+                    raise ValueError(f"Prompt version {version_id} not found")
+                prompt_versions.append(version)
+
+            await comparison_service.execute_same_llm_comparison(
+                db=db,
+                comparison=comparison,
+                prompt_versions=prompt_versions,
+                max_concurrency=params.get("max_concurrency")
+            )
+        elif job.type == "different_llm":
+            llm_configs = []
+            for config_id in params["llm_config_ids"]:
+                config = llm_config_crud.get(db=db, config_id=config_id)
+                if not config:
+                    raise ValueError(f"LLM config {config_id} not found")
+                llm_configs.append(config)
+
+            await comparison_service.execute_different_llm_comparison(
+                db=db,
+                comparison=comparison,
+                prompt_version_id=params["prompt_version_id"],
+                llm_configs=llm_configs,
+                provider_concurrency=params.get("provider_concurrency"),
+                timeout=params.get("timeout")
+            )
+        else:
+            raise ValueError(f"Unsupported job type: {job.type}")
+
+
+# Create a singleton instance
+comparison_job_service = ComparisonJobService()
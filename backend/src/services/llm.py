@@ -5,24 +5,157 @@ LLM service for calling different language models.
 import time
 import json
 import asyncio
-from typing import Dict, Any, Optional, List
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Callable, AsyncIterator, Awaitable, Tuple
 from abc import ABC, abstractmethod
 import httpx
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 
+from src.core.config import settings
+from src.core.logging import logger
 from src.models.llm_config import LLMConfig
 from src.models.comparison import Comparison
 from src.models.comparison_prompt_version import ComparisonPromptVersion
 from src.models.prompt_version import PromptVersion
+from src.services.circuit_breaker import CircuitBreaker, circuit_breakers
+from src.services.http_client import HTTPClientPool
+from src.services.llm_cache import llm_cache_key, llm_response_cache, semantic_response_cache
+from src.services.rate_limit import RateLimiter, rate_limiters
+from src.services.retry import backoff_delay, is_retryable, latency_tracker
+
+
+# Parses one streamed chunk into text, updating "model", "usage" and "tokens_used" in the state dict
+ChunkParser = Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]]
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
+
+    def __init__(self, http_pool: Optional[HTTPClientPool] = None):
+        self.http_pool = http_pool or HTTPClientPool()
+
+    async def _post(
+        self,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        json: Dict[str, Any],
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> httpx.Response:
+        """Send a POST request through the pooled client for the URL's origin.
+
+        The response's status and headers are reported to ``rate_limiter``.
+        """
+        client = self.http_pool.get_client(url)
+        response = await client.post(url, headers=headers, json=json)
+        if rate_limiter is not None:
+            rate_limiter.observe(response.status_code, response.headers)
+        return response
+
+    @asynccontextmanager
+    async def _stream_post(
+        self,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        json: Dict[str, Any],
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """Send a streaming POST request, raising for error status codes."""
+        client = self.http_pool.get_client(url)
+        async with client.stream("POST", url, headers=headers, json=json) as response:
+            if rate_limiter is not None:
+                rate_limiter.observe(response.status_code, response.headers)
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            yield response
+
+    @staticmethod
+    async def _iter_sse_json(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the JSON payload of each ``data:`` line in an event stream."""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if not data or data == "[DONE]":
+                continue
+            yield json.loads(data)
+
+    async def _stream_request(
+        self,
+        api_url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        parse_chunk: ChunkParser,
+        model: str,
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a completion, yielding token events and a final result event."""
+        start_time = time.time()
+        first_token_time = None
+        parts: List[str] = []
+        state: Dict[str, Any] = {"model": model, "usage": {}, "tokens_used": 0}
+
+        try:
+            async with self._stream_post(
+                api_url, headers=headers, json=payload, rate_limiter=rate_limiter
+            ) as response:
+                async for chunk in self._iter_sse_json(response):
+                    text = parse_chunk(chunk, state)
+                    if not text:
+                        continue
+                    if first_token_time is None:
+                        first_token_time = time.time()
+                    parts.append(text)
+                    yield {"type": "token", "content": text}
+
+            end_time = time.time()
+            yield {"type": "done", "result": {
+                "success": True,
+                "content": "".join(parts),
+                "usage": state["usage"],
+                "model": state["model"],
+                "execution_time_ms": int((end_time - start_time) * 1000),
+                "time_to_first_token_ms": int((first_token_time - start_time) * 1000) if first_token_time else None,
+                "tokens_used": state["tokens_used"]
+            }}
+
+        except httpx.HTTPStatusError as e:
+            end_time = time.time()
+            yield {"type": "done", "result": {
+                "success": False,
+                "error": f"HTTP {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
+                "execution_time_ms": int((end_time - start_time) * 1000),
+                "tokens_used": 0
+            }}
+        except Exception as e:
+            end_time = time.time()
+            yield {"type": "done", "result": {
+                "success": False,
+                "error": str(e),
+                "retryable": isinstance(e, httpx.TransportError),
+                "execution_time_ms": int((end_time - start_time) * 1000),
+                "tokens_used": 0
+            }}
     
     @abstractmethod
     async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Call the LLM with the given prompt and configuration."""
         pass
+
+    async def stream(self, prompt: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the LLM response as ``token`` events followed by a ``done`` event.
+
+        Providers without native streaming emit the whole response as one token.
+        """
+        result = await self.call(prompt, config)
+        if result.get("success"):
+            result["time_to_first_token_ms"] = result["execution_time_ms"]
+            yield {"type": "token", "content": result["content"]}
+        yield {"type": "done", "result": result}
     
     @abstractmethod
     def get_provider_name(self) -> str:
@@ -30,58 +163,86 @@ class LLMProvider(ABC):
         pass
 
 
-class OpenAIProvider(LLMProvider):
-    """OpenAI API provider."""
+class OpenAICompatibleProvider(LLMProvider):
+    """Base class for providers exposing the OpenAI chat completions API."""
 
-    def get_provider_name(self) -> str:
-        return "openai"
+    provider_name = "openai"
+    default_model = "gpt-3.5-turbo"
+    default_base_url: Optional[str] = "https://api.openai.com"
+    # Whether the API accepts stream_options to report usage on the last chunk
+    supports_stream_usage = True
 
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call OpenAI API."""
-        start_time = time.time()
+    def get_provider_name(self) -> str:
+        return self.provider_name
 
+    def _build_request(self, prompt: str, config: Dict[str, Any]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and payload for a chat completion."""
         headers = {
             "Authorization": f"Bearer {config['api_key']}",
             "Content-Type": "application/json"
         }
 
         payload = {
-            "model": config.get("model", "gpt-3.5-turbo"),
+            "model": config.get("model") or self.default_model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": config.get("temperature", 0.7),
             "max_tokens": config.get("max_tokens", 1000)
         }
 
-        # Use custom base_url if provided, otherwise use default
-        base_url = config.get("base_url", "https://api.openai.com")
+        # Use custom base_url if provided, otherwise use the provider default
+        base_url = config.get("base_url") or self.default_base_url
         api_url = f"{base_url.rstrip('/')}/v1/chat/completions"
 
+        return api_url, headers, payload
+
+    def _missing_base_url(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get an error result if no base_url is available for this provider."""
+        if config.get("base_url") or self.default_base_url:
+            return None
+        return {
+            "success": False,
+            "error": f"{self.provider_name.capitalize()} provider requires base_url to be configured",
+            "execution_time_ms": 0,
+            "tokens_used": 0
+        }
+
+    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the chat completions API."""
+        start_time = time.time()
+
+        error = self._missing_base_url(config)
+        if error:
+            return error
+
+        api_url, headers, payload = self._build_request(prompt, config)
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            response = await self._post(
+                api_url,
+                headers=headers,
+                json=payload,
+                rate_limiter=config.get("rate_limiter")
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                end_time = time.time()
+            result = response.json()
+            end_time = time.time()
 
-                return {
-                    "success": True,
-                    "content": result["choices"][0]["message"]["content"],
-                    "usage": result.get("usage", {}),
-                    "model": result["model"],
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("total_tokens", 0)
-                }
+            return {
+                "success": True,
+                "content": result["choices"][0]["message"]["content"],
+                "usage": result.get("usage", {}),
+                "model": result.get("model", payload["model"]),
+                "execution_time_ms": int((end_time - start_time) * 1000),
+                "tokens_used": result.get("usage", {}).get("total_tokens", 0)
+            }
 
         except httpx.HTTPStatusError as e:
             end_time = time.time()
             return {
                 "success": False,
                 "error": f"HTTP {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
@@ -90,10 +251,53 @@ class OpenAIProvider(LLMProvider):
             return {
                 "success": False,
                 "error": str(e),
+                "retryable": isinstance(e, httpx.TransportError),
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
 
+    async def stream(self, prompt: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the chat completions API (``stream=True``)."""
+        error = self._missing_base_url(config)
+        if error:
+            yield {"type": "done", "result": error}
+            return
+
+        api_url, headers, payload = self._build_request(prompt, config)
+        payload["stream"] = True
+        if self.supports_stream_usage:
+            payload["stream_options"] = {"include_usage": True}
+
+        async for event in self._stream_request(
+            api_url, headers, payload, self._parse_chunk, payload["model"], config.get("rate_limiter")
+        ):
+            yield event
+
+    @staticmethod
+    def _parse_chunk(chunk: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+        """Parse a chat.completion.chunk event."""
+        if chunk.get("model"):
+            state["model"] = chunk["model"]
+
+        choices = chunk.get("choices") or []
+        # Usage arrives on the final chunk (some providers nest it in the choice)
+        usage = chunk.get("usage") or (choices[0].get("usage") if choices else None)
+        if usage:
+            state["usage"] = usage
+            state["tokens_used"] = usage.get("total_tokens", 0)
+
+        if not choices:
+            return None
+        return (choices[0].get("delta") or {}).get("content")
+
+
+class OpenAIProvider(OpenAICompatibleProvider):
+    """OpenAI API provider."""
+
+    provider_name = "openai"
+    default_model = "gpt-3.5-turbo"
+    default_base_url = "https://api.openai.com"
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude API provider."""
@@ -101,10 +305,8 @@ class AnthropicProvider(LLMProvider):
     def get_provider_name(self) -> str:
         return "anthropic"
 
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Anthropic API."""
-        start_time = time.time()
-
+    def _build_request(self, prompt: str, config: Dict[str, Any]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and payload for the Messages API."""
         headers = {
             "x-api-key": config['api_key'],
             "Content-Type": "application/json",
@@ -112,42 +314,51 @@ class AnthropicProvider(LLMProvider):
         }
 
         payload = {
-            "model": config.get("model", "claude-3-sonnet-20240229"),
+            "model": config.get("model") or "claude-3-sonnet-20240229",
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": config.get("max_tokens", 1000),
             "temperature": config.get("temperature", 0.7)
         }
 
         # Use custom base_url if provided, otherwise use default
-        base_url = config.get("base_url", "https://api.anthropic.com")
+        base_url = config.get("base_url") or "https://api.anthropic.com"
         api_url = f"{base_url.rstrip('/')}/v1/messages"
 
+        return api_url, headers, payload
+
+    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Call Anthropic API."""
+        start_time = time.time()
+
+        api_url, headers, payload = self._build_request(prompt, config)
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            response = await self._post(
+                api_url,
+                headers=headers,
+                json=payload,
+                rate_limiter=config.get("rate_limiter")
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                end_time = time.time()
+            result = response.json()
+            end_time = time.time()
 
-                return {
-                    "success": True,
-                    "content": result["content"][0]["text"],
-                    "usage": result.get("usage", {}),
-                    "model": result["model"],
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("input_tokens", 0) + result.get("usage", {}).get("output_tokens", 0)
-                }
+            return {
+                "success": True,
+                "content": result["content"][0]["text"],
+                "usage": result.get("usage", {}),
+                "model": result["model"],
+                "execution_time_ms": int((end_time - start_time) * 1000),
+                "tokens_used": result.get("usage", {}).get("input_tokens", 0) + result.get("usage", {}).get("output_tokens", 0)
+            }
 
         except httpx.HTTPStatusError as e:
             end_time = time.time()
             return {
                 "success": False,
                 "error": f"HTTP {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
@@ -156,10 +367,42 @@ class AnthropicProvider(LLMProvider):
             return {
                 "success": False,
                 "error": str(e),
+                "retryable": isinstance(e, httpx.TransportError),
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
 
+    async def stream(self, prompt: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream Anthropic API message events."""
+        api_url, headers, payload = self._build_request(prompt, config)
+        payload["stream"] = True
+
+        async for event in self._stream_request(
+            api_url, headers, payload, self._parse_chunk, payload["model"], config.get("rate_limiter")
+        ):
+            yield event
+
+    @staticmethod
+    def _parse_chunk(chunk: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+        """Parse a Messages API stream event."""
+        event_type = chunk.get("type")
+
+        if event_type == "message_start":
+            message = chunk.get("message", {})
+            state["model"] = message.get("model", state["model"])
+            state["usage"] = dict(message.get("usage", {}))
+        elif event_type == "message_delta":
+            state["usage"].update(chunk.get("usage", {}))
+        elif event_type == "content_block_delta":
+            delta = chunk.get("delta", {})
+            if delta.get("type") == "text_delta":
+                return delta.get("text")
+        elif event_type == "error":
+            raise RuntimeError(chunk.get("error", {}).get("message", "Stream error"))
+
+        state["tokens_used"] = state["usage"].get("input_tokens", 0) + state["usage"].get("output_tokens", 0)
+        return None
+
 
 class GoogleAIProvider(LLMProvider):
     """Google AI (Gemini) API provider."""
@@ -167,10 +410,14 @@ class GoogleAIProvider(LLMProvider):
     def get_provider_name(self) -> str:
         return "google"
 
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Google AI API."""
-        start_time = time.time()
-
+    def _build_request(
+        self,
+        prompt: str,
+        config: Dict[str, Any],
+        *,
+        method: str = "generateContent"
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and payload for a Gemini content request."""
         headers = {
             "Content-Type": "application/json"
         }
@@ -184,170 +431,52 @@ class GoogleAIProvider(LLMProvider):
         }
 
         # Use custom base_url if provided
-        base_url = config.get("base_url", "https://generativelanguage.googleapis.com")
-        model = config.get("model", "gemini-pro")
+        base_url = config.get("base_url") or "https://generativelanguage.googleapis.com"
+        model = config.get("model") or "gemini-pro"
         api_key = config['api_key']
-        api_url = f"{base_url.rstrip('/')}/v1beta/models/{model}:generateContent?key={api_key}"
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                end_time = time.time()
-
-                content = result["candidates"][0]["content"]["parts"][0]["text"]
-                tokens = result.get("usageMetadata", {}).get("totalTokenCount", 0)
-
-                return {
-                    "success": True,
-                    "content": content,
-                    "usage": result.get("usageMetadata", {}),
-                    "model": model,
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": tokens
-                }
-
-        except httpx.HTTPStatusError as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
-        except Exception as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": str(e),
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
+        api_url = f"{base_url.rstrip('/')}/v1beta/models/{model}:{method}?key={api_key}"
+        if method == "streamGenerateContent":
+            api_url += "&alt=sse"
 
-
-class DeepSeekProvider(LLMProvider):
-    """DeepSeek API provider (OpenAI-compatible)."""
-
-    def get_provider_name(self) -> str:
-        return "deepseek"
+        return api_url, headers, payload
 
     async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call DeepSeek API (OpenAI-compatible format)."""
+        """Call Google AI API."""
         start_time = time.time()
 
-        headers = {
-            "Authorization": f"Bearer {config['api_key']}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": config.get("model", "deepseek-chat"),
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.get("temperature", 0.7),
-            "max_tokens": config.get("max_tokens", 1000)
-        }
-
-        # Use custom base_url if provided, otherwise use DeepSeek default
-        base_url = config.get("base_url", "https://api.deepseek.com")
-        api_url = f"{base_url.rstrip('/')}/v1/chat/completions"
+        api_url, headers, payload = self._build_request(prompt, config)
+        model = config.get("model") or "gemini-pro"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            response = await self._post(
+                api_url,
+                headers=headers,
+                json=payload,
+                rate_limiter=config.get("rate_limiter")
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                end_time = time.time()
+            result = response.json()
+            end_time = time.time()
 
-                return {
-                    "success": True,
-                    "content": result["choices"][0]["message"]["content"],
-                    "usage": result.get("usage", {}),
-                    "model": result["model"],
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("total_tokens", 0)
-                }
+            content = result["candidates"][0]["content"]["parts"][0]["text"]
+            tokens = result.get("usageMetadata", {}).get("totalTokenCount", 0)
 
-        except httpx.HTTPStatusError as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
-        except Exception as e:
-            end_time = time.time()
             return {
-                "success": False,
-                "error": str(e),
+                "success": True,
+                "content": content,
+                "usage": result.get("usageMetadata", {}),
+                "model": model,
                 "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
+                "tokens_used": tokens
             }
 
-
-class QwenProvider(LLMProvider):
-    """Qwen (通义千问) API provider (OpenAI-compatible)."""
-
-    def get_provider_name(self) -> str:
-        return "qwen"
-
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Qwen API (OpenAI-compatible format)."""
-        start_time = time.time()
-
-        headers = {
-            "Authorization": f"Bearer {config['api_key']}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": config.get("model", "qwen-turbo"),
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.get("temperature", 0.7),
-            "max_tokens": config.get("max_tokens", 1000)
-        }
-
-        # Use custom base_url if provided, otherwise use Alibaba Cloud default
-        base_url = config.get("base_url", "https://dashscope.aliyuncs.com/compatible-mode")
-        api_url = f"{base_url.rstrip('/')}/v1/chat/completions"
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                end_time = time.time()
-
-                return {
-                    "success": True,
-                    "content": result["choices"][0]["message"]["content"],
-                    "usage": result.get("usage", {}),
-                    "model": result["model"],
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("total_tokens", 0)
-                }
-
         except httpx.HTTPStatusError as e:
             end_time = time.time()
             return {
                 "success": False,
                 "error": f"HTTP {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
@@ -356,147 +485,72 @@ class QwenProvider(LLMProvider):
             return {
                 "success": False,
                 "error": str(e),
+                "retryable": isinstance(e, httpx.TransportError),
                 "execution_time_ms": int((end_time - start_time) * 1000),
                 "tokens_used": 0
             }
 
+    async def stream(self, prompt: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream Google AI API responses (``streamGenerateContent``)."""
+        api_url, headers, payload = self._build_request(prompt, config, method="streamGenerateContent")
+        model = config.get("model") or "gemini-pro"
 
-class KimiProvider(LLMProvider):
-    """Kimi (月之暗面/Moonshot) API provider (OpenAI-compatible)."""
-
-    def get_provider_name(self) -> str:
-        return "kimi"
-
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Kimi API (OpenAI-compatible format)."""
-        start_time = time.time()
-
-        headers = {
-            "Authorization": f"Bearer {config['api_key']}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": config.get("model", "moonshot-v1-8k"),
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.get("temperature", 0.7),
-            "max_tokens": config.get("max_tokens", 1000)
-        }
-
-        # Use custom base_url if provided, otherwise use Moonshot default
-        base_url = config.get("base_url", "https://api.moonshot.cn")
-        api_url = f"{base_url.rstrip('/')}/v1/chat/completions"
+        async for event in self._stream_request(
+            api_url, headers, payload, self._parse_chunk, model, config.get("rate_limiter")
+        ):
+            yield event
 
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
+    @staticmethod
+    def _parse_chunk(chunk: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+        """Parse a streamed GenerateContentResponse."""
+        usage = chunk.get("usageMetadata")
+        if usage:
+            state["usage"] = usage
+            state["tokens_used"] = usage.get("totalTokenCount", 0)
 
-                result = response.json()
-                end_time = time.time()
+        candidates = chunk.get("candidates") or []
+        if not candidates:
+            return None
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
 
-                return {
-                    "success": True,
-                    "content": result["choices"][0]["message"]["content"],
-                    "usage": result.get("usage", {}),
-                    "model": result["model"],
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("total_tokens", 0)
-                }
 
-        except httpx.HTTPStatusError as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
-        except Exception as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": str(e),
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
+class DeepSeekProvider(OpenAICompatibleProvider):
+    """DeepSeek API provider (OpenAI-compatible)."""
 
+    provider_name = "deepseek"
+    default_model = "deepseek-chat"
+    default_base_url = "https://api.deepseek.com"
 
-class CustomProvider(LLMProvider):
-    """Custom OpenAI-compatible API provider."""
 
-    def get_provider_name(self) -> str:
-        return "custom"
+class QwenProvider(OpenAICompatibleProvider):
+    """Qwen (通义千问) API provider (OpenAI-compatible)."""
 
-    async def call(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Call custom OpenAI-compatible API."""
-        start_time = time.time()
+    provider_name = "qwen"
+    default_model = "qwen-turbo"
+    # Alibaba Cloud DashScope compatible mode
+    default_base_url = "https://dashscope.aliyuncs.com/compatible-mode"
 
-        headers = {
-            "Authorization": f"Bearer {config['api_key']}",
-            "Content-Type": "application/json"
-        }
 
-        payload = {
-            "model": config.get("model", "gpt-3.5-turbo"),
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.get("temperature", 0.7),
-            "max_tokens": config.get("max_tokens", 1000)
-        }
-
-        # Custom provider MUST have base_url
-        base_url = config.get("base_url")
-        if not base_url:
-            return {
-                "success": False,
-                "error": "Custom provider requires base_url to be configured",
-                "execution_time_ms": 0,
-                "tokens_used": 0
-            }
-
-        api_url = f"{base_url.rstrip('/')}/v1/chat/completions"
+class KimiProvider(OpenAICompatibleProvider):
+    """Kimi (月之暗面/Moonshot) API provider (OpenAI-compatible)."""
 
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
+    provider_name = "kimi"
+    default_model = "moonshot-v1-8k"
+    default_base_url = "https://api.moonshot.cn"
+    # Moonshot reports usage inside the final choice instead
+    supports_stream_usage = False
 
-                result = response.json()
-                end_time = time.time()
 
-                return {
-                    "success": True,
-                    "content": result["choices"][0]["message"]["content"],
-                    "usage": result.get("usage", {}),
-                    "model": result.get("model", config.get("model")),
-                    "execution_time_ms": int((end_time - start_time) * 1000),
-                    "tokens_used": result.get("usage", {}).get("total_tokens", 0)
-                }
+class CustomProvider(OpenAICompatibleProvider):
+    """Custom OpenAI-compatible API provider."""
 
-        except httpx.HTTPStatusError as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
-        except Exception as e:
-            end_time = time.time()
-            return {
-                "success": False,
-                "error": str(e),
-                "execution_time_ms": int((end_time - start_time) * 1000),
-                "tokens_used": 0
-            }
+    provider_name = "custom"
+    default_model = "gpt-3.5-turbo"
+    # Custom provider MUST have base_url
+    default_base_url = None
+    # Unknown servers may reject stream_options
+    supports_stream_usage = False
 
 
 class MockLLMProvider(LLMProvider):
@@ -526,21 +580,64 @@ class MockLLMProvider(LLMProvider):
             "tokens_used": len(mock_content.split())
         }
 
+    async def stream(self, prompt: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Mock streaming call emitting one word at a time."""
+        start_time = time.time()
+
+        # Simulate time to first token
+        await asyncio.sleep(0.05)
+        first_token_time = time.time()
+
+        mock_content = f"Mock response to: {prompt[:50]}..."
+        words = mock_content.split(" ")
+        for index, word in enumerate(words):
+            if index:
+                await asyncio.sleep(0.01)
+            yield {"type": "token", "content": word if index == 0 else f" {word}"}
+
+        end_time = time.time()
+        yield {"type": "done", "result": {
+            "success": True,
+            "content": mock_content,
+            "usage": {"total_tokens": len(words)},
+            "model": config.get("model", "mock-model"),
+            "execution_time_ms": int((end_time - start_time) * 1000),
+            "time_to_first_token_ms": int((first_token_time - start_time) * 1000),
+            "tokens_used": len(words)
+        }}
+
 
 class LLMService:
     """Service for managing LLM operations."""
 
     def __init__(self):
+        # Shared by all providers so connections are reused across calls
+        self.http_pool = HTTPClientPool()
         self.providers = {
-            "openai": OpenAIProvider(),
-            "anthropic": AnthropicProvider(),
-            "google": GoogleAIProvider(),
-            "deepseek": DeepSeekProvider(),
-            "qwen": QwenProvider(),
-            "kimi": KimiProvider(),
-            "custom": CustomProvider(),
-            "mock": MockLLMProvider()
+            "openai": OpenAIProvider(self.http_pool),
+            "anthropic": AnthropicProvider(self.http_pool),
+            "google": GoogleAIProvider(self.http_pool),
+            "deepseek": DeepSeekProvider(self.http_pool),
+            "qwen": QwenProvider(self.http_pool),
+            "kimi": KimiProvider(self.http_pool),
+            "custom": CustomProvider(self.http_pool),
+            "mock": MockLLMProvider(self.http_pool)
         }
+        # Provider calls in progress by coalescing key, shared by identical calls
+        self._in_flight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    async def startup(self) -> None:
+        """Log connection pool settings; clients are created lazily per origin."""
+        logger.info(
+            "LLM HTTP pool ready",
+            max_connections=self.http_pool.limits.max_connections,
+            max_keepalive_connections=self.http_pool.limits.max_keepalive_connections,
+            http2=self.http_pool.http2
+        )
+
+    async def shutdown(self) -> None:
+        """Close pooled connections to all LLM providers."""
+        await self.http_pool.aclose()
     
     def get_provider(self, provider_name: str) -> LLMProvider:
         """Get LLM provider by name."""
@@ -548,53 +645,490 @@ class LLMService:
             raise ValueError(f"Unsupported provider: {provider_name}")
         return self.providers[provider_name]
     
-    async def call_llm(self, prompt: str, config: LLMConfig) -> Dict[str, Any]:
-        """Call LLM with the given prompt and configuration."""
-        provider = self.get_provider(config.provider)
-
-        provider_config = {
+    @staticmethod
+    def _rate_limiter(config: LLMConfig) -> RateLimiter:
+        """Get the rate limiter of an LLM config (by credentials for unsaved configs)."""
+        key = config.id or hashlib.sha256(
+            f"{config.provider}:{config.base_url}:{config.api_key}".encode("utf-8")
+        ).hexdigest()
+        return rate_limiters.get(key, config.requests_per_minute, config.tokens_per_minute)
+
+    def _provider_config(self, config: LLMConfig) -> Dict[str, Any]:
+        """Build the provider call configuration from an LLM config."""
+        return {
             "api_key": config.api_key,
             "model": config.model,
             "base_url": config.base_url,
             "temperature": config.temperature,
-            "max_tokens": config.max_tokens
+            "max_tokens": config.max_tokens,
+            "rate_limiter": self._rate_limiter(config),
+            "circuit_breaker": circuit_breakers.get(config.provider, config.base_url)
         }
 
-        return await provider.call(prompt, provider_config)
+    @staticmethod
+    def _circuit_open_result(breaker: CircuitBreaker) -> Dict[str, Any]:
+        """Build the result of a call failed fast by an open circuit."""
+        return {
+            "success": False,
+            "error": (
+                f"{breaker.provider} endpoint unavailable after repeated failures; "
+                f"retrying in {breaker.retry_after():.1f}s"
+            ),
+            "circuit_open": True,
+            "execution_time_ms": 0,
+            "tokens_used": 0
+        }
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, provider_config: Dict[str, Any]) -> int:
+        """Estimate a call's tokens before it is made: ~4 characters per prompt token plus the completion limit."""
+        return len(prompt) // 4 + (provider_config.get("max_tokens") or 1000)
+
+    @staticmethod
+    def _cache_hit(cached: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """Build the result of a call served from a response cache."""
+        result = dict(cached)
+        result.update({
+            "cache_hit": True,
+            "execution_time_ms": int((time.time() - start_time) * 1000),
+            "tokens_used": 0
+        })
+        return result
+
+    @staticmethod
+    def _cache_enabled(use_cache: bool) -> bool:
+        """Check whether a call should go through the response caches."""
+        return use_cache and (llm_response_cache.enabled or semantic_response_cache.enabled)
+
+    async def _cache_lookup(
+        self,
+        prompt: str,
+        provider_name: str,
+        provider_config: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Find a cached result for a call: exact match first, then a near-duplicate prompt."""
+        start_time = time.time()
+        if llm_response_cache.enabled:
+            cached = await llm_response_cache.get(llm_cache_key(provider_name, provider_config, prompt))
+            if cached is not None:
+                return self._cache_hit(cached, start_time)
+
+        if semantic_response_cache.enabled:
+            match = semantic_response_cache.get(provider_name, provider_config, prompt)
+            if match is not None:
+                cached, similarity = match
+                result = self._cache_hit(cached, start_time)
+                result["cache_similarity"] = round(similarity, 4)
+                return result
+        return None
+
+    async def _cache_store(
+        self,
+        prompt: str,
+        provider_name: str,
+        provider_config: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> None:
+        """Mark a provider result as a cache miss and cache it if successful."""
+        result["cache_hit"] = False
+        if llm_response_cache.enabled:
+            await llm_response_cache.put(
+                llm_cache_key(provider_name, provider_config, prompt), provider_name, dict(result)
+            )
+        if semantic_response_cache.enabled:
+            semantic_response_cache.put(provider_name, provider_config, prompt, dict(result))
+
+    @staticmethod
+    def _coalescable(provider_config: Dict[str, Any]) -> bool:
+        """Check whether a call may share an identical in-flight call's result.
+
+        Only deterministic (temperature 0) calls do: at any other temperature
+        each call is an independent sample.
+        """
+        if not settings.LLM_COALESCE_ENABLED:
+            return False
+        temperature = provider_config.get("temperature")
+        return temperature is not None and float(temperature) == 0
+
+    @staticmethod
+    def _coalesce_key(prompt: str, provider_name: str, provider_config: Dict[str, Any]) -> str:
+        """Get the key under which identical concurrent calls share one provider call.
+
+        Unlike cache keys it covers the API key, so calls made with different
+        credentials never share a result.
+        """
+        key = llm_cache_key(provider_name, provider_config, prompt)
+        return hashlib.sha256(f"{key}:{provider_config.get('api_key')}".encode("utf-8")).hexdigest()
+
+    async def _single_flight(self, key: str, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run ``call`` unless an identical call is in flight, then share its result.
+
+        The shared call runs as its own task, so a caller being cancelled
+        doesn't cancel it for the others. Callers that joined get a copy of
+        the result with ``coalesced`` set and ``tokens_used`` 0, as they
+        spent no tokens of their own.
+        """
+        task = self._in_flight.get(key)
+        joined = task is not None
+        if not joined:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+
+            def forget(done: "asyncio.Task[Dict[str, Any]]") -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+
+            task.add_done_callback(forget)
+
+        result = dict(await asyncio.shield(task))
+        if joined:
+            result.update({"coalesced": True, "tokens_used": 0})
+        return result
+
+    async def _attempt(self, provider: LLMProvider, prompt: str, provider_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Make one provider call through the endpoint's circuit breaker and the config's rate limiter."""
+        breaker = provider_config["circuit_breaker"]
+        if not breaker.allow():
+            return self._circuit_open_result(breaker)
+
+        rate_limiter = provider_config["rate_limiter"]
+        estimated_tokens = self._estimate_tokens(prompt, provider_config)
+        try:
+            await rate_limiter.acquire(estimated_tokens)
+            result = await provider.call(prompt, provider_config)
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record(result)
+        rate_limiter.settle(estimated_tokens, result.get("tokens_used", 0))
+        return result
+
+    async def _hedged_attempt(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        provider_name: str,
+        provider_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Make one provider call, racing a second one if the first runs long.
+
+        With LLM_HEDGE_ENABLED, a call still running after the
+        LLM_HEDGE_PERCENTILE latency of recent successful calls to the same
+        model gets a second request. The first success wins and the other
+        request is cancelled; a result from the second request is marked
+        ``hedged``.
+        """
+        latency_key = f"{provider_name}:{provider_config.get('model')}"
+        threshold = None
+        if settings.LLM_HEDGE_ENABLED:
+            threshold = latency_tracker.percentile(latency_key, settings.LLM_HEDGE_PERCENTILE)
+
+        if threshold is None:
+            result = await self._attempt(provider, prompt, provider_config)
+        else:
+            attempts = [asyncio.ensure_future(self._attempt(provider, prompt, provider_config))]
+            try:
+                done, _ = await asyncio.wait(attempts, timeout=threshold)
+                if not done:
+                    logger.info("Hedging slow LLM call", provider=provider_name, threshold_seconds=round(threshold, 3))
+                    attempts.append(asyncio.ensure_future(self._attempt(provider, prompt, provider_config)))
+
+                pending = set(attempts)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        result = task.result()
+                        if result.get("success"):
+                            break
+                    if result.get("success"):
+                        if task is not attempts[0]:
+                            result["hedged"] = True
+                        break
+            finally:
+                for task in attempts:
+                    if not task.done():
+                        task.cancel()
+
+        if result.get("success"):
+            latency_tracker.record(latency_key, result.get("execution_time_ms", 0) / 1000.0)
+        return result
+
+    async def _call_with_retries(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        provider_name: str,
+        provider_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call a provider, retrying failures that may be transient.
+
+        Failures with an LLM_RETRY_STATUS_CODES status, timeouts and
+        connection errors are retried up to LLM_RETRY_MAX_ATTEMPTS attempts
+        in all, after a jittered exponential backoff, as long as the retry
+        would start within LLM_RETRY_BUDGET_SECONDS of the first attempt.
+        Results carry the number of ``attempts`` made.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            result = await self._hedged_attempt(provider, prompt, provider_name, provider_config)
+            if attempt >= settings.LLM_RETRY_MAX_ATTEMPTS or not is_retryable(result):
+                break
+            delay = backoff_delay(attempt)
+            if time.monotonic() - start + delay > settings.LLM_RETRY_BUDGET_SECONDS:
+                break
+            logger.info(
+                "Retrying LLM call",
+                provider=provider_name,
+                attempt=attempt,
+                error=result.get("error"),
+                delay_seconds=round(delay, 3)
+            )
+            await asyncio.sleep(delay)
+
+        result["attempts"] = attempt
+        return result
+
+    async def call_llm(
+        self,
+        prompt: str,
+        config: LLMConfig,
+        *,
+        use_cache: bool = True,
+        coalesce: bool = True
+    ) -> Dict[str, Any]:
+        """Call LLM with the given prompt and configuration.
+
+        With LLM_CACHE_ENABLED or LLM_SEMANTIC_CACHE_ENABLED, results carry
+        ``cache_hit``; a hit is the earlier result of an identical (or, for
+        the semantic cache, near-duplicate, with ``cache_similarity``) call
+        with ``tokens_used`` 0 and the lookup time as ``execution_time_ms``.
+        ``use_cache=False`` always calls the provider. With
+        LLM_COALESCE_ENABLED, identical temperature 0 calls made while one is
+        in flight wait for it instead of calling the provider again, unless
+        ``coalesce=False`` (for calls meant as separate samples). Provider calls
+        are retried and hedged as in ``_call_with_retries``. While the
+        endpoint's circuit is open, calls fail at once with ``circuit_open``.
+        """
+        provider = self.get_provider(config.provider)
+        provider_config = self._provider_config(config)
+        cache_enabled = self._cache_enabled(use_cache)
+
+        if cache_enabled:
+            cached = await self._cache_lookup(prompt, config.provider, provider_config)
+            if cached is not None:
+                return cached
+
+        async def call() -> Dict[str, Any]:
+            result = await self._call_with_retries(provider, prompt, config.provider, provider_config)
+            if cache_enabled:
+                await self._cache_store(prompt, config.provider, provider_config, result)
+            return result
+
+        if not (coalesce and self._coalescable(provider_config)):
+            return await call()
+        return await self._single_flight(
+            self._coalesce_key(prompt, config.provider, provider_config), call
+        )
+
+    async def stream_llm(
+        self,
+        prompt: str,
+        config: LLMConfig,
+        *,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream an LLM response token by token.
+
+        Yields ``{"type": "token", "content": ...}`` events followed by a single
+        ``{"type": "done", "result": ...}`` event carrying the same result shape
+        as ``call_llm`` plus ``time_to_first_token_ms``. Cache hits are sent
+        as one token.
+        """
+        provider = self.get_provider(config.provider)
+        provider_config = self._provider_config(config)
+        cache_enabled = self._cache_enabled(use_cache)
+
+        if cache_enabled:
+            cached = await self._cache_lookup(prompt, config.provider, provider_config)
+            if cached is not None:
+                cached["time_to_first_token_ms"] = cached["execution_time_ms"]
+                yield {"type": "token", "content": cached["content"]}
+                yield {"type": "done", "result": cached}
+                return
+
+        # Retried like call_llm, but only while nothing has been streamed
+        breaker = provider_config["circuit_breaker"]
+        rate_limiter = provider_config["rate_limiter"]
+        estimated_tokens = self._estimate_tokens(prompt, provider_config)
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            streamed = False
+            done = None
+            if not breaker.allow():
+                done = {"type": "done", "result": self._circuit_open_result(breaker)}
+                break
+            try:
+                await rate_limiter.acquire(estimated_tokens)
+                async for event in provider.stream(prompt, provider_config):
+                    if event["type"] == "done":
+                        done = event
+                        breaker.record(event["result"])
+                        rate_limiter.settle(estimated_tokens, event["result"].get("tokens_used", 0))
+                    else:
+                        streamed = True
+                        yield event
+            except BaseException:
+                breaker.release()
+                raise
+
+            result = done["result"]
+            if streamed or attempt >= settings.LLM_RETRY_MAX_ATTEMPTS or not is_retryable(result):
+                break
+            delay = backoff_delay(attempt)
+            if time.monotonic() - start + delay > settings.LLM_RETRY_BUDGET_SECONDS:
+                break
+            logger.info(
+                "Retrying LLM stream",
+                provider=config.provider,
+                attempt=attempt,
+                error=result.get("error"),
+                delay_seconds=round(delay, 3)
+            )
+            await asyncio.sleep(delay)
+
+        done["result"]["attempts"] = attempt
+        if cache_enabled:
+            await self._cache_store(prompt, config.provider, provider_config, done["result"])
+        yield done
     
+    async def call_llm_concurrently(
+        self,
+        prompt: str,
+        configs: List[LLMConfig],
+        *,
+        provider_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """Call several LLM configurations in parallel with the same prompt.
+
+        Calls to the same provider are capped at ``provider_concurrency``.
+        Calls still running when ``timeout`` expires are cancelled and
+        reported as timed-out failures; finished calls are kept, so the
+        returned list (in ``configs`` order) may hold partial results.
+        ``on_result(index, result)`` is invoked as each call finishes.
+        """
+        per_provider = max(1, provider_concurrency or settings.LLM_PROVIDER_MAX_CONCURRENCY)
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        for config in configs:
+            semaphores.setdefault(config.provider, asyncio.Semaphore(per_provider))
+
+        async def run_config(index: int, config: LLMConfig) -> Dict[str, Any]:
+            async with semaphores[config.provider]:
+                result = await self.call_llm(prompt, config, coalesce=False)
+            if on_result:
+                on_result(index, result)
+            return result
+
+        start_time = time.time()
+        tasks = [
+            asyncio.create_task(run_config(index, config))
+            for index, config in enumerate(configs)
+        ]
+        if not tasks:
+            return []
+
+        deadline = timeout if timeout is not None else settings.COMPARISON_DEADLINE_SECONDS
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        results = []
+        for index, task in enumerate(tasks):
+            if task in pending:
+                result = {
+                    "success": False,
+                    "error": f"Timed out after {deadline}s",
+                    "timed_out": True,
+                    "execution_time_ms": elapsed_ms,
+                    "tokens_used": 0
+                }
+            elif task.exception() is not None:
+                result = {
+                    "success": False,
+                    "error": str(task.exception()),
+                    "execution_time_ms": elapsed_ms,
+                    "tokens_used": 0
+                }
+            else:
+                results.append(task.result())
+                continue
+
+            if on_result:
+                on_result(index, result)
+            results.append(result)
+
+        return results
+
     async def compare_prompt_versions(
         self,
         db: Session,
         *,
         comparison: Comparison,
-        prompt_versions: List[PromptVersion]
+        prompt_versions: List[PromptVersion],
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
     ) -> List[Dict[str, Any]]:
-        """Compare multiple prompt versions using the same LLM."""
+        """Compare multiple prompt versions using the same LLM.
+
+        Version calls run concurrently, bounded by ``max_concurrency``
+        (``COMPARISON_MAX_CONCURRENCY`` by default; 1 runs them one at a time).
+        ``on_result(index, result)`` is invoked as each call finishes.
+        """
+        # Resolve ORM attributes up front so the concurrent calls never touch the session
+        llm_config = comparison.llm_config
+        input_text = comparison.input_text
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.COMPARISON_MAX_CONCURRENCY))
+
+        async def run_version(index: int) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self.call_llm(input_text, llm_config, coalesce=False)
+            if on_result:
+                on_result(index, result)
+            return result
+
+        call_results = await asyncio.gather(
+            *(run_version(index) for index in range(len(prompt_versions)))
+        )
+
+        # Persist all results in a single batch
         results = []
-        
-        for version in prompt_versions:
-            result = await self.call_llm(comparison.input_text, comparison.llm_config)
-            
-            # Store result in database
-            comparison_prompt_version = ComparisonPromptVersion(
+        comparison_prompt_versions = []
+        for version, result in zip(prompt_versions, call_results, strict=True):
+            comparison_prompt_versions.append(ComparisonPromptVersion(
                 comparison_id=comparison.id,
                 prompt_version_id=version.id,
                 result=json.dumps(result) if result else None,
                 execution_time_ms=result["execution_time_ms"],
                 tokens_used=result["tokens_used"],
                 error_message=result.get("error")
-            )
-            
-            db.add(comparison_prompt_version)
-            
+            ))
+
             results.append({
                 "version_id": version.id,
                 "version_number": version.version_number,
                 "prompt_content": version.content,
                 "result": result
             })
-        
-        db.commit()
+
+        db.add_all(comparison_prompt_versions)
         
         # Update comparison statistics
         successful_results = [r for r in results if r["result"]["success"]]
@@ -627,34 +1161,12 @@ class LLMService:
         results = (
             db.query(ComparisonPromptVersion)
             .join(PromptVersion)
+            .options(contains_eager(ComparisonPromptVersion.prompt_version))
             .filter(ComparisonPromptVersion.comparison_id == comparison_id)
+            .order_by(PromptVersion.version_key, ComparisonPromptVersion.created_at)
             .all()
         )
 
-        # Sort by version number (handle both int and str types, compare numerically)
-        def version_sort_key(result):
-            try:
-                version_value = result.prompt_version.version_number
-                # Handle None
-                if version_value is None:
-                    return 0.0
-                # Handle both integer (old) and string (new) version numbers
-                if isinstance(version_value, int):
-                    return float(version_value)
-                elif isinstance(version_value, str):
-                    return float(version_value)
-                else:
-                    return 0.0
-            except (ValueError, TypeError, AttributeError) as e:
-                print(f"Error sorting comparison result: {e}, version_number={version_value}")
-                return 0.0
-
-        try:
-            results = sorted(results, key=version_sort_key)
-        except Exception as e:
-            print(f"Failed to sort comparison results: {e}")
-            # Continue with unsorted results
-
         return [
             {
                 "version_id": result.prompt_version_id,
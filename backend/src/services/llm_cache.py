@@ -0,0 +1,291 @@
+"""
+Caches of successful LLM call results for identical and near-duplicate requests.
+"""
+
+import hashlib
+import json
+import random
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from src.core.cache import LRUCache
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.logging import logger
+from src.models.llm_response_cache import LLMResponseCacheEntry
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# MinHash over word 3-grams with 64 fixed random permutations, indexed by
+# locality-sensitive hashing in 16 bands of 4 values: prompts above ~0.5
+# similarity are likely to share a band and become candidates
+_SHINGLE_SIZE = 3
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PERMUTATIONS = 64
+_LSH_BANDS = 16
+_LSH_ROWS = _MINHASH_PERMUTATIONS // _LSH_BANDS
+_rng = random.Random(20240601)
+_MINHASH_PARAMS = [
+    (_rng.randrange(1, _MINHASH_PRIME), _rng.randrange(0, _MINHASH_PRIME))
+    for _ in range(_MINHASH_PERMUTATIONS)
+]
+
+
+def _request_fields(provider: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the call fields besides the prompt that determine a response.
+
+    The API key is left out so rotating credentials keeps the cache.
+    """
+    return {
+        "provider": provider,
+        "model": config.get("model"),
+        "base_url": config.get("base_url"),
+        "temperature": None if config.get("temperature") is None else str(config["temperature"]),
+        "max_tokens": config.get("max_tokens"),
+    }
+
+
+def llm_cache_key(provider: str, config: Dict[str, Any], prompt: str) -> str:
+    """Get the cache key for a call: provider, model, base URL, sampling parameters and prompt."""
+    payload = json.dumps(dict(_request_fields(provider, config), prompt=prompt), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def llm_scope_key(provider: str, config: Dict[str, Any]) -> str:
+    """Get the key of the calls whose responses are comparable: all fields but the prompt."""
+    payload = json.dumps(_request_fields(provider, config), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt so edits to case, whitespace and punctuation don't change it."""
+    text = unicodedata.normalize("NFKC", prompt).casefold()
+    return " ".join(_WORD_PATTERN.findall(text))
+
+
+def minhash_signature(normalized: str) -> Tuple[int, ...]:
+    """Get the MinHash signature of the word 3-grams of a normalized prompt.
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the prompts' 3-gram sets.
+    """
+    words = normalized.split()
+    if len(words) < _SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {
+            " ".join(words[i:i + _SHINGLE_SIZE])
+            for i in range(len(words) - _SHINGLE_SIZE + 1)
+        }
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles
+    ]
+    return tuple(
+        min((a * h + b) % _MINHASH_PRIME for h in hashes)
+        for a, b in _MINHASH_PARAMS
+    )
+
+
+class LLMResponseCache:
+    """LLM result cache with an in-memory LRU tier and an optional database tier.
+
+    Entries expire after LLM_CACHE_TTL_SECONDS. Only successful results are
+    stored.
+    """
+
+    def __init__(self):
+        self._memory: LRUCache[Dict[str, Any]] = LRUCache(
+            settings.LLM_CACHE_SIZE, ttl=settings.LLM_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LLM_CACHE_ENABLED
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None."""
+        result = self._memory.get(key)
+        if result is not None or not settings.LLM_CACHE_PERSISTENT:
+            return result
+
+        result = await run_in_threadpool(self._load, key)
+        if result is not None:
+            self._memory.put(key, result)
+        return result
+
+    async def put(self, key: str, provider: str, result: Dict[str, Any]) -> None:
+        """Cache a successful result."""
+        if not result.get("success"):
+            return
+        self._memory.put(key, result)
+        if settings.LLM_CACHE_PERSISTENT:
+            await run_in_threadpool(self._store, key, provider, result)
+
+    @staticmethod
+    def _load(key: str) -> Optional[Dict[str, Any]]:
+        """Read an unexpired result from the database tier."""
+        db = SessionLocal()
+        try:
+            entry = (
+                db.query(LLMResponseCacheEntry)
+                .filter(
+                    LLMResponseCacheEntry.key == key,
+                    LLMResponseCacheEntry.expires_at > func.now()
+                )
+                .first()
+            )
+            return entry.result if entry else None
+        except SQLAlchemyError as e:
+            logger.warning("LLM cache read failed", error=str(e))
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _store(key: str, provider: str, result: Dict[str, Any]) -> None:
+        """Write a result to the database tier, replacing an expired entry."""
+        db = SessionLocal()
+        try:
+            db.merge(LLMResponseCacheEntry(
+                key=key,
+                provider=provider,
+                model=result.get("model"),
+                result=result,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+            ))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("LLM cache write failed", error=str(e))
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        """Drop the in-memory tier."""
+        self._memory.clear()
+
+
+class _SemanticEntry:
+    """A cached result with the signature of its normalized prompt."""
+
+    __slots__ = ("scope", "signature", "result", "expires_at")
+
+    def __init__(self, scope: str, signature: Tuple[int, ...], result: Dict[str, Any], expires_at: float):
+        self.scope = scope
+        self.signature = signature
+        self.result = result
+        self.expires_at = expires_at
+
+
+class SemanticResponseCache:
+    """In-memory cache that also serves results of near-duplicate prompts.
+
+    Prompts are normalized (``normalize_prompt``) and indexed by MinHash
+    signature in an LSH index, per model and parameters. A lookup returns
+    the most similar cached prompt's result if its estimated similarity is
+    at least LLM_SEMANTIC_CACHE_THRESHOLD. Entries are evicted least
+    recently used past LLM_SEMANTIC_CACHE_SIZE and expire after
+    LLM_CACHE_TTL_SECONDS. Used from the event loop only.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _SemanticEntry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LLM_SEMANTIC_CACHE_ENABLED
+
+    @staticmethod
+    def _bands(scope: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        """Get the LSH bucket keys of a signature."""
+        return [
+            (scope, band, signature[band * _LSH_ROWS:(band + 1) * _LSH_ROWS])
+            for band in range(_LSH_BANDS)
+        ]
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its index buckets."""
+        entry = self._entries.pop(key)
+        for bucket_key in self._bands(entry.scope, entry.signature):
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def get(self, provider: str, config: Dict[str, Any], prompt: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Get the result of the most similar cached prompt and its similarity, or None."""
+        scope = llm_scope_key(provider, config)
+        normalized = normalize_prompt(prompt)
+        now = time.monotonic()
+
+        # Prompts that normalize the same need no index lookup
+        key = hashlib.sha256(f"{scope}:{normalized}".encode("utf-8")).hexdigest()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            self._entries.move_to_end(key)
+            return entry.result, 1.0
+
+        signature = minhash_signature(normalized)
+        candidates: Set[str] = set()
+        for bucket_key in self._bands(scope, signature):
+            candidates |= self._buckets.get(bucket_key, set())
+
+        best_key = None
+        best_score = 0.0
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if entry.expires_at <= now:
+                self._remove(candidate)
+                continue
+            score = sum(x == y for x, y in zip(signature, entry.signature, strict=True)) / _MINHASH_PERMUTATIONS
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_key is None or best_score < settings.LLM_SEMANTIC_CACHE_THRESHOLD:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key].result, best_score
+
+    def put(self, provider: str, config: Dict[str, Any], prompt: str, result: Dict[str, Any]) -> None:
+        """Cache a successful result under its normalized prompt."""
+        if not result.get("success") or settings.LLM_SEMANTIC_CACHE_SIZE <= 0:
+            return
+        scope = llm_scope_key(provider, config)
+        normalized = normalize_prompt(prompt)
+        key = hashlib.sha256(f"{scope}:{normalized}".encode("utf-8")).hexdigest()
+        if key in self._entries:
+            self._remove(key)
+
+        entry = _SemanticEntry(
+            scope,
+            minhash_signature(normalized),
+            result,
+            time.monotonic() + settings.LLM_CACHE_TTL_SECONDS
+        )
+        self._entries[key] = entry
+        for bucket_key in self._bands(scope, entry.signature):
+            self._buckets.setdefault(bucket_key, set()).add(key)
+
+        while len(self._entries) > settings.LLM_SEMANTIC_CACHE_SIZE:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._buckets.clear()
+
+
+# Create singleton instances
+llm_response_cache = LLMResponseCache()
+semantic_response_cache = SemanticResponseCache()
@@ -0,0 +1,123 @@
+"""
+In-process publishing of comparison progress for streaming clients.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+
+class RunningStats:
+    """Aggregate statistics updated as comparison results arrive."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.completed = 0
+        self.successful = 0
+        self._execution_time_ms = 0
+        self._tokens_used = 0
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Record one execution result."""
+        self.completed += 1
+        if result.get("success"):
+            self.successful += 1
+            self._execution_time_ms += result.get("execution_time_ms") or 0
+            self._tokens_used += result.get("tokens_used") or 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the current statistics."""
+        return {
+            "total_executions": self.total,
+            "completed_executions": self.completed,
+            "successful_executions": self.successful,
+            "failed_executions": self.completed - self.successful,
+            "average_execution_time_ms": int(self._execution_time_ms / self.successful) if self.successful else 0,
+            "total_tokens_used": self._tokens_used
+        }
+
+
+class _Channel:
+    """Event history and live subscribers for one running comparison."""
+
+    def __init__(self):
+        self.history: List[Dict[str, Any]] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+
+
+class ComparisonProgressBroker:
+    """Fan out comparison events to subscribers while the comparison runs.
+
+    Events are kept for the lifetime of a run so late subscribers replay
+    everything published so far before receiving live events.
+    """
+
+    def __init__(self):
+        self._channels: Dict[str, _Channel] = {}
+
+    def is_active(self, comparison_id: str) -> bool:
+        """Check whether a comparison is currently publishing events."""
+        return comparison_id in self._channels
+
+    def open(self, comparison_id: str) -> None:
+        """Start publishing events for a comparison."""
+        self._channels.setdefault(comparison_id, _Channel())
+
+    def publish(self, comparison_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Send an event to all current and future subscribers of a run."""
+        channel = self._channels.get(comparison_id)
+        if channel is None:
+            return
+        message = {"event": event, "data": data}
+        channel.history.append(message)
+        for queue in channel.subscribers:
+            queue.put_nowait(message)
+
+    def close(self, comparison_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Publish a final event and end the run's event stream."""
+        self.publish(comparison_id, event, data)
+        channel = self._channels.pop(comparison_id, None)
+        if channel is not None:
+            for queue in channel.subscribers:
+                queue.put_nowait(None)
+
+    async def subscribe(
+        self,
+        comparison_id: str,
+        *,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield events for a running comparison until it closes.
+
+        Yields ``None`` every ``heartbeat`` seconds without events so callers
+        can keep idle connections alive.
+        """
+        channel = self._channels.get(comparison_id)
+        if channel is None:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in channel.history:
+            queue.put_nowait(message)
+        channel.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            channel.subscribers.discard(queue)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format an event for a text/event-stream response."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Create a singleton instance
+comparison_progress = ComparisonProgressBroker()
@@ -2,12 +2,13 @@
 Prompt version management service.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-import difflib
 import json
 
-from src.crud import prompt_crud, prompt_version_crud
+from src.core.diff import LineDiff, LineInterner, diff_interned, diff_stats, similarity
+from src.crud import prompt_crud, prompt_version_crud, diff_cache_crud
+from src.models.content_blob import content_hash_for
 from src.models.prompt import Prompt
 from src.models.prompt_version import PromptVersion
 
@@ -30,11 +31,9 @@ class PromptVersionService:
             raise ValueError("Prompt not found")
         
         # Check if content is different from latest version
-        latest_version = prompt_version_crud.get_by_prompt(
-            db=db, prompt_id=prompt_id, skip=0, limit=1
-        )
+        latest_hash = prompt_version_crud.get_latest_content_hash(db=db, prompt_id=prompt_id)
         
-        if latest_version and latest_version[0].content == content:
+        if latest_hash == content_hash_for(content):
             raise ValueError("Content is identical to latest version")
         
         # Create new version
@@ -93,9 +92,16 @@ class PromptVersionService:
         prompt_id: str,
         version_a: str,
         version_b: str,
-        include_diff: bool = True
+        include_diff: bool = True,
+        include_html: bool = False,
+        intraline: bool = False
     ) -> Dict[str, Any]:
-        """Compare two versions with detailed analysis."""
+        """Compare two versions with detailed analysis.
+
+        The diff is returned as structured hunks (see
+        ``LineDiff.structured_hunks``) plus a unified diff; the HTML table is
+        only rendered when ``include_html`` is set.
+        """
         # Get versions
         version_a_obj = (
             db.query(PromptVersion)
@@ -132,39 +138,127 @@ class PromptVersionService:
                 "change_notes": version_b_obj.change_notes,
                 "created_at": version_b_obj.created_at
             },
-            "is_identical": version_a_obj.content == version_b_obj.content
+            "is_identical": version_a_obj.content_hash == version_b_obj.content_hash
         }
         
         if include_diff and not comparison["is_identical"]:
-            # Generate unified diff
-            diff_lines = list(difflib.unified_diff(
-                version_a_obj.content.splitlines(keepends=True),
-                version_b_obj.content.splitlines(keepends=True),
-                fromfile=f"version_{version_a}",
-                tofile=f"version_{version_b}",
-                lineterm=""
+            def compute() -> Dict[str, Any]:
+                # One diff pass feeds every rendering
+                diff = LineDiff(version_a_obj.content, version_b_obj.content)
+                result = {
+                    "hunks": diff.structured_hunks(intraline=intraline),
+                    "unified_diff": diff.unified_diff(f"version_{version_a}", f"version_{version_b}"),
+                    "stats": diff.stats()
+                }
+                if include_html:
+                    result["html_diff"] = diff.html_table("Version A", "Version B")
+                return result
+
+            # Versions never change, so repeated views reuse the computed diff
+            comparison.update(diff_cache_crud.get_or_compute(
+                db,
+                kind="detailed",
+                hash_a=version_a_obj.content_hash,
+                hash_b=version_b_obj.content_hash,
+                options={
+                    "labels": [version_a, version_b],
+                    "html": include_html,
+                    "intraline": intraline
+                },
+                compute=compute
             ))
-            
-            # Generate HTML diff
-            html_diff = self._generate_html_diff(
-                version_a_obj.content,
-                version_b_obj.content
-            )
-            
-            # Calculate statistics
-            stats = self._calculate_diff_stats(
-                version_a_obj.content,
-                version_b_obj.content
-            )
-            
-            comparison.update({
-                "unified_diff": "".join(diff_lines),
-                "html_diff": html_diff,
-                "stats": stats
-            })
         
         return comparison
 
+    def get_diff_matrix(
+        self,
+        db: Session,
+        *,
+        prompt_id: str,
+        include_matrix: bool = False,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get diff stats across the latest ``limit`` versions of a prompt.
+
+        Returns the versions oldest first, the stats and similarity of each
+        version against the one before it, and with ``include_matrix`` the
+        N x N line similarity of every pair. Each text is split into lines
+        once for all the diffs it takes part in, and the pairs are looked up
+        in and added to the diff cache in one batch.
+        """
+        prompt = prompt_crud.get(db=db, prompt_id=prompt_id)
+        if not prompt:
+            raise ValueError("Prompt not found")
+
+        versions = prompt_version_crud.get_by_prompt(
+            db=db, prompt_id=prompt_id, skip=0, limit=limit
+        )
+        versions.reverse()
+
+        texts = {version.content_hash: version.content for version in versions}
+        interner = LineInterner()
+        line_ids: Dict[str, List[int]] = {}
+
+        def lines_of(content_hash: str) -> List[int]:
+            if content_hash not in line_ids:
+                line_ids[content_hash] = interner.intern(texts[content_hash])
+            return line_ids[content_hash]
+
+        def compute(hash_a: str, hash_b: str) -> Dict[str, Any]:
+            opcodes, _ = diff_interned(lines_of(hash_a), lines_of(hash_b))
+            return {
+                "stats": diff_stats(opcodes),
+                "similarity": round(similarity(opcodes), 4)
+            }
+
+        def ordered(version_a: PromptVersion, version_b: PromptVersion) -> Tuple[str, str]:
+            # Similarity is symmetric; diff each pair of texts in one fixed
+            # order so both directions share a cache entry
+            return tuple(sorted((version_a.content_hash, version_b.content_hash)))
+
+        consecutive = list(zip(versions, versions[1:], strict=False))
+        size = len(versions)
+        pairs = [(previous.content_hash, version.content_hash) for previous, version in consecutive]
+        if include_matrix:
+            pairs.extend(
+                ordered(versions[i], versions[j]) for i in range(size) for j in range(i + 1, size)
+            )
+        # One cache lookup for every pair the response needs
+        results = diff_cache_crud.get_many_or_compute(db, kind="stats", pairs=pairs, compute=compute)
+
+        steps = []
+        for previous, version in consecutive:
+            result = results[(previous.content_hash, version.content_hash)]
+            steps.append({
+                "version_a": previous.version_number,
+                "version_b": version.version_number,
+                "stats": result["stats"],
+                "similarity": result["similarity"]
+            })
+
+        matrix = {
+            "prompt_id": prompt_id,
+            "versions": [
+                {
+                    "id": version.id,
+                    "version_number": version.version_number,
+                    "change_notes": version.change_notes,
+                    "created_at": version.created_at
+                }
+                for version in versions
+            ],
+            "steps": steps
+        }
+
+        if include_matrix:
+            values = [[1.0] * size for _ in range(size)]
+            for i in range(size):
+                for j in range(i + 1, size):
+                    values[i][j] = values[j][i] = results[ordered(versions[i], versions[j])]["similarity"]
+            matrix["similarity_matrix"] = values
+
+        return matrix
+
     def revert_to_version(
         self,
         db: Session,
@@ -209,44 +303,6 @@ class PromptVersionService:
         )
         return versions[0] if versions else None
 
-    def _generate_html_diff(self, text_a: str, text_b: str) -> str:
-        """Generate HTML side-by-side diff."""
-        differ = difflib.HtmlDiff()
-        return differ.make_table(
-            text_a.splitlines(),
-            text_b.splitlines(),
-            fromdesc="Version A",
-            todesc="Version B",
-            context=True,
-            numlines=3
-        )
-
-    def _calculate_diff_stats(self, text_a: str, text_b: str) -> Dict[str, int]:
-        """Calculate diff statistics."""
-        lines_a = text_a.splitlines()
-        lines_b = text_b.splitlines()
-        
-        matcher = difflib.SequenceMatcher(None, lines_a, lines_b)
-        
-        additions = 0
-        deletions = 0
-        modifications = 0
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            if tag == 'replace':
-                modifications += max(i2 - i1, j2 - j1)
-            elif tag == 'delete':
-                deletions += i2 - i1
-            elif tag == 'insert':
-                additions += j2 - j1
-        
-        return {
-            "additions": additions,
-            "deletions": deletions,
-            "modifications": modifications,
-            "total_changes": additions + deletions + modifications
-        }
-
 
 # Create a singleton instance
 prompt_version_service = PromptVersionService()
@@ -0,0 +1,258 @@
+"""
+Client-side rate limiting of outgoing LLM provider requests.
+"""
+
+import asyncio
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+from src.core.config import settings
+from src.core.logging import logger
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse a reset/retry value into seconds from now.
+
+    Accepts plain seconds ("2", "0.5"), Go-style durations ("1m30s",
+    "250ms", as sent by OpenAI-compatible APIs), RFC 3339 timestamps (as
+    sent by Anthropic) and HTTP dates.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def _header_int(headers: Mapping[str, str], *names: str) -> Optional[int]:
+    """Get the first of the named headers as an integer."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _header_duration(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    """Get the first of the named headers as seconds from now."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return _parse_duration(value)
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``.
+
+    The level may go negative when a debit turns out larger than the amount
+    reserved; later requests then wait for the debt to be repaid.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.level = float(rate_per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return float(self.rate_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate_per_minute / 60.0)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Get the seconds until ``amount`` can be taken (a full bucket admits anything)."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60.0 / self.rate_per_minute
+
+    def take(self, amount: float) -> None:
+        """Take ``amount`` (negative to give it back)."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        """Change the refill rate and capacity."""
+        self._refill()
+        self.rate_per_minute = rate_per_minute
+        self.level = min(self.level, self.capacity)
+
+
+class RateLimiter:
+    """Request and token buckets for one LLM configuration.
+
+    Limits start from the configured requests/tokens per minute and adapt
+    to what the provider reports: rate limit headers lower the buckets to
+    the provider's own limits, exhausted quotas pause requests until their
+    reset, and 429 responses pause for ``Retry-After`` (or an exponential
+    backoff when absent).
+    """
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.requests: Optional[TokenBucket] = None
+        self.tokens: Optional[TokenBucket] = None
+        self.paused_until = 0.0
+        self._configured = (requests_per_minute, tokens_per_minute)
+        self._reported: Tuple[Optional[int], Optional[int]] = (None, None)  # Limits from provider headers
+        self._throttled = 0  # Consecutive 429 responses
+        self._lock = asyncio.Lock()
+        self._apply()
+
+    def configure(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]) -> None:
+        """Apply changed configured limits."""
+        if (requests_per_minute, tokens_per_minute) != self._configured:
+            self._configured = (requests_per_minute, tokens_per_minute)
+            self._apply()
+
+    def _apply(self) -> None:
+        """Size the buckets to the lower of the configured and reported limits."""
+        rates = [
+            min((limit for limit in limits if limit), default=None)
+            for limits in zip(self._configured, self._reported, strict=True)
+        ]
+        self.requests = self._resized(self.requests, rates[0])
+        self.tokens = self._resized(self.tokens, rates[1])
+
+    @staticmethod
+    def _resized(bucket: Optional[TokenBucket], rate: Optional[int]) -> Optional[TokenBucket]:
+        if not rate:
+            return None
+        if bucket is None:
+            return TokenBucket(rate)
+        if bucket.rate_per_minute != rate:
+            bucket.set_rate(rate)
+        return bucket
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """Wait until a request of about ``estimated_tokens`` may be sent.
+
+        Waiters are admitted in arrival order. Returns the seconds waited.
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if self.requests is not None:
+                    wait = max(wait, self.requests.delay(1))
+                if self.tokens is not None:
+                    wait = max(wait, self.tokens.delay(estimated_tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(estimated_tokens)
+
+        waited = time.monotonic() - start
+        if waited >= 0.1:
+            logger.info("LLM request delayed by rate limiter", waited_seconds=round(waited, 3))
+        return waited
+
+    def settle(self, estimated_tokens: int, tokens_used: int) -> None:
+        """Correct the token bucket once a request's actual usage is known."""
+        if self.tokens is not None:
+            self.tokens.take(tokens_used - estimated_tokens)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt to the rate limit information in a provider response."""
+        now = time.monotonic()
+
+        reported = (
+            _header_int(headers, "x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"),
+            _header_int(headers, "x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit"),
+        )
+        reported = tuple(new or old for new, old in zip(reported, self._reported, strict=True))
+        if reported != self._reported:
+            self._reported = reported
+            self._apply()
+
+        # Quotas used up: hold requests until they reset
+        for remaining_names, reset_names in (
+            (
+                ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"),
+                ("x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"),
+            ),
+            (
+                ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"),
+                ("x-ratelimit-reset-tokens", "anthropic-ratelimit-tokens-reset"),
+            ),
+        ):
+            if _header_int(headers, *remaining_names) == 0:
+                reset = _header_duration(headers, *reset_names)
+                if reset:
+                    reset = min(reset, settings.LLM_RATE_LIMIT_MAX_PAUSE_SECONDS)
+                    self.paused_until = max(self.paused_until, now + reset)
+
+        if status_code == 429:
+            self._throttled += 1
+            retry_after = _header_duration(headers, "retry-after")
+            if retry_after is None:
+                retry_after_ms = _header_int(headers, "retry-after-ms")
+                if retry_after_ms is not None:
+                    retry_after = retry_after_ms / 1000.0
+            if retry_after is None:
+                retry_after = min(
+                    settings.LLM_RATE_LIMIT_BACKOFF_SECONDS * 2 ** (self._throttled - 1),
+                    settings.LLM_RATE_LIMIT_MAX_PAUSE_SECONDS
+                )
+            retry_after = min(retry_after, settings.LLM_RATE_LIMIT_MAX_PAUSE_SECONDS)
+            self.paused_until = max(self.paused_until, now + retry_after)
+            logger.warning("LLM provider rate limited", retry_after_seconds=retry_after)
+        elif status_code < 400:
+            self._throttled = 0
+
+
+class RateLimiterRegistry:
+    """Rate limiters by LLM configuration, shared by every call path."""
+
+    def __init__(self):
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def get(self, key: str, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]) -> RateLimiter:
+        """Get the limiter for a configuration, applying its current limits."""
+        requests_per_minute = requests_per_minute or settings.LLM_DEFAULT_REQUESTS_PER_MINUTE or None
+        tokens_per_minute = tokens_per_minute or settings.LLM_DEFAULT_TOKENS_PER_MINUTE or None
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            self._limiters[key] = limiter
+        else:
+            limiter.configure(requests_per_minute, tokens_per_minute)
+        return limiter
+
+
+# Create a singleton instance
+rate_limiters = RateLimiterRegistry()
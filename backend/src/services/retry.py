@@ -0,0 +1,69 @@
+"""
+Retry and hedging policy for LLM provider calls.
+"""
+
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.core.config import settings
+
+
+def is_retryable(result: Dict[str, Any]) -> bool:
+    """Check whether a failed call result may succeed on another attempt.
+
+    HTTP errors are retried for LLM_RETRY_STATUS_CODES; other failures
+    only if the provider marked them ``retryable`` (timeouts and
+    connection errors).
+    """
+    if result.get("success"):
+        return False
+    status_code = result.get("status_code")
+    if status_code is not None:
+        return status_code in settings.LLM_RETRY_STATUS_CODES
+    return bool(result.get("retryable"))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Get the seconds to wait after failed attempt number ``attempt`` (1-based).
+
+    Exponential backoff with full jitter: a random delay up to
+    LLM_RETRY_BACKOFF_SECONDS * 2^(attempt - 1), capped at
+    LLM_RETRY_MAX_BACKOFF_SECONDS.
+    """
+    ceiling = min(
+        settings.LLM_RETRY_MAX_BACKOFF_SECONDS,
+        settings.LLM_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+    )
+    return random.uniform(0, ceiling)
+
+
+class LatencyTracker:
+    """Recent successful call latencies per provider and model, for hedging."""
+
+    def __init__(self, window: int = 200):
+        self._window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, percentile: float) -> Optional[float]:
+        """Get a latency percentile, or None until LLM_HEDGE_MIN_SAMPLES calls were recorded."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(1, settings.LLM_HEDGE_MIN_SAMPLES):
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+        return samples[index]
+
+
+# Create a singleton instance
+latency_tracker = LatencyTracker()
@@ -0,0 +1,31 @@
+"""
+Standalone worker process for background comparison jobs.
+
+Run with ``python -m src.worker``. Set ``JOB_WORKERS=0`` on the API servers
+to execute jobs only in worker processes.
+"""
+
+import asyncio
+import os
+
+from src.core.logging import logger
+from src.services import llm_service
+from src.services.jobs import comparison_job_service
+
+
+async def main() -> None:
+    """Run the job polling loop until interrupted."""
+    concurrency = int(os.getenv("WORKER_CONCURRENCY", "2"))
+    await llm_service.startup()
+    logger.info("Starting comparison job worker", concurrency=concurrency)
+    try:
+        await comparison_job_service.run_worker(concurrency=concurrency)
+    finally:
+        await llm_service.shutdown()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Comparison job worker stopped")
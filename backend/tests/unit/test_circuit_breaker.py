@@ -0,0 +1,160 @@
+"""
+Tests for the LLM endpoint circuit breakers.
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry, is_endpoint_failure
+)
+
+FAILURE = {"success": False, "status_code": 503, "error": "unavailable", "execution_time_ms": 10}
+SUCCESS = {"success": True, "execution_time_ms": 10}
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_OPEN_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_SLOW_CALL_SECONDS", 5.0)
+    return CircuitBreaker("mock", "")
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record(FAILURE)
+
+
+@pytest.mark.parametrize("result, expected", [
+    (SUCCESS, False),
+    ({"success": False, "status_code": 500}, True),
+    ({"success": False, "status_code": 408}, True),
+    ({"success": False, "status_code": 429}, False),
+    ({"success": False, "status_code": 401}, False),
+    ({"success": False, "retryable": True}, True),
+    ({"success": False}, False),
+])
+def test_is_endpoint_failure(result, expected):
+    assert is_endpoint_failure(result) is expected
+
+
+def test_opens_after_consecutive_failures(breaker):
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+    fail(breaker)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(30.0)
+
+
+def test_success_resets_the_failure_count(breaker):
+    fail(breaker, 2)
+    breaker.allow()
+    breaker.record(SUCCESS)
+    fail(breaker, 2)
+
+    assert breaker.state == CLOSED
+
+
+def test_client_errors_do_not_count(breaker):
+    for _ in range(5):
+        breaker.allow()
+        breaker.record({"success": False, "status_code": 401})
+
+    assert breaker.state == CLOSED
+
+
+def test_slow_successes_count_as_failures(breaker):
+    for _ in range(3):
+        breaker.allow()
+        breaker.record({"success": True, "execution_time_ms": 6000})
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_lets_one_probe_through(breaker, clock):
+    fail(breaker, 3)
+
+    clock.now += 30
+    assert breaker.current_state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record(SUCCESS)
+
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow()
+
+
+def test_slow_probe_still_closes(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+
+    breaker.allow()
+    breaker.record({"success": True, "execution_time_ms": 6000})
+
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record(FAILURE)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(30.0)
+
+
+def test_released_probe_lets_another_through(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.release()
+
+    assert breaker.allow()
+
+
+def test_disabled_breaker_never_blocks(breaker, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_BREAKER_ENABLED", False)
+
+    fail(breaker, 10)
+
+    assert breaker.state == CLOSED
+    assert breaker.failures == 10
+
+
+def test_snapshot(breaker):
+    fail(breaker, 3)
+
+    snapshot = breaker.snapshot()
+
+    assert snapshot["state"] == OPEN
+    assert snapshot["failures"] == 3
+    assert snapshot["last_error"] == "unavailable"
+    assert snapshot["base_url"] is None
+
+
+def test_registry_shares_breakers_per_endpoint():
+    registry = CircuitBreakerRegistry()
+
+    breaker = registry.get("openai", "https://api.example.com/v1/")
+
+    assert registry.get("openai", "https://api.example.com/v1") is breaker
+    assert registry.get("anthropic", "https://api.example.com/v1") is not breaker
+    assert registry.state("openai", "https://other.example.com") == CLOSED
@@ -0,0 +1,99 @@
+"""
+Tests for running same-LLM version comparisons concurrently.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import settings
+from src.crud import prompt_crud, prompt_version_crud
+from src.models.comparison import Comparison
+from src.models.comparison_prompt_version import ComparisonPromptVersion
+from src.models.llm_config import LLMConfig
+from src.schemas import PromptCreate, PromptVersionCreate
+from src.services.llm import LLMProvider, llm_service
+
+
+class SlowProvider(LLMProvider):
+    """Provider that answers after a delay and tracks how many calls overlap."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    def get_provider_name(self) -> str:
+        return "mock"
+
+    async def call(self, prompt, config):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.active -= 1
+        return {"success": True, "content": "answer", "execution_time_ms": 50, "tokens_used": 3}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = SlowProvider()
+    monkeypatch.setitem(llm_service.providers, "mock", provider)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_SEMANTIC_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_ATTEMPTS", 1)
+    return provider
+
+
+@pytest.fixture
+def comparison_setup(db_session):
+    config = LLMConfig(name="test", provider="mock", api_key="key", model="m", temperature="0", max_tokens=10)
+    db_session.add(config)
+    prompt = prompt_crud.create(db_session, obj_in=PromptCreate(title="p", content="v1"))
+    versions = [
+        prompt_version_crud.create(db_session, obj_in=PromptVersionCreate(content=f"v{i}"), prompt_id=prompt.id)
+        for i in range(6)
+    ]
+    comparison = Comparison(name="c", type="version_comparison", input_text="input", llm_config=config)
+    db_session.add(comparison)
+    db_session.commit()
+    return comparison, versions
+
+
+async def test_versions_run_concurrently(db_session, provider, comparison_setup):
+    comparison, versions = comparison_setup
+
+    results = await llm_service.compare_prompt_versions(
+        db_session, comparison=comparison, prompt_versions=versions
+    )
+
+    assert provider.max_active == len(versions)
+    assert [result["version_id"] for result in results] == [version.id for version in versions]
+
+
+async def test_concurrency_is_bounded(db_session, provider, comparison_setup):
+    comparison, versions = comparison_setup
+
+    await llm_service.compare_prompt_versions(
+        db_session, comparison=comparison, prompt_versions=versions, max_concurrency=2
+    )
+
+    assert provider.max_active == 2
+
+
+async def test_results_are_reported_and_persisted(db_session, provider, comparison_setup):
+    comparison, versions = comparison_setup
+    reported = []
+
+    await llm_service.compare_prompt_versions(
+        db_session,
+        comparison=comparison,
+        prompt_versions=versions,
+        on_result=lambda index, result: reported.append(index)
+    )
+
+    assert sorted(reported) == list(range(len(versions)))
+    rows = db_session.query(ComparisonPromptVersion).filter_by(comparison_id=comparison.id).all()
+    assert {row.prompt_version_id for row in rows} == {version.id for version in versions}
+    assert comparison.successful_executions == len(versions)
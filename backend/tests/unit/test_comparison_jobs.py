@@ -0,0 +1,113 @@
+"""
+Tests for claiming, leasing and recovering background comparison jobs.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import TestingSessionLocal
+from src.core.config import settings
+from src.crud import comparison_job_crud
+from src.models.comparison import Comparison
+from src.models.comparison_job import ComparisonJob
+from src.services import comparison as comparison_module
+from src.services import jobs as jobs_module
+from src.services.comparison import comparison_service
+from src.services.jobs import comparison_job_service
+
+
+@pytest.fixture
+def job(db_session):
+    return comparison_job_crud.create(db_session, type="same_llm", params={})
+
+
+def status_of(db_session, job_id):
+    db_session.expire_all()
+    return db_session.get(ComparisonJob, job_id)
+
+
+def test_claim_is_won_once(db_session, job):
+    assert comparison_job_crud.claim(db_session, job_id=job.id) is True
+    assert comparison_job_crud.claim(db_session, job_id=job.id) is False
+
+    claimed = status_of(db_session, job.id)
+    assert claimed.status == "running"
+    assert claimed.heartbeat_at is not None
+
+
+def test_claim_next_skips_running_jobs(db_session, job):
+    other = comparison_job_crud.create(db_session, type="same_llm", params={})
+
+    claimed = {comparison_job_crud.claim_next(db_session), comparison_job_crud.claim_next(db_session)}
+
+    assert claimed == {job.id, other.id}
+    assert comparison_job_crud.claim_next(db_session) is None
+
+
+def test_stale_running_job_is_reclaimed(db_session, job):
+    comparison_job_crud.claim(db_session, job_id=job.id)
+    assert comparison_job_crud.get_claimable_ids(db_session) == []
+
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+    db_session.query(ComparisonJob).filter(ComparisonJob.id == job.id).update({"heartbeat_at": stale})
+    db_session.commit()
+
+    assert comparison_job_crud.get_claimable_ids(db_session) == [job.id]
+    assert comparison_job_crud.claim_next(db_session) == job.id
+
+
+def test_heartbeat_keeps_lease(db_session, job):
+    comparison_job_crud.claim(db_session, job_id=job.id)
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+    db_session.query(ComparisonJob).filter(ComparisonJob.id == job.id).update({"heartbeat_at": stale})
+    db_session.commit()
+
+    comparison_job_crud.heartbeat(db_session, job_id=job.id)
+
+    assert comparison_job_crud.get_claimable_ids(db_session) == []
+
+
+def test_recovery_is_not_capped(db_session):
+    for _ in range(120):
+        db_session.add(ComparisonJob(type="same_llm", status="pending", params={}))
+    db_session.commit()
+
+    assert len(comparison_job_crud.get_claimable_ids(db_session)) == 120
+
+
+async def test_cancelled_job_goes_back_to_pending(db_session, job, monkeypatch):
+    started = asyncio.Event()
+
+    async def execute(db, job):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(jobs_module, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(comparison_job_service, "_execute", execute)
+
+    task = asyncio.create_task(comparison_job_service.run_job(job.id))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    released = status_of(db_session, job.id)
+    assert released.status == "pending"
+    assert released.heartbeat_at is None
+
+
+async def test_stream_stops_waiting_for_stuck_job(db_session, monkeypatch):
+    comparison = Comparison(name="c", type="version_comparison", input_text="input")
+    db_session.add(comparison)
+    db_session.commit()
+    comparison_job_crud.create(db_session, type="same_llm", params={}, comparison_id=comparison.id)
+
+    monkeypatch.setattr(comparison_module, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "SSE_JOB_WAIT_TIMEOUT_SECONDS", 0.0)
+
+    events = [event async for event in comparison_service.stream_events(comparison.id)]
+
+    assert events[-1]["event"] == "error"
+    assert events[-1]["data"]["comparison_id"] == comparison.id
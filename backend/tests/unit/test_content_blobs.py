@@ -0,0 +1,89 @@
+"""
+Tests for content-addressed storage of prompt version texts.
+"""
+
+import pytest
+
+from conftest import add_version
+from src.core.config import settings
+from src.crud import prompt_version_crud
+from src.models.content_blob import ContentBlob, apply_delta, content_hash_for, encode_delta, text_cache
+from src.services.prompt_version import prompt_version_service
+
+
+@pytest.fixture
+def delta_storage(monkeypatch):
+    monkeypatch.setattr(settings, "VERSION_STORAGE_MODE", "delta")
+    monkeypatch.setattr(settings, "VERSION_SNAPSHOT_INTERVAL", 3)
+    text_cache.clear()
+    yield
+    text_cache.clear()
+
+
+def test_identical_texts_share_one_blob(db_session, prompt):
+    first = add_version(db_session, prompt, "same text")
+    add_version(db_session, prompt, "other text")
+    third = add_version(db_session, prompt, "same text")
+
+    assert first.content_hash == third.content_hash == content_hash_for("same text")
+    assert db_session.query(ContentBlob).count() == 2
+
+
+def test_revert_reuses_the_stored_blob(db_session, prompt):
+    add_version(db_session, prompt, "original")
+    add_version(db_session, prompt, "edited")
+
+    reverted = prompt_version_service.revert_to_version(db_session, prompt_id=prompt.id, version_number="1.0")
+
+    assert reverted.version_number == "3.0"
+    assert reverted.content == "original"
+    assert db_session.query(ContentBlob).count() == 2
+
+
+def test_identical_new_version_is_rejected_by_hash(db_session, prompt):
+    add_version(db_session, prompt, "latest")
+
+    with pytest.raises(ValueError, match="identical"):
+        prompt_version_service.create_version_from_prompt(db_session, prompt_id=prompt.id, content="latest")
+
+
+@pytest.mark.parametrize("base, content", [
+    ("", ""),
+    ("", "new\ntext"),
+    ("old\ntext\n", ""),
+    ("a\nb\nc\n", "a\nb\nc\n"),
+    ("a\nb\nc\n", "a\nB\nc\nd\n"),
+    ("a\nb\nc", "x\na\nc"),
+    ("no newline", "no newline\n"),
+    ("line\r\nwindows\r\n", "line\r\nchanged\r\n"),
+    ("ünïcödé\n", "ünïcödé\n✓\n"),
+])
+def test_delta_round_trip(base, content):
+    assert apply_delta(base, encode_delta(base, content)) == content
+
+
+def test_delta_of_small_edit_is_smaller_than_text():
+    base = "".join(f"line {i}\n" for i in range(500))
+    content = base.replace("line 250\n", "edited line\n")
+
+    delta = encode_delta(base, content)
+
+    assert len(delta) < len(content.encode("utf-8")) / 10
+    assert apply_delta(base, delta) == content
+
+
+def test_delta_chain_is_rebuilt_from_snapshot(db_session, prompt, delta_storage):
+    base = "".join(f"line {i}\n" for i in range(200))
+    texts = [base.replace(f"line {i}\n", f"edit {i}\n") for i in range(5)]
+    versions = [add_version(db_session, prompt, text) for text in texts]
+
+    blobs = [db_session.get(ContentBlob, version.content_hash) for version in versions]
+    assert [blob.depth for blob in blobs] == [0, 1, 2, 0, 1]
+    assert blobs[2].content is None
+
+    # Fresh instances, so no text rebuilt while writing is reused
+    ids = [version.id for version in versions]
+    text_cache.clear()
+    db_session.expunge_all()
+    for version_id, text in zip(ids, texts, strict=True):
+        assert prompt_version_crud.get(db_session, version_id).content == text
@@ -0,0 +1,84 @@
+"""
+Tests for the line diff engine against difflib.
+"""
+
+import difflib
+
+import pytest
+
+from src.core.config import settings
+from src.core.diff import LineDiff, diff_opcodes, similarity
+
+CASES = [
+    ("", ""),
+    ("a\nb\nc", "a\nb\nc"),
+    ("", "a\nb"),
+    ("a\nb", ""),
+    ("a\nb\nc", "a\nB\nc"),
+    ("a\nb\nc", "a\nc"),
+    ("a\nc", "a\nb\nc"),
+    ("one\ntwo\nthree\nfour\nfive\nsix\nseven\neight\nnine\nten",
+     "one\ntwo\nTHREE\nfour\nfive\nsix\nseven\neight\nnine\nTEN\neleven"),
+    ("\n".join(f"line {i}" for i in range(30)),
+     "\n".join(f"line {i}" for i in range(30) if i not in (3, 20)) + "\nlast"),
+]
+
+
+def difflib_unified(text_a: str, text_b: str) -> str:
+    lines = difflib.unified_diff(text_a.splitlines(), text_b.splitlines(), "a", "b", lineterm="")
+    return "".join(f"{line}\n" for line in lines)
+
+
+@pytest.mark.parametrize("text_a, text_b", CASES)
+def test_opcodes_match_difflib(text_a, text_b):
+    lines_a, lines_b = text_a.splitlines(), text_b.splitlines()
+
+    opcodes, exact = diff_opcodes(lines_a, lines_b)
+
+    assert exact
+    assert opcodes == difflib.SequenceMatcher(None, lines_a, lines_b, autojunk=False).get_opcodes()
+
+
+@pytest.mark.parametrize("text_a, text_b", CASES)
+def test_unified_diff_matches_difflib(text_a, text_b):
+    assert LineDiff(text_a, text_b).unified_diff("a", "b") == difflib_unified(text_a, text_b)
+
+
+@pytest.mark.parametrize("text_a, text_b", CASES)
+def test_similarity_matches_difflib_ratio(text_a, text_b):
+    lines_a, lines_b = text_a.splitlines(), text_b.splitlines()
+    expected = difflib.SequenceMatcher(None, lines_a, lines_b, autojunk=False).ratio()
+
+    assert similarity(LineDiff(text_a, text_b).opcodes) == pytest.approx(expected)
+
+
+def test_stats():
+    diff = LineDiff("a\nb\nc\nd", "a\nB\nc\ne\nf")
+
+    assert diff.stats() == {"additions": 0, "deletions": 0, "modifications": 3, "total_changes": 3}
+    assert LineDiff("a\nc", "a\nb\nc").stats()["additions"] == 1
+    assert LineDiff("a\nb\nc", "a\nc").stats()["deletions"] == 1
+
+
+def test_moved_block_keeps_unique_lines_anchored():
+    text_a = "header\nalpha\nbeta\ngamma\nfooter"
+    text_b = "header\ngamma\nalpha\nbeta\nfooter"
+
+    diff = LineDiff(text_a, text_b)
+
+    assert diff.exact
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in diff.opcodes:
+        rebuilt.extend(diff.lines_a[i1:i2] if tag == "equal" else diff.lines_b[j1:j2])
+    assert rebuilt == diff.lines_b
+
+
+def test_size_cap_falls_back_to_prefix_and_suffix(monkeypatch):
+    monkeypatch.setattr(settings, "DIFF_MAX_LINES", 10)
+    text_a = "\n".join(["same"] * 3 + [f"old {i}" for i in range(10)] + ["end"])
+    text_b = "\n".join(["same"] * 3 + [f"new {i}" for i in range(10)] + ["end"])
+
+    diff = LineDiff(text_a, text_b)
+
+    assert not diff.exact
+    assert diff.opcodes == [("equal", 0, 3, 0, 3), ("replace", 3, 13, 3, 13), ("equal", 13, 14, 13, 14)]
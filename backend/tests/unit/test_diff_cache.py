@@ -0,0 +1,104 @@
+"""
+Tests for the version diff cache and the diff matrix built on it.
+"""
+
+import pytest
+
+from conftest import TestingSessionLocal, add_version
+from src.core.cache import LRUCache
+from src.core.config import settings
+from src.crud import diff_cache as diff_cache_module
+from src.crud.diff_cache import diff_cache_crud, diff_cache_key
+from src.models.diff_cache import DiffCacheEntry
+
+
+@pytest.fixture
+def persistent(monkeypatch):
+    monkeypatch.setattr(settings, "DIFF_CACHE_PERSISTENT", True)
+    monkeypatch.setattr(diff_cache_module, "SessionLocal", TestingSessionLocal)
+    diff_cache_crud.clear()
+    yield
+    diff_cache_crud.clear()
+
+
+def stored(db_session):
+    db_session.expire_all()
+    return {entry.key: entry.value for entry in db_session.query(DiffCacheEntry)}
+
+
+def test_miss_is_stored_without_touching_the_callers_transaction(db_session, persistent, monkeypatch):
+    def fail():
+        raise AssertionError("the caller's session must not be committed or rolled back")
+
+    monkeypatch.setattr(db_session, "commit", fail)
+    monkeypatch.setattr(db_session, "rollback", fail)
+
+    value = diff_cache_crud.get_or_compute(
+        db_session, kind="stats", hash_a="a", hash_b="b", compute=lambda: {"similarity": 0.5}
+    )
+
+    assert value == {"similarity": 0.5}
+    assert stored(db_session) == {diff_cache_key("stats", "a", "b"): {"similarity": 0.5}}
+
+
+def test_stored_entry_is_read_back(db_session, persistent):
+    diff_cache_crud.get_or_compute(db_session, kind="stats", hash_a="a", hash_b="b", compute=lambda: {"n": 1})
+    diff_cache_crud.clear()
+
+    value = diff_cache_crud.get_or_compute(
+        db_session, kind="stats", hash_a="a", hash_b="b", compute=lambda: pytest.fail("recomputed")
+    )
+
+    assert value == {"n": 1}
+
+
+def test_existing_entry_is_kept_on_conflict(db_session, persistent):
+    key = diff_cache_key("stats", "a", "b")
+    entry = {"key": key, "hash_a": "a", "hash_b": "b"}
+
+    diff_cache_crud._store([dict(entry, value={"n": 1})])
+    diff_cache_crud._store([dict(entry, value={"n": 2})])
+
+    assert stored(db_session) == {key: {"n": 1}}
+
+
+def test_batch_larger_than_memory_tier_computes_and_stores_each_pair_once(db_session, persistent, monkeypatch):
+    monkeypatch.setattr(diff_cache_crud, "_memory", LRUCache(2))
+    stores = []
+    monkeypatch.setattr(diff_cache_crud, "_store", stores.append)
+    computed = []
+
+    def compute(hash_a, hash_b):
+        computed.append((hash_a, hash_b))
+        return {"pair": hash_a + hash_b}
+
+    pairs = [(a, b) for a in "abcd" for b in "abcd" if a < b]
+    values = diff_cache_crud.get_many_or_compute(db_session, kind="stats", pairs=pairs + pairs, compute=compute)
+
+    assert values == {(a, b): {"pair": a + b} for a, b in pairs}
+    assert computed == pairs
+    assert [len(entries) for entries in stores] == [len(pairs)]
+
+
+def test_diff_matrix(client, db_session, prompt, persistent):
+    for content in ("a\nb", "a\nb\nc", "a\nc", "a\nb"):
+        add_version(db_session, prompt, content)
+
+    response = client.get(f"/api/v1/prompts/{prompt.id}/versions/diff-matrix", params={"include_matrix": True})
+
+    assert response.status_code == 200
+    data = response.json()
+    matrix = data["similarity_matrix"]
+    assert [step["similarity"] for step in data["steps"]] == [matrix[i][i + 1] for i in range(len(matrix) - 1)]
+    assert all(matrix[i][j] == matrix[j][i] for i in range(len(matrix)) for j in range(len(matrix)))
+    assert matrix[0][-1] == 1.0
+
+
+def test_diff_matrix_limit_is_capped(client, prompt, monkeypatch):
+    monkeypatch.setattr(settings, "DIFF_MATRIX_MAX_VERSIONS", 10)
+    url = f"/api/v1/prompts/{prompt.id}/versions/diff-matrix"
+
+    assert client.get(url, params={"include_matrix": True, "limit": 11}).status_code == 400
+    assert client.get(url, params={"include_matrix": True, "limit": 10}).status_code == 200
+    assert client.get(url, params={"include_matrix": True}).status_code == 200
+    assert client.get(url, params={"limit": 11}).status_code == 200
@@ -0,0 +1,116 @@
+"""
+Tests for sharing identical in-flight LLM calls.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import settings
+from src.crud import prompt_crud, prompt_version_crud
+from src.models.comparison import Comparison
+from src.models.llm_config import LLMConfig
+from src.schemas import PromptCreate, PromptVersionCreate
+from src.services.llm import LLMProvider, llm_service
+
+
+class CountingProvider(LLMProvider):
+    """Provider that counts its calls and answers after a short delay."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def get_provider_name(self) -> str:
+        return "mock"
+
+    async def call(self, prompt, config):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"success": True, "content": f"answer {self.calls}", "execution_time_ms": 50, "tokens_used": 3}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = CountingProvider()
+    monkeypatch.setitem(llm_service.providers, "mock", provider)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_SEMANTIC_CACHE_ENABLED", False)
+    return provider
+
+
+@pytest.fixture
+def coalescing(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_COALESCE_ENABLED", True)
+
+
+def make_config(temperature: str) -> LLMConfig:
+    return LLMConfig(name="test", provider="mock", api_key="key", model="m", temperature=temperature, max_tokens=10)
+
+
+async def test_disabled_by_default(provider):
+    config = make_config("0")
+
+    await asyncio.gather(llm_service.call_llm("same", config), llm_service.call_llm("same", config))
+
+    assert provider.calls == 2
+
+
+async def test_identical_deterministic_calls_share_one_request(provider, coalescing):
+    config = make_config("0")
+
+    results = await asyncio.gather(llm_service.call_llm("same", config), llm_service.call_llm("same", config))
+
+    assert provider.calls == 1
+    assert results[0]["content"] == results[1]["content"]
+    joined = [result for result in results if result.get("coalesced")]
+    assert len(joined) == 1
+    assert joined[0]["tokens_used"] == 0
+
+
+async def test_sampled_calls_are_not_shared(provider, coalescing):
+    config = make_config("0.7")
+
+    await asyncio.gather(llm_service.call_llm("same", config), llm_service.call_llm("same", config))
+
+    assert provider.calls == 2
+
+
+async def test_different_prompts_are_not_shared(provider, coalescing):
+    config = make_config("0")
+
+    await asyncio.gather(llm_service.call_llm("one", config), llm_service.call_llm("two", config))
+
+    assert provider.calls == 2
+
+
+async def test_opting_out(provider, coalescing):
+    config = make_config("0")
+
+    await asyncio.gather(
+        llm_service.call_llm("same", config, coalesce=False),
+        llm_service.call_llm("same", config, coalesce=False)
+    )
+
+    assert provider.calls == 2
+
+
+async def test_version_comparison_calls_every_version(db_session, provider, coalescing):
+    config = make_config("0")
+    db_session.add(config)
+    prompt = prompt_crud.create(db_session, obj_in=PromptCreate(title="p", content="v1"))
+    versions = [
+        prompt_version_crud.create(db_session, obj_in=PromptVersionCreate(content=f"v{i}"), prompt_id=prompt.id)
+        for i in range(3)
+    ]
+    comparison = Comparison(name="c", type="version_comparison", input_text="same input", llm_config=config)
+    db_session.add(comparison)
+    db_session.commit()
+
+    results = await llm_service.compare_prompt_versions(
+        db_session, comparison=comparison, prompt_versions=versions
+    )
+
+    assert provider.calls == 3
+    assert all(not result["result"].get("coalesced") for result in results)
+    assert all(result["result"]["tokens_used"] == 3 for result in results)
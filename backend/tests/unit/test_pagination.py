@@ -0,0 +1,124 @@
+"""
+Tests for page and cursor pagination of list queries.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.crud import comparison_crud, llm_config_crud, prompt_crud
+from src.crud.pagination import decode_cursor, encode_cursor
+from src.models.comparison import Comparison
+from src.models.llm_config import LLMConfig
+from src.models.prompt import Prompt
+
+
+@pytest.fixture
+def prompts(db_session):
+    """Five prompts, all created in the same second so ids break the ties."""
+    items = [Prompt(title=f"Prompt {i}", content=f"Content {i}") for i in range(5)]
+    db_session.add_all(items)
+    db_session.commit()
+    return items
+
+
+def _ids(items):
+    return [item.id for item in items]
+
+
+class TestPagePagination:
+    """Offset pagination with ``skip``."""
+
+    def test_second_page_continues_first(self, db_session, prompts):
+        everything, _, _ = prompt_crud.get_multi(db_session, limit=10)
+        first, _, _ = prompt_crud.get_multi(db_session, skip=0, limit=2)
+        second, _, _ = prompt_crud.get_multi(db_session, skip=2, limit=2)
+
+        assert _ids(first) == _ids(everything[:2])
+        assert _ids(second) == _ids(everything[2:4])
+
+    def test_last_page_has_no_cursor(self, db_session, prompts):
+        items, total, next_cursor = prompt_crud.get_multi(db_session, skip=4, limit=2, include_total=True)
+
+        assert len(items) == 1
+        assert total == 5
+        assert next_cursor is None
+
+    def test_llm_configs_and_comparisons_second_page(self, db_session):
+        db_session.add_all(
+            [LLMConfig(name=f"c{i}", provider="mock", api_key="k", model="m", temperature="0.7", max_tokens=100) for i in range(3)]
+            + [Comparison(name=f"c{i}", type="version_comparison", input_text="x") for i in range(3)]
+        )
+        db_session.commit()
+
+        configs, _, _ = llm_config_crud.get_multi(db_session, skip=2, limit=2)
+        comparisons, _, _ = comparison_crud.get_multi(db_session, skip=2, limit=2)
+
+        assert len(configs) == 1
+        assert len(comparisons) == 1
+
+
+class TestCursorPagination:
+    """Keyset pagination with ``cursor``."""
+
+    @pytest.mark.parametrize("sort_by,sort_order", [(None, "desc"), ("title", "asc"), ("updated_at", "desc")])
+    def test_cursor_pages_match_offset_pages(self, db_session, prompts, sort_by, sort_order):
+        everything, _, _ = prompt_crud.get_multi(db_session, limit=10, sort_by=sort_by, sort_order=sort_order)
+
+        seen = []
+        cursor = None
+        while True:
+            page, _, cursor = prompt_crud.get_multi(
+                db_session, limit=2, cursor=cursor, sort_by=sort_by, sort_order=sort_order
+            )
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert _ids(seen) == _ids(everything)
+
+    def test_cursor_takes_precedence_over_skip(self, db_session, prompts):
+        first, _, cursor = prompt_crud.get_multi(db_session, limit=2)
+        second, _, _ = prompt_crud.get_multi(db_session, limit=2, cursor=cursor, skip=4)
+
+        assert _ids(second) == _ids(prompt_crud.get_multi(db_session, skip=2, limit=2)[0])
+
+    def test_cursor_for_another_sort_is_rejected(self, db_session, prompts):
+        _, _, cursor = prompt_crud.get_multi(db_session, limit=2)
+
+        with pytest.raises(ValueError):
+            prompt_crud.get_multi(db_session, limit=2, cursor=cursor, sort_by="title")
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor("title:asc", ["Prompt", "id-1"])
+
+        assert decode_cursor(cursor, "title:asc", [Prompt.title, Prompt.id]) == ["Prompt", "id-1"]
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor", "title:asc", [Prompt.title, Prompt.id])
+
+
+class TestListEndpoints:
+    """Second pages through the API."""
+
+    @pytest.mark.parametrize("path", ["/api/v1/prompts", "/api/v1/comparisons", "/api/v1/llm-configs"])
+    def test_second_page(self, client: TestClient, db_session, prompts, path):
+        db_session.add_all(
+            [LLMConfig(name=f"c{i}", provider="mock", api_key="k", model="m", temperature="0.7", max_tokens=100) for i in range(5)]
+            + [Comparison(name=f"c{i}", type="version_comparison", input_text="x") for i in range(5)]
+        )
+        db_session.commit()
+
+        response = client.get(path, params={"page": 2, "limit": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["has_prev"] is True
+        assert data["has_next"] is True
+
+    def test_cursor_page(self, client: TestClient, prompts):
+        first = client.get("/api/v1/prompts", params={"limit": 2}).json()
+        second = client.get("/api/v1/prompts", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+        first_ids = {item["id"] for item in first["items"]}
+        assert len(second["items"]) == 2
+        assert not first_ids & {item["id"] for item in second["items"]}
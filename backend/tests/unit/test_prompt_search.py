@@ -0,0 +1,74 @@
+"""
+Tests for searching prompts.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.crud import prompt_crud
+from src.schemas import PromptCreate, PromptUpdate
+
+
+@pytest.fixture
+def prompts(db_session):
+    data = [
+        ("Customer support", "Answers tickets", "You are a helpful support agent."),
+        ("通义千问 助手", None, "你是一个有用的助手。"),
+        ("我的客服提示词", "客服", "请礼貌地回答问题。"),
+        ("Summarizer", "Summaries of long_text", "Summarize the following article."),
+    ]
+    return [
+        prompt_crud.create(db_session, obj_in=PromptCreate(title=title, description=description, content=content))
+        for title, description, content in data
+    ]
+
+
+def search(db_session, text):
+    prompts, _, _ = prompt_crud.get_multi(db_session, search=text)
+    return [prompt.title for prompt in prompts]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("support", ["Customer support"]),
+    ("SUPPORT agent", ["Customer support"]),
+    ("upp", ["Customer support"]),
+    ("千问", ["通义千问 助手"]),
+    ("通义千问", ["通义千问 助手"]),
+    ("客服", ["我的客服提示词"]),
+    ("客服提示", ["我的客服提示词"]),
+    ("su", ["Customer support", "Summarizer"]),
+    ("long_text", ["Summarizer"]),
+    ("support summarize", []),
+    ("missing", []),
+])
+def test_search_matches_substrings(db_session, prompts, query, expected):
+    assert sorted(search(db_session, query)) == sorted(expected)
+
+
+def test_underscore_is_not_a_wildcard(db_session, prompts):
+    assert search(db_session, "long_") == ["Summarizer"]
+    assert search(db_session, "g_t") == ["Summarizer"]
+    assert search(db_session, "longxtext") == []
+
+
+def test_title_matches_rank_first(db_session, prompts):
+    prompt_crud.create(db_session, obj_in=PromptCreate(title="Other", content="Summarizer of summarizers"))
+
+    assert search(db_session, "summarizer")[0] == "Summarizer"
+
+
+def test_index_follows_updates_and_deletes(db_session, prompts):
+    support = prompts[0]
+
+    prompt_crud.update(db_session, db_obj=support, obj_in=PromptUpdate(title="Billing desk"))
+    assert search(db_session, "billing") == ["Billing desk"]
+    assert search(db_session, "customer") == []
+
+    prompt_crud.delete(db_session, prompt_id=support.id)
+    assert search(db_session, "billing") == []
+
+
+def test_index_is_keyed_on_prompt_id(db_session, prompts):
+    rows = db_session.execute(text("SELECT id FROM prompts_fts")).scalars().all()
+
+    assert sorted(rows) == sorted(prompt.id for prompt in prompts)
@@ -0,0 +1,148 @@
+"""
+Tests for client-side rate limiting of LLM requests.
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.services.rate_limit import RateLimiter, TokenBucket, _parse_duration
+
+
+class TestTokenBucket:
+    def test_full_bucket_admits_anything(self, clock):
+        bucket = TokenBucket(60)
+
+        assert bucket.delay(60) == 0.0
+        assert bucket.delay(1000) == 0.0
+
+    def test_take_then_wait_for_refill(self, clock):
+        bucket = TokenBucket(60)  # One per second
+
+        bucket.take(60)
+        assert bucket.delay(1) == pytest.approx(1.0)
+        assert bucket.delay(30) == pytest.approx(30.0)
+
+        clock.now += 10
+        assert bucket.delay(10) == 0.0
+        assert bucket.delay(15) == pytest.approx(5.0)
+
+    def test_refill_stops_at_capacity(self, clock):
+        bucket = TokenBucket(60)
+        bucket.take(30)
+
+        clock.now += 3600
+        bucket.take(0)
+
+        assert bucket.level == 60
+
+    def test_debt_delays_later_requests(self, clock):
+        bucket = TokenBucket(60)
+
+        bucket.take(90)
+
+        assert bucket.level == pytest.approx(-30)
+        assert bucket.delay(1) == pytest.approx(31.0)
+
+    def test_giving_back_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(60)
+        bucket.take(10)
+
+        bucket.take(-50)
+
+        assert bucket.level == 60
+
+    def test_lower_rate_shrinks_level(self, clock):
+        bucket = TokenBucket(60)
+
+        bucket.set_rate(30)
+
+        assert bucket.capacity == 30
+        assert bucket.level == 30
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2", 2.0),
+    ("0.5", 0.5),
+    ("1m30s", 90.0),
+    ("250ms", 0.25),
+    ("1h", 3600.0),
+    ("", None),
+    ("soon", None),
+])
+def test_parse_duration(value, expected):
+    assert _parse_duration(value) == expected
+
+
+def test_parse_past_timestamp_is_zero():
+    assert _parse_duration("2000-01-01T00:00:00Z") == 0.0
+
+
+class TestObserve:
+    def test_reported_limits_lower_the_buckets(self, clock):
+        limiter = RateLimiter(100, None)
+
+        limiter.observe(200, {"x-ratelimit-limit-requests": "50", "x-ratelimit-limit-tokens": "1000"})
+
+        assert limiter.requests.rate_per_minute == 50
+        assert limiter.tokens.rate_per_minute == 1000
+
+    def test_reported_limits_never_raise_configured_ones(self, clock):
+        limiter = RateLimiter(10, None)
+
+        limiter.observe(200, {"anthropic-ratelimit-requests-limit": "500"})
+
+        assert limiter.requests.rate_per_minute == 10
+
+    def test_exhausted_quota_pauses_until_reset(self, clock):
+        limiter = RateLimiter(None, None)
+
+        limiter.observe(200, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "6s"})
+
+        assert limiter.paused_until == pytest.approx(clock.now + 6)
+
+    def test_remaining_quota_does_not_pause(self, clock):
+        limiter = RateLimiter(None, None)
+
+        limiter.observe(200, {"x-ratelimit-remaining-requests": "3", "x-ratelimit-reset-requests": "6s"})
+
+        assert limiter.paused_until == 0.0
+
+    def test_429_honours_retry_after(self, clock):
+        limiter = RateLimiter(None, None)
+
+        limiter.observe(429, {"retry-after": "7"})
+
+        assert limiter.paused_until == pytest.approx(clock.now + 7)
+
+    def test_429_honours_retry_after_ms(self, clock):
+        limiter = RateLimiter(None, None)
+
+        limiter.observe(429, {"retry-after-ms": "1500"})
+
+        assert limiter.paused_until == pytest.approx(clock.now + 1.5)
+
+    def test_repeated_429_back_off_exponentially(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_RATE_LIMIT_BACKOFF_SECONDS", 1.0)
+        monkeypatch.setattr(settings, "LLM_RATE_LIMIT_MAX_PAUSE_SECONDS", 5.0)
+        limiter = RateLimiter(None, None)
+
+        pauses = []
+        for _ in range(4):
+            limiter.paused_until = 0.0
+            limiter.observe(429, {})
+            pauses.append(limiter.paused_until - clock.now)
+
+        assert pauses == [1.0, 2.0, 4.0, 5.0]
+
+        limiter.observe(200, {})
+        limiter.paused_until = 0.0
+        limiter.observe(429, {})
+        assert limiter.paused_until - clock.now == 1.0
+
+    def test_pauses_are_capped(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_RATE_LIMIT_MAX_PAUSE_SECONDS", 5.0)
+        limiter = RateLimiter(None, None)
+
+        limiter.observe(429, {"retry-after": "3600"})
+
+        assert limiter.paused_until == pytest.approx(clock.now + 5)
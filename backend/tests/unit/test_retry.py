@@ -0,0 +1,67 @@
+"""
+Tests for the LLM call retry and hedging policy.
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.services.retry import LatencyTracker, backoff_delay, is_retryable
+
+
+@pytest.mark.parametrize("result, expected", [
+    ({"success": True, "status_code": 503}, False),
+    ({"success": False, "status_code": 429}, True),
+    ({"success": False, "status_code": 503}, True),
+    ({"success": False, "status_code": 408}, True),
+    ({"success": False, "status_code": 400}, False),
+    ({"success": False, "status_code": 401}, False),
+    ({"success": False, "retryable": True}, True),
+    ({"success": False, "retryable": False}, False),
+    ({"success": False}, False),
+    ({"success": False, "status_code": 400, "retryable": True}, False),
+])
+def test_is_retryable(result, expected):
+    assert is_retryable(result) is expected
+
+
+def test_retry_status_codes_are_configurable(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_STATUS_CODES", [409])
+
+    assert is_retryable({"success": False, "status_code": 409})
+    assert not is_retryable({"success": False, "status_code": 503})
+
+
+@pytest.mark.parametrize("attempt, ceiling", [(1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (5, 5.0), (20, 5.0)])
+def test_backoff_delay_stays_within_ceiling(monkeypatch, attempt, ceiling):
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_BACKOFF_SECONDS", 5.0)
+
+    delays = [backoff_delay(attempt) for _ in range(200)]
+
+    assert all(0.0 <= delay <= ceiling for delay in delays)
+    # Full jitter spreads delays over the whole range
+    assert max(delays) > ceiling / 2
+
+
+def test_percentile_waits_for_min_samples(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 5)
+    tracker = LatencyTracker()
+
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        tracker.record("mock:m", seconds)
+    assert tracker.percentile("mock:m", 50) is None
+
+    tracker.record("mock:m", 5.0)
+    assert tracker.percentile("mock:m", 50) == 3.0
+    assert tracker.percentile("mock:m", 100) == 5.0
+    assert tracker.percentile("other", 50) is None
+
+
+def test_percentile_keeps_recent_window(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 1)
+    tracker = LatencyTracker(window=3)
+
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        tracker.record("mock:m", seconds)
+
+    assert tracker.percentile("mock:m", 100) == 3.0
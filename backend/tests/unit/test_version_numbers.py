@@ -0,0 +1,105 @@
+"""
+Tests for ordering prompt version numbers.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from conftest import add_version
+from src.crud import prompt_version_crud
+from src.crud.content_blob import content_blob_crud
+from src.models.prompt_version import PromptVersion, version_key_for, version_tuple
+from src.schemas import PromptVersionCreate
+
+
+def add_versions(db_session, prompt, *version_numbers):
+    for version_number in version_numbers:
+        add_version(db_session, prompt, f"content {version_number}", version_number)
+
+
+@pytest.mark.parametrize("version_number, expected", [
+    ("2", (2,)),
+    ("2.5", (2, 5)),
+    ("1.10", (1, 10)),
+    ("draft", ()),
+    ("1.²", ()),
+    ("-1.0", ()),
+    (None, ()),
+])
+def test_version_tuple(version_number, expected):
+    assert version_tuple(version_number) == expected
+
+
+def test_keys_sort_like_version_tuples():
+    numbers = ["1.10", "draft", "1.9", "10.0", "1.1", "2.0"]
+
+    assert sorted(numbers, key=version_key_for) == ["draft", "1.1", "1.9", "1.10", "2.0", "10.0"]
+
+
+def test_versions_are_listed_newest_first(db_session, prompt):
+    add_versions(db_session, prompt, "1.1", "1.10", "1.9")
+
+    numbers = [version.version_number for version in prompt_version_crud.get_versions(db_session, prompt.id)]
+
+    assert numbers[:3] == ["1.10", "1.9", "1.1"]
+
+
+def test_summary_has_one_latest_version(db_session, prompt):
+    add_versions(db_session, prompt, "1.1", "1.10")
+
+    summaries = prompt_version_crud.get_version_summaries(db_session, [prompt.id])
+
+    assert summaries == {prompt.id: {"latest_version": "1.10", "total_versions": 2}}
+
+
+@pytest.mark.parametrize("version_number, same_key_as", [
+    ("1.05", "1.5"),
+    ("01.0", "1.0"),
+    ("1.00", "1.0"),
+    ("1.12345678901", "1.9999999999"),
+])
+def test_colliding_version_numbers_are_rejected(version_number, same_key_as):
+    assert version_key_for(version_number) == version_key_for(same_key_as)
+
+    with pytest.raises(ValidationError):
+        PromptVersionCreate(content="text", version_number=version_number)
+
+
+@pytest.mark.parametrize("version_number", ["1.0", "10.20", "0.5", "draft", "v1.05"])
+def test_distinct_version_numbers_are_accepted(version_number):
+    assert PromptVersionCreate(content="text", version_number=version_number).version_number == version_number
+
+
+def test_summary_with_equal_keys_has_one_latest_version(db_session, prompt):
+    # Rows stored before leading zeros were rejected can still share a key
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for minutes, version_number in ((1, "3.1"), (0, "3.01")):
+        db_session.add(PromptVersion(
+            prompt_id=prompt.id,
+            version_number=version_number,
+            blob=content_blob_crud.get_or_create(db_session, f"content {version_number}"),
+            created_at=start + timedelta(minutes=minutes)
+        ))
+    db_session.commit()
+    assert version_key_for("3.01") == version_key_for("3.1")
+
+    summary = prompt_version_crud.get_version_summary(db_session, prompt.id)
+    numbers = [version.version_number for version in prompt_version_crud.get_versions(db_session, prompt.id)]
+
+    assert summary == {"latest_version": "3.1", "total_versions": 2}
+    assert numbers == ["3.1", "3.01"]
+    assert prompt_version_crud.get_next_version_number(db_session, prompt.id) == "4.1"
+
+
+@pytest.mark.parametrize("existing, expected", [
+    ((), "1.0"),
+    (("2.5",), "3.5"),
+    (("1.9", "1.10"), "2.10"),
+    (("4",), "5.0"),
+])
+def test_next_version_number(db_session, prompt, existing, expected):
+    add_versions(db_session, prompt, *existing)
+
+    assert prompt_version_crud.get_next_version_number(db_session, prompt.id) == expected
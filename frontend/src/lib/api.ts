@@ -39,6 +39,9 @@ export interface LLMConfig {
   base_url?: string;
   temperature: number;
   max_tokens: number;
+  requests_per_minute?: number | null;
+  tokens_per_minute?: number | null;
+  circuit_state?: 'closed' | 'open' | 'half_open';
   active: boolean;
   created_at: string;
   updated_at: string;
@@ -161,6 +164,14 @@ export const promptVersionsApi = {
     );
     return response.data;
   },
+
+  getDiffMatrix: async (promptId: string, params?: { include_matrix?: boolean; limit?: number }) => {
+    const response = await api.get(
+      `/api/v1/prompts/${promptId}/versions/diff-matrix`,
+      { params }
+    );
+    return response.data;
+  },
 };
 
 export const llmConfigsApi = {
@@ -186,6 +197,8 @@ export const llmConfigsApi = {
     base_url?: string;
     temperature: number;
     max_tokens: number;
+    requests_per_minute?: number;
+    tokens_per_minute?: number;
     active: boolean;
   }) => {
     const response = await api.post('/api/v1/llm-configs', data);
@@ -199,6 +212,8 @@ export const llmConfigsApi = {
     base_url?: string;
     temperature?: number;
     max_tokens?: number;
+    requests_per_minute?: number;
+    tokens_per_minute?: number;
     active?: boolean;
   }) => {
     const response = await api.put(`/api/v1/llm-configs/${id}`, data);
@@ -225,6 +240,11 @@ export const llmConfigsApi = {
     const response = await api.post('/api/v1/llm-configs/test', data);
     return response.data;
   },
+
+  getHealth: async () => {
+    const response = await api.get('/api/v1/llm/health');
+    return response.data;
+  },
 };
 
 export const comparisonsApi = {